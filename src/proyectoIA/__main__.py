@@ -0,0 +1,6 @@
+"""python -m proyectoIA: igual que el comando proyectoIA (ver lotes.py)."""
+import sys
+
+from .lotes import main
+
+sys.exit(main())
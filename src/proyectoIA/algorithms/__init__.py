@@ -1 +1,33 @@
-__version__ = "0.1.0"
\ No newline at end of file
+__version__ = "0.1.0"
+
+from .grid import Grid, IMPASABLE, COSTO_LIBRE, COSTO_VENENO
+from .heuristicas import heuristica_exacta, distancias_a_meta
+from .estadisticas import EstadisticasBusqueda
+from .jps import jump_point_search
+from .componentes import ComponentesConexas
+from .jerarquico import GrafoAbstracto, hpa_search
+from .incremental import PlanificadorIncremental
+from .anytime import dynamic_weighting_anytime
+from .bidireccional import dynamic_weighting_bidireccional
+from .flujo import CampoFlujo, flow_field
+from .paralelo import solve_many
+from .cache_resultados import CacheResultados
+from .archivo_mapa import Mapa, ErrorMapa, MapaInvalido, cargar_mapa, guardar_mapa
+from .mapa_binario import abrir_binario, abrir_mapa, guardar_binario
+
+__all__ = [
+    'Grid', 'IMPASABLE', 'COSTO_LIBRE', 'COSTO_VENENO',
+    'heuristica_exacta', 'distancias_a_meta',
+    'EstadisticasBusqueda',
+    'jump_point_search',
+    'ComponentesConexas',
+    'GrafoAbstracto', 'hpa_search',
+    'PlanificadorIncremental',
+    'dynamic_weighting_anytime',
+    'dynamic_weighting_bidireccional',
+    'CampoFlujo', 'flow_field',
+    'solve_many',
+    'CacheResultados',
+    'Mapa', 'ErrorMapa', 'MapaInvalido', 'cargar_mapa', 'guardar_mapa',
+    'abrir_binario', 'abrir_mapa', 'guardar_binario',
+]
@@ -0,0 +1,215 @@
+"""
+Búsqueda anytime al estilo ARA* sobre el motor de dynamic weighting.
+
+Primero busca con un peso alto (f = g + epsilon * h) para tener un camino
+rápido y después baja epsilon y mejora ese camino sin empezar de cero: g y
+padres se conservan, y solo se reabren las celdas cuyo g mejoró después de
+expandirlas (lista INCONS). Cada camino mejor se entrega junto con su cota
+de subóptimo: su costo es a lo sumo `cota` veces el óptimo.
+
+A diferencia de dynamic weighting, el peso de cada iteración es fijo (no
+depende de la profundidad); así la cota de cada camino vale.
+
+Uso:
+
+    for mejora in dynamic_weighting_anytime(grid, inicio, meta, tiempo_max=0.005):
+        camino, cota = mejora["camino"], mejora["cota"]
+"""
+import heapq
+import time
+from array import array
+
+from .componentes import inalcanzable
+from .estadisticas import INTERRUMPIDA, META, SIN_CAMINO, como_estadisticas
+from .grid import IMPASABLE, INFINITO, como_grid
+from .heuristicas import resolver_heuristica
+from .dynamic import reconstruir_camino
+
+# Expansiones entre cada revisión del reloj
+EXPANSIONES_POR_RELOJ = 256
+
+
+def dynamic_weighting_anytime(n, inicio, meta, obstaculos=None, epsilon=3, decremento=0.5,
+                              tiempo_max=None, max_expansiones=None, heuristica=None, stats=None,
+                              componentes=None):
+    """
+    Generador de caminos cada vez mejores.
+
+    Args:
+        n: tamaño del tablero (n x n), o un Grid ya construido
+        inicio, meta: tuplas (fila, col)
+        obstaculos: lista de posiciones con veneno (impasable), solo con la firma antigua
+        epsilon: peso de la primera iteración (f = g + (1 + epsilon) * h, como
+            el peso máximo de dynamic weighting)
+        decremento: cuánto baja epsilon en cada iteración
+        tiempo_max: segundos de reloj permitidos (None = sin límite)
+        max_expansiones: expansiones permitidas en total (None = sin límite)
+        heuristica: None o "manhattan", "exacta" o una tabla de h por celda
+        stats: EstadisticasBusqueda o función que la recibe al terminar
+        componentes: como en dynamic_weighting_search
+
+    Yields:
+        {"camino", "costo", "cota", "epsilon", "expansiones", "tiempo"} por
+        cada camino mejor que el anterior. La última entrega tiene cota 1.0
+        si se llegó a probar que el camino es óptimo.
+    """
+    stats, al_terminar = como_estadisticas(stats)
+    t_inicio = time.perf_counter()
+    limite = None if tiempo_max is None else t_inicio + tiempo_max
+    if max_expansiones is None:
+        max_expansiones = INFINITO
+
+    grid = como_grid(n, obstaculos, IMPASABLE)
+    rows, cols = grid.rows, grid.cols
+    costos = grid.costos
+    N = rows * cols
+    ultima_fila = rows - 1
+    ultima_col = cols - 1
+    meta_fila, meta_col = meta
+    celda_inicio = inicio[0] * cols + inicio[1]
+    celda_meta = meta_fila * cols + meta_col
+    tabla_h = resolver_heuristica(heuristica, grid, meta)
+
+    def h(celda):
+        if tabla_h is not None:
+            return tabla_h[celda]
+        fila, col = divmod(celda, cols)
+        return abs(fila - meta_fila) + abs(col - meta_col)
+
+    g_score = array('q', [INFINITO]) * N
+    padres = array('l', [-1]) * N
+    # Iteración en la que se expandió cada celda (0 = nunca): evita limpiar CLOSED
+    cerrados = array('l', [0]) * N
+    g_score[celda_inicio] = 0
+
+    # OPEN: celda -> g con el que está en el heap; INCONS: celdas ya expandidas
+    # en esta iteración cuyo g mejoró después
+    abiertos = {celda_inicio: 0}
+    incons = set()
+    # El inicio entra con f = 0, como en dynamic weighting (su h puede ser
+    # infinita en la tabla exacta si la hormiga está sobre veneno)
+    open_list = [(0, 0, celda_inicio)]
+    heappop = heapq.heappop
+    heappush = heapq.heappush
+
+    iteracion = 1
+    expansiones = 0
+    generados = 1
+    duplicados = 0
+    max_abiertos = 1
+    mejor_costo = INFINITO
+    fin = INTERRUMPIDA
+    sin_presupuesto = False
+
+    try:
+        if inalcanzable(grid, inicio, meta, componentes):
+            fin = SIN_CAMINO
+            return
+        while True:
+            peso = 1 + epsilon
+            # Mejorar el camino: expandir mientras algún f de OPEN sea menor que g(meta)
+            while open_list:
+                f_actual, g_negativo, actual = open_list[0]
+                if abiertos.get(actual) != -g_negativo:
+                    heappop(open_list)
+                    duplicados += 1
+                    continue
+                if f_actual >= g_score[celda_meta]:
+                    break
+                if expansiones >= max_expansiones or (
+                    limite is not None and expansiones % EXPANSIONES_POR_RELOJ == 0
+                    and time.perf_counter() > limite
+                ):
+                    sin_presupuesto = True
+                    break
+                heappop(open_list)
+                del abiertos[actual]
+                cerrados[actual] = iteracion
+                expansiones += 1
+
+                g_actual = g_score[actual]
+                fila, col = divmod(actual, cols)
+                for sucesor, valido in (
+                    (actual + cols, fila < ultima_fila),
+                    (actual - cols, fila > 0),
+                    (actual + 1, col < ultima_col),
+                    (actual - 1, col > 0),
+                ):
+                    if not valido:
+                        continue
+                    costo = costos[sucesor]
+                    if costo == IMPASABLE:
+                        continue
+                    tentative_g = g_actual + costo
+                    if tentative_g >= g_score[sucesor]:
+                        continue
+                    g_score[sucesor] = tentative_g
+                    padres[sucesor] = actual
+                    if cerrados[sucesor] == iteracion:
+                        # Ya expandida con este peso: se reabre en la próxima iteración
+                        incons.add(sucesor)
+                        continue
+                    h_sucesor = h(sucesor)
+                    if h_sucesor == INFINITO:
+                        continue  # Desde esta celda no se llega a la meta
+                    abiertos[sucesor] = tentative_g
+                    heappush(open_list, (tentative_g + peso * h_sucesor, -tentative_g, sucesor))
+                    generados += 1
+                if len(abiertos) > max_abiertos:
+                    max_abiertos = len(abiertos)
+
+            # Cota: costo actual sobre el menor g + h que queda por revisar
+            costo_meta = g_score[celda_meta]
+            minimo = min(
+                (g_score[celda] + h(celda) for celda in (*abiertos, *incons)),
+                default=INFINITO,
+            )
+            if costo_meta < INFINITO:
+                fin = META
+                cota = 1.0 if minimo >= costo_meta else min(1 + epsilon, costo_meta / minimo)
+                # Los padres pueden haber mejorado después de fijar g(meta): el
+                # camino que forman cuesta a lo sumo g(meta)
+                camino = reconstruir_camino(padres, celda_meta, cols)
+                costo_camino = sum(costos[fila * cols + col] for fila, col in camino[1:])
+                if costo_camino < mejor_costo or cota == 1.0:
+                    mejor_costo = costo_camino
+                    yield {
+                        "camino": camino,
+                        "costo": costo_camino,
+                        "cota": cota,
+                        "epsilon": epsilon,
+                        "expansiones": expansiones,
+                        "tiempo": time.perf_counter() - t_inicio,
+                    }
+                if cota == 1.0:
+                    return
+            elif not sin_presupuesto:
+                # OPEN se vació sin llegar a la meta
+                fin = SIN_CAMINO
+                return
+
+            if sin_presupuesto or epsilon == 0:
+                return
+
+            # Próxima iteración: menos peso, INCONS vuelve a OPEN y todas las
+            # prioridades se recalculan
+            epsilon = max(0, epsilon - decremento)
+            peso = 1 + epsilon
+            for celda in incons:
+                abiertos[celda] = g_score[celda]
+            incons.clear()
+            open_list = [
+                (g + peso * h(celda), -g, celda) for celda, g in abiertos.items()
+            ]
+            heapq.heapify(open_list)
+            iteracion += 1
+    finally:
+        if stats is not None:
+            stats.generados += generados
+            stats.expandidos += expansiones
+            stats.duplicados += duplicados
+            stats.max_abiertos = max(stats.max_abiertos, max_abiertos)
+            stats.sumar_tiempo("busqueda", time.perf_counter() - t_inicio)
+            stats.fin = fin
+        if al_terminar is not None:
+            al_terminar(stats)
@@ -0,0 +1,354 @@
+"""
+Lectura del formato de texto de los mapas (mapa.txt).
+
+    Tamaño(filas,columnas)
+    Hormiga(fila,columna)
+    Veneno((fila,columna),(fila,columna),...)
+    Hongo(fila,columna)
+
+Para colonias, cada línea Hormiga agrega una hormiga y una línea
+Hormigas((fila,columna),(fila,columna),...) agrega muchas de una vez.
+La primera hormiga es el inicio de las búsquedas de una sola hormiga.
+Lo mismo con los hongos: cada línea Hongo agrega uno, Hongos(...) agrega
+varios y el primero es la meta de las búsquedas que aceptan uno solo.
+
+Las coordenadas del archivo empiezan en 1. El archivo se lee línea por
+línea y las coordenadas de veneno se escriben directo en la capa de costos
+del Grid, sin armar tuplas ni diccionarios intermedios. Los problemas se
+registran con `logging` y se devuelven como una lista de ErrorMapa con el
+número de línea, en lugar de imprimirse.
+"""
+import logging
+import os
+import re
+from array import array
+from collections import namedtuple
+
+from .grid import COSTO_LIBRE, COSTO_VENENO, Grid
+
+logger = logging.getLogger(__name__)
+
+# Tamaño usado cuando el archivo no tiene la línea Tamaño(n,m)
+FILAS_POR_DEFECTO = 5
+COLUMNAS_POR_DEFECTO = 5
+
+_TAMANO = re.compile(r"Tama[ñn]o\(\s*(\d+)\s*,\s*(\d+)\s*\)$")
+_HORMIGA = re.compile(r"Hormiga\(\s*(\d+)\s*,\s*(\d+)\s*\)$")
+_HONGO = re.compile(r"Hongo\(\s*(\d+)\s*,\s*(\d+)\s*\)$")
+
+# Los paréntesis y comas de Veneno(...) se cambian por espacios y quedan
+# solo los números, que se convierten de una vez con split()
+_SEPARADORES = str.maketrans("(),", "   ")
+
+# Celdas con veneno en la capa de costos. re acepta cualquier buffer
+# (bytearray, memoryview de un mmap), así que se recorre sin copiarla.
+_BYTE_VENENO = bytes([COSTO_VENENO])
+_CELDA_VENENO = re.compile(re.escape(_BYTE_VENENO))
+_CELDA_NO_LIBRE = re.compile(b"[^" + re.escape(bytes([COSTO_LIBRE])) + b"]")
+
+# Coordenadas de veneno por cada escritura al guardar en texto
+VENENOS_POR_BLOQUE = 4096
+
+
+class ErrorMapa(namedtuple("ErrorMapa", "linea mensaje")):
+    """Problema encontrado al leer un mapa (linea es None si no aplica a una línea)."""
+
+    __slots__ = ()
+
+    def __str__(self):
+        if self.linea is None:
+            return self.mensaje
+        return f"línea {self.linea}: {self.mensaje}"
+
+
+class MapaInvalido(ValueError):
+    """Se lanza en modo estricto cuando el mapa tiene errores."""
+
+    def __init__(self, errores):
+        self.errores = errores
+        super().__init__("; ".join(str(error) for error in errores))
+
+
+class Mapa:
+    """
+    Mapa leído de un archivo: el Grid con el veneno ya marcado, la
+    posición de la hormiga (inicio) y la del hongo (meta), con índices
+    desde 0. hormigas tiene todas las hormigas (inicio es la primera) y
+    hongos todos los hongos (meta es el primero).
+    errores tiene los problemas encontrados al leerlo.
+    """
+
+    def __init__(self, grid, inicio=None, meta=None, errores=None, hormigas=None, hongos=None):
+        if hormigas is None:
+            hormigas = [inicio] if inicio is not None else []
+        elif inicio is None and hormigas:
+            inicio = hormigas[0]
+        if hongos is None:
+            hongos = [meta] if meta is not None else []
+        elif meta is None and hongos:
+            meta = hongos[0]
+        self.grid = grid
+        self.inicio = inicio
+        self.meta = meta
+        self.hormigas = hormigas
+        self.hongos = hongos
+        self.errores = errores if errores is not None else []
+
+    @property
+    def rows(self):
+        return self.grid.rows
+
+    @property
+    def cols(self):
+        return self.grid.cols
+
+    def __repr__(self):
+        hormigas = f", hormigas={len(self.hormigas)}" if len(self.hormigas) > 1 else ""
+        hongos = f", hongos={len(self.hongos)}" if len(self.hongos) > 1 else ""
+        return f"Mapa({self.rows}x{self.cols}, inicio={self.inicio}, meta={self.meta}{hormigas}{hongos})"
+
+    def venenos(self):
+        """Posiciones (fila, col) de las celdas con veneno."""
+        cols = self.cols
+        for encontrado in _CELDA_VENENO.finditer(self.grid.costos):
+            yield divmod(encontrado.start(), cols)
+
+    def no_libres(self):
+        """Posiciones (fila, col) de las celdas que no son libres (veneno, impasables u otro costo)."""
+        cols = self.cols
+        for encontrado in _CELDA_NO_LIBRE.finditer(self.grid.costos):
+            yield divmod(encontrado.start(), cols)
+
+
+def _leer_posicion(patron, linea, numero, nombre, errores):
+    encontrado = patron.match(linea)
+    if encontrado is None:
+        errores.append(ErrorMapa(numero, f"no se pudo leer {nombre}: {linea[:60]!r}"))
+        return None
+    return int(encontrado.group(1)) - 1, int(encontrado.group(2)) - 1
+
+
+def _leer_pares(linea, numero, errores, nombre="Veneno"):
+    # Retorna los números de la línea como array('l') fila, col, fila, col, ...
+    cuerpo = linea[len(nombre):]
+    try:
+        valores = array("l", map(int, cuerpo.translate(_SEPARADORES).split()))
+    except ValueError:
+        errores.append(ErrorMapa(numero, f"{nombre} tiene coordenadas que no son números"))
+        return None
+    if len(valores) % 2:
+        errores.append(ErrorMapa(numero, f"{nombre} tiene una coordenada sin pareja"))
+        valores.pop()
+    return valores
+
+
+def _marcar_venenos(grid, valores, numero, errores):
+    rows = grid.rows
+    cols = grid.cols
+    costos = grid.costos
+    filas = valores[0::2]
+    columnas = valores[1::2]
+    if not filas:
+        return
+
+    # Caso común: todo dentro del tablero, se marca sin revisar cada par
+    if 0 < min(filas) and max(filas) <= rows and 0 < min(columnas) and max(columnas) <= cols:
+        desfase = cols + 1
+        for fila, col in zip(filas, columnas):
+            costos[fila * cols + col - desfase] = COSTO_VENENO
+        return
+
+    fuera = 0
+    for fila, col in zip(filas, columnas):
+        if 0 < fila <= rows and 0 < col <= cols:
+            costos[(fila - 1) * cols + col - 1] = COSTO_VENENO
+        else:
+            fuera += 1
+    if fuera:
+        errores.append(ErrorMapa(numero, f"{fuera} venenos fuera del tablero {rows}x{cols}"))
+
+
+def _validar_posiciones(grid, posiciones, nombre, errores):
+    # posiciones: lista de (número de línea, posición desde 0); nombre en plural
+    validas = []
+    fuera = {}
+    for numero, posicion in posiciones:
+        if grid.dentro(posicion):
+            validas.append(posicion)
+        else:
+            fuera[numero] = fuera.get(numero, 0) + 1
+    for numero, cantidad in fuera.items():
+        errores.append(ErrorMapa(
+            numero, f"{cantidad} {nombre} fuera del tablero {grid.rows}x{grid.cols}"
+        ))
+    return validas
+
+
+def leer_lineas(lineas):
+    """
+    Interpreta las líneas de un mapa (cualquier iterable de str).
+
+    Returns:
+        Mapa con el Grid, inicio, meta y la lista de errores
+    """
+    errores = []
+    grid = None
+    pendientes = []  # Venenos leídos antes de conocer el tamaño
+    hormigas = []  # (número de línea, posición)
+    hongos = []
+
+    for numero, linea in enumerate(lineas, 1):
+        linea = linea.strip()
+        if not linea:
+            continue
+
+        if linea.startswith(("Tamaño", "Tamano")):
+            tamano = _leer_posicion(_TAMANO, linea, numero, "el tamaño", errores)
+            if tamano is None:
+                continue
+            if grid is not None:
+                errores.append(ErrorMapa(numero, "Tamaño repetido, se ignora"))
+                continue
+            rows, cols = tamano[0] + 1, tamano[1] + 1
+            if rows <= 0 or cols <= 0:
+                errores.append(ErrorMapa(numero, f"dimensiones inválidas: {rows}x{cols}"))
+                continue
+            grid = Grid(rows, cols)
+            logger.debug("línea %d: tamaño %dx%d", numero, rows, cols)
+
+        elif linea.startswith("Hormigas"):
+            valores = _leer_pares(linea, numero, errores, "Hormigas")
+            if valores is None:
+                continue
+            hormigas.extend(
+                (numero, (fila - 1, col - 1)) for fila, col in zip(valores[0::2], valores[1::2])
+            )
+
+        elif linea.startswith("Hormiga"):
+            posicion = _leer_posicion(_HORMIGA, linea, numero, "la hormiga", errores)
+            if posicion is not None:
+                hormigas.append((numero, posicion))
+
+        elif linea.startswith("Hongos"):
+            valores = _leer_pares(linea, numero, errores, "Hongos")
+            if valores is None:
+                continue
+            hongos.extend(
+                (numero, (fila - 1, col - 1)) for fila, col in zip(valores[0::2], valores[1::2])
+            )
+
+        elif linea.startswith("Hongo"):
+            posicion = _leer_posicion(_HONGO, linea, numero, "el hongo", errores)
+            if posicion is not None:
+                hongos.append((numero, posicion))
+
+        elif linea.startswith("Veneno"):
+            valores = _leer_pares(linea, numero, errores)
+            if valores is None:
+                continue
+            logger.debug("línea %d: %d venenos", numero, len(valores) // 2)
+            if grid is None:
+                pendientes.append((numero, valores))
+            else:
+                _marcar_venenos(grid, valores, numero, errores)
+
+        else:
+            errores.append(ErrorMapa(numero, f"línea no reconocida: {linea[:60]!r}"))
+
+    if grid is None:
+        errores.append(ErrorMapa(
+            None, f"falta Tamaño(n,m), se usa {FILAS_POR_DEFECTO}x{COLUMNAS_POR_DEFECTO}"
+        ))
+        grid = Grid(FILAS_POR_DEFECTO, COLUMNAS_POR_DEFECTO)
+    for numero, valores in pendientes:
+        _marcar_venenos(grid, valores, numero, errores)
+
+    validas = _validar_posiciones(grid, hormigas, "hormigas", errores)
+    hongos_validos = _validar_posiciones(grid, hongos, "hongos", errores)
+    if not hormigas:
+        errores.append(ErrorMapa(None, "falta Hormiga(fila,columna)"))
+    if not hongos:
+        errores.append(ErrorMapa(None, "falta Hongo(fila,columna)"))
+
+    # Los errores sin línea (faltantes) van al final
+    errores.sort(key=lambda error: (error.linea is None, error.linea or 0))
+    for error in errores:
+        logger.warning("%s", error)
+    return Mapa(grid, errores=errores, hormigas=validas, hongos=hongos_validos)
+
+
+def cargar_mapa(origen, estricto=False):
+    """
+    Carga un mapa en formato de texto.
+
+    Args:
+        origen: ruta (str o PathLike) o archivo abierto en modo texto
+        estricto: si es True, lanza MapaInvalido cuando hay errores
+
+    Returns:
+        Mapa con el Grid, inicio, meta y la lista de errores
+    """
+    if isinstance(origen, (str, bytes, os.PathLike)):
+        with open(origen, encoding="utf-8") as archivo:
+            mapa = leer_lineas(archivo)
+        nombre = os.fsdecode(origen)
+    else:
+        mapa = leer_lineas(origen)
+        nombre = getattr(origen, "name", repr(origen))
+
+    logger.info("Mapa %s cargado: %r, %d errores", nombre, mapa, len(mapa.errores))
+    if estricto and mapa.errores:
+        raise MapaInvalido(mapa.errores)
+    return mapa
+
+
+def guardar_mapa(mapa, destino):
+    """
+    Escribe un Mapa en formato de texto. Toda celda que no es libre se
+    escribe como veneno (el formato de texto no tiene otros costos).
+
+    Args:
+        mapa: Mapa a guardar
+        destino: ruta (str o PathLike) o archivo abierto en modo texto
+    """
+    if isinstance(destino, (str, bytes, os.PathLike)):
+        with open(destino, "w", encoding="utf-8") as archivo:
+            guardar_mapa(mapa, archivo)
+        return
+
+    cols = mapa.cols
+    destino.write(f"Tamaño({mapa.rows},{cols})\n")
+    if len(mapa.hormigas) > 1:
+        destino.write("Hormigas(")
+        destino.write(",".join(f"({fila + 1},{col + 1})" for fila, col in mapa.hormigas))
+        destino.write(")\n")
+    elif mapa.inicio is not None:
+        destino.write(f"Hormiga({mapa.inicio[0] + 1},{mapa.inicio[1] + 1})\n")
+
+    # La línea de veneno se escribe por bloques para no armarla entera en memoria
+    destino.write("Veneno(")
+    bloque = []
+    separador = ""
+    otros_costos = 0
+    for encontrado in _CELDA_NO_LIBRE.finditer(mapa.grid.costos):
+        celda = encontrado.start()
+        if encontrado.group() != _BYTE_VENENO:
+            otros_costos += 1
+        fila, col = divmod(celda, cols)
+        bloque.append(f"({fila + 1},{col + 1})")
+        if len(bloque) == VENENOS_POR_BLOQUE:
+            destino.write(separador + ",".join(bloque))
+            separador = ","
+            bloque.clear()
+    if bloque:
+        destino.write(separador + ",".join(bloque))
+    destino.write(")\n")
+
+    if len(mapa.hongos) > 1:
+        destino.write("Hongos(")
+        destino.write(",".join(f"({fila + 1},{col + 1})" for fila, col in mapa.hongos))
+        destino.write(")\n")
+    elif mapa.meta is not None:
+        destino.write(f"Hongo({mapa.meta[0] + 1},{mapa.meta[1] + 1})\n")
+    if otros_costos:
+        logger.warning("%d celdas con costos distintos de veneno se guardaron como veneno", otros_costos)
@@ -1,3 +1,26 @@
+import heapq
+import logging
+import time
+from array import array
+from bisect import bisect_left
+from operator import itemgetter
+
+from .componentes import inalcanzable
+from .estadisticas import (
+    INTERRUMPIDA,
+    EstadisticasBusqueda,
+    LIMITE_ITERACIONES,
+    META,
+    SIN_CAMINO,
+    como_estadisticas,
+)
+from .grid import COSTO_VENENO, INFINITO, como_grid, como_metas
+from .heuristicas import resolver_heuristica
+from .pasos import agotar
+
+logger = logging.getLogger(__name__)
+
+
 # Calcula la distancia manhattan entre 2 puntos
 def manhattan(pos1, pos2):
     return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
@@ -34,34 +57,44 @@ def isNodoMeta(meta, posicion):
     return meta[0] == posicion[0] and meta[1] == posicion[1]
 
 
-def calcular_beam_width(n, num_obstaculos):
+# Política de ancho de haz: tabla de anchos por tamaño del lado y densidad
+# de obstáculos. anchos[i][j] vale para lados <= lados[i] (el último renglón
+# para lados mayores) y densidades <= densidades[j] (la última columna para
+# densidades mayores). Esta es la tabla de siempre (base 5/4/3 según el lado
+# por 1.0/1.2/1.5 según la densidad, entre 3 y 10); benchmarks/ajuste_beam.py
+# genera otras a partir de corridas medidas.
+POLITICA_POR_DEFECTO = {
+    "lados": [10, 30, 50],
+    "densidades": [0.2, 0.4],
+    "anchos": [
+        [5, 6, 7],
+        [4, 4, 6],
+        [3, 3, 4],
+        [3, 3, 4],
+    ],
+}
+
+# Factor con el que crece el ancho en cada reintento del modo adaptativo
+FACTOR_ENSANCHE = 2
+
+
+def calcular_beam_width(n, num_obstaculos, m=None, politica=None):
     """
-    n: tamaño del tablero (nxn)
+    n: tamaño del tablero (nxn), o cantidad de filas si se indica m
     num_obstaculos: cantidad de obstáculos en el tablero
+    m: cantidad de columnas en tableros rectangulares (por defecto n)
+    politica: tabla de anchos (ver POLITICA_POR_DEFECTO); None usa la de siempre
     """
-    densidad = num_obstaculos / (n * n)
-    
-    if n <= 10:
-        base = 5
-    elif n <= 30:
-        base = 4
-    elif n <= 50:
-        base = 3
-    else:
-        base = 3
-    
-    # Ajustar por densidad de obstáculos
-    if densidad > 0.4:  # Muchos obstáculos
-        multiplicador = 1.5
-    elif densidad > 0.2:  # Obstáculos moderados
-        multiplicador = 1.2
-    else:  # Pocos obstáculos
-        multiplicador = 1.0
-    
-    beam_width = int(base * multiplicador)
-    
-    # Limitar entre valores razonables
-    return max(3, min(beam_width, 10))
+    if m is None:
+        m = n
+    if politica is None:
+        politica = POLITICA_POR_DEFECTO
+    densidad = num_obstaculos / (n * m)
+    lado = max(n, m)
+
+    fila = bisect_left(politica["lados"], lado)
+    columna = bisect_left(politica["densidades"], densidad)
+    return politica["anchos"][fila][columna]
 
 
 def expandir_nodo(nodo_actual, meta, obstaculos, n, indice_padre):
@@ -97,105 +130,386 @@ def expandir_nodo(nodo_actual, meta, obstaculos, n, indice_padre):
     return sucesores
 
 
-def reconstruir_camino(closedList, indice_meta):
+class ArenaNodos:
+    """
+    Almacén compacto de los nodos generados por beam search.
+
+    Cada nodo ocupa el mismo índice en cuatro arreglos paralelos:
+    celda (fila * cols + columna), índice del padre (-1 para la raíz), g y h.
+    El bytearray `visitados` permite saber en O(1) si una celda ya está en
+    el almacén, en lugar de recorrer toda la lista de nodos.
+    """
+
+    def __init__(self, filas, cols):
+        self.cols = cols
+        self.celdas = array('l')
+        self.padres = array('l')
+        self.g = array('l')
+        self.h = array('l')
+        self.visitados = bytearray(filas * cols)
+
+    def __len__(self):
+        return len(self.celdas)
+
+    def agregar(self, celda, indice_padre, g_n, h_n):
+        self.celdas.append(celda)
+        self.padres.append(indice_padre)
+        self.g.append(g_n)
+        self.h.append(h_n)
+        self.visitados[celda] = 1
+        return len(self.celdas) - 1
+
+    def extender(self, celdas, padres, g, h):
+        """Agrega varios nodos de una vez; retorna el índice del primero."""
+        primero = len(self.celdas)
+        self.celdas.extend(celdas)
+        self.padres.extend(padres)
+        self.g.extend(g)
+        self.h.extend(h)
+        visitados = self.visitados
+        for celda in celdas:
+            visitados[celda] = 1
+        return primero
+
+
+def reconstruir_camino(arena, indice_meta):
     """
     Reconstruye el camino desde el inicio hasta la meta
-    siguiendo los índices de padres
+    siguiendo los índices de padres guardados en la arena
     """
     camino = []
+    celdas = arena.celdas
+    padres = arena.padres
+    cols = arena.cols
     indice_actual = indice_meta
-    
-    while indice_actual is not None:
-        nodo = closedList[indice_actual]
-        camino.append(nodo[0])  # Agregar la posición
-        indice_actual = nodo[1]  # Moverse al padre
-    
+
+    while indice_actual != -1:
+        camino.append(divmod(celdas[indice_actual], cols))  # Agregar la posición
+        indice_actual = padres[indice_actual]  # Moverse al padre
+
     camino.reverse()  # Invertir para tener el camino de inicio a meta
     return camino
 
 
-def beam_search(n, inicio, meta, obstaculos):
+def marcar_callejones(grid, muertas, celda, protegidas):
+    """
+    Marca `celda` como callejón sin salida si le queda a lo sumo una vecina
+    viva, y sigue hacia esa vecina mientras pase lo mismo. Un camino simple
+    a la meta nunca entra a un callejón (salvo que empiece o termine en él),
+    así que las celdas marcadas se descartan como candidatas.
+    protegidas: celdas que nunca se marcan (inicio y meta)
+    """
+    cols = grid.cols
+    while not muertas[celda] and celda not in protegidas:
+        vivas = [vecina for vecina in grid.vecinos(celda) if not muertas[vecina]]
+        # La hormiga puede estar sobre una celda impasable: igual cuenta como salida
+        fila, col = divmod(celda, cols)
+        for protegida in protegidas:
+            pf, pc = divmod(protegida, cols)
+            if abs(pf - fila) + abs(pc - col) == 1 and protegida not in vivas:
+                vivas.append(protegida)
+        if len(vivas) > 1:
+            return
+        muertas[celda] = 1
+        if not vivas:
+            return
+        celda = vivas[0]
+
+
+def beam_search(n, inicio, meta, obstaculos=None, beamWidth=None, mode="python",
+                heuristica=None, stats=None, al_expandir=None, adaptativo=False, politica=None,
+                componentes=None):
     """
     Implementación del algoritmo Beam Search
+    (ejecuta beam_search_pasos hasta el final)
     
     Args:
-        n: tamaño del tablero (n x n)
+        n: tamaño del tablero (n x n), o un Grid ya construido
         inicio: tupla (x, y) posición inicial
-        meta: tupla (x, y) posición objetivo
+        meta: tupla (x, y) posición objetivo, o lista de posiciones: la
+            búsqueda termina en la primera que alcanza (el último elemento
+            del camino) y manhattan es la mínima sobre todas
         obstaculos: lista de tuplas con posiciones de obstáculos
+            (solo con la firma antigua; el veneno cuesta COSTO_VENENO)
+        beamWidth: ancho de haz; si es None se calcula con calcular_beam_width
+        mode: "python" (expansión nodo a nodo, implementación de referencia)
+            o "vectorized" (expande todo el haz a la vez con NumPy)
+        heuristica: None o "manhattan", "exacta" (distancia real cacheada,
+            ver heuristicas.py) o una tabla de h indexada por celda
+        stats: EstadisticasBusqueda o función que la recibe al terminar
+            (ver estadisticas.py); None para no medir nada
+        al_expandir: función (posicion, g, f) llamada en cada expansión
+        adaptativo: si el haz se queda sin nodos, reintentar con un ancho
+            FACTOR_ENSANCHE veces mayor hasta encontrar camino o recorrer todo
+            lo alcanzable. Cada celda queda una sola vez entre los candidatos
+            de un nivel y los callejones sin salida marcados en un intento se
+            descartan en los siguientes.
+        politica: tabla de anchos para calcular_beam_width cuando beamWidth es None
+        componentes: ComponentesConexas del tablero para descartar al instante
+            las metas inalcanzables; si es None no se comprueba (ver
+            componentes.py)
     
     Returns:
         camino: lista de posiciones desde inicio hasta meta
         None si no se encuentra camino
     """
+    return agotar(beam_search_pasos(n, inicio, meta, obstaculos, beamWidth, mode, heuristica,
+                                    stats, al_expandir, adaptativo, politica, componentes))
+
+
+def beam_search_pasos(n, inicio, meta, obstaculos=None, beamWidth=None, mode="python",
+                      heuristica=None, stats=None, al_expandir=None, adaptativo=False,
+                      politica=None, componentes=None):
+    """
+    Beam search como generador: mismos argumentos que beam_search.
+
+    Yields:
+        después de cada nivel del haz, {"iteracion", "expansiones", "nodos"}
+        (en modo adaptativo también "ancho"; las expansiones se acumulan
+        entre intentos)
+
+    Returns:
+        el camino o None (valor de StopIteration)
+    """
+    stats, al_terminar = como_estadisticas(stats)
+    try:
+        grid = como_grid(n, obstaculos, COSTO_VENENO)
+        if inalcanzable(grid, inicio, meta, componentes):
+            # Hormiga y hongo en componentes distintas: no hace falta buscar
+            if stats is not None:
+                stats.fin = SIN_CAMINO
+            return None
+        # Definir el ancho de haz
+        if beamWidth is None:
+            if obstaculos is not None:
+                num_obstaculos = len(obstaculos)
+            else:
+                num_obstaculos = grid.contar_obstaculos()
+            beamWidth = calcular_beam_width(grid.rows, num_obstaculos, grid.cols, politica)
+
+        if adaptativo:
+            return (yield from _beam_adaptativo_pasos(
+                grid, inicio, meta, beamWidth, mode, heuristica, stats, al_expandir
+            ))
+        return (yield from _beam_search_pasos(
+            grid, inicio, meta, beamWidth, mode, heuristica, stats, al_expandir
+        ))
+    finally:
+        if al_terminar is not None:
+            al_terminar(stats)
+
+
+def _beam_adaptativo_pasos(grid, inicio, meta, beamWidth, mode, heuristica, stats, al_expandir):
+    # Reintentos con ancho creciente. Las estadísticas de cada intento se
+    # acumulan en el mismo objeto (hace falta uno para saber si hubo poda)
+    registro = stats if stats is not None else EstadisticasBusqueda()
+    muertas = bytearray(len(grid))
+    ancho = beamWidth
+    previas = 0
+    while True:
+        podados_antes = registro.podados
+        expandidos_antes = registro.expandidos
+        pasos = _beam_search_pasos(
+            grid, inicio, meta, ancho, mode, heuristica, registro, al_expandir, muertas
+        )
+        try:
+            while True:
+                try:
+                    progreso = next(pasos)
+                except StopIteration as final:
+                    camino = final.value
+                    break
+                progreso["expansiones"] += previas
+                progreso["ancho"] = ancho
+                yield progreso
+        finally:
+            pasos.close()
+
+        if camino is not None:
+            return camino
+        # Sin poda el haz ya recorrió todo lo alcanzable: no hay camino. Como
+        # los candidatos de un nivel no repiten celdas, con ancho len(grid) no
+        # se poda nada y el ciclo termina acá
+        if registro.fin == SIN_CAMINO and registro.podados == podados_antes:
+            return None
+        previas += registro.expandidos - expandidos_antes
+        nuevo = min(len(grid), ancho * FACTOR_ENSANCHE)
+        logger.info("beam search sin camino con ancho %d; se reintenta con %d", ancho, nuevo)
+        ancho = nuevo
+
+
+def _beam_search_pasos(grid, inicio, meta, beamWidth, mode, heuristica, stats, al_expandir,
+                       muertas=None):
+    # muertas: bytearray de callejones sin salida (ver marcar_callejones) que
+    # se completa durante la búsqueda, o None. Solo lo pasa el modo adaptativo,
+    # que además deja cada celda una sola vez entre los candidatos de un nivel
+    rows, cols = grid.rows, grid.cols
+    costos = grid.costos
     
-    # Definir el ancho de haz
-    beamWidth = calcular_beam_width(n, len(obstaculos))
+    # None = manhattan; si no, tabla de h por celda (INFINITO = sin camino)
+    medir = stats is not None
+    if medir:
+        t0 = time.perf_counter()
+    tabla_h = resolver_heuristica(heuristica, grid, meta)
+    if medir:
+        stats.sumar_tiempo("heuristica", time.perf_counter() - t0)
     
-    # closedList: guarda nodos expandidos
-    # Cada elemento: [posicion, indice_padre, g_n, h_n]
-    closedList = []
+    if mode == "vectorized":
+        # NumPy es opcional: solo se importa al pedir el modo vectorizado
+        from .beam_vectorizado import beam_search_vectorizado_pasos
+        return (yield from beam_search_vectorizado_pasos(
+            grid, inicio, meta, beamWidth, tabla_h, stats, al_expandir, muertas
+        ))
+    if mode != "python":
+        raise ValueError(f"Modo desconocido: {mode!r} (use 'python' o 'vectorized')")
+    
+    # arena: guarda los nodos expandidos en arreglos paralelos
+    arena = ArenaNodos(rows, cols)
+    visitados = arena.visitados
     
     # Agregar nodo inicial
-    h_inicial = manhattan(inicio, meta)
-    closedList.append([inicio, None, 0, h_inicial])
+    metas = como_metas(meta)
+    celdas_meta = {grid.celda(posicion) for posicion in metas}
+    meta_fila, meta_col = metas[0]
+    varias_metas = len(metas) > 1
+    celda_inicio = grid.celda(inicio)
+    if tabla_h is None:
+        h_inicial = min(manhattan(inicio, posicion) for posicion in metas)
+    else:
+        h_inicial = tabla_h[celda_inicio]
+    arena.agregar(celda_inicio, -1, 0, h_inicial)
     
     # Verificar si ya estamos en la meta
-    if isNodoMeta(meta, inicio):
+    if celda_inicio in celdas_meta:
+        if medir:
+            stats.fin = META
         return [inicio]
     
+    protegidas = (celda_inicio, *celdas_meta)
+
+    # Con la heurística exacta ya se sabe si la meta es alcanzable
+    if h_inicial >= INFINITO:
+        if medir:
+            stats.fin = SIN_CAMINO
+        return None
+    
     # openList: nodos candidatos para expandir en la siguiente iteración
-    openList = [0]  # Índices de nodos en closedList que están en el beam actual
+    openList = [0]  # Índices de nodos en la arena que están en el beam actual
     
     iteracion = 0
-    max_iteraciones = n * n * 2  # Límite de seguridad
+    expansiones = 0
+    max_iteraciones = rows * cols * 2  # Límite de seguridad
+
+    # Contadores locales; se copian a stats al terminar
+    generados = 0
+    duplicados = 0
+    podados = 0
+    max_abiertos = 0
+    fin = INTERRUMPIDA
     
-    while openList and iteracion < max_iteraciones:
-        iteracion += 1
-        
-        # Lista para guardar todos los sucesores de los nodos en el beam
-        todos_sucesores = []
-        
-        # Expandir cada nodo en el beam actual
-        for indice_nodo in openList:
-            nodo = closedList[indice_nodo]
+    try:
+        while openList and iteracion < max_iteraciones:
+            iteracion += 1
+            expansiones += len(openList)
+            if medir:
+                t0 = time.perf_counter()
             
-            # Generar sucesores
-            sucesores = expandir_nodo(nodo, meta, obstaculos, n, indice_nodo)
+            # Lista para guardar todos los sucesores de los nodos en el beam
+            todos_sucesores = []
             
-            for sucesor in sucesores:
-                indice_padre, posicion, g_n, h_n, f_n = sucesor
+            # Expandir cada nodo en el beam actual
+            for indice_nodo in openList:
+                g_actual = arena.g[indice_nodo]
+                if al_expandir is not None:
+                    al_expandir(
+                        divmod(arena.celdas[indice_nodo], cols), g_actual, g_actual + arena.h[indice_nodo]
+                    )
                 
-                # Verificar si encontramos la meta
-                if isNodoMeta(meta, posicion):
-                    # Agregar el nodo meta a closedList
-                    closedList.append([posicion, indice_padre, g_n, h_n])
-                    indice_meta = len(closedList) - 1
+                # Generar sucesores (arriba, abajo, izquierda, derecha)
+                for celda in grid.vecinos(arena.celdas[indice_nodo]):
                     
-                    # Reconstruir y retornar el camino
-                    return reconstruir_camino(closedList, indice_meta)
-                
-                # Verificar si ya visitamos esta posición
-                ya_visitado = any(n[0] == posicion for n in closedList)
-                
-                if not ya_visitado:
-                    todos_sucesores.append((posicion, indice_padre, g_n, h_n, f_n))
-        
-        # Si no hay sucesores, no hay camino
-        if not todos_sucesores:
-            return None
-        
-        # Ordenar sucesores por f(n) = g(n) + h(n)
-        todos_sucesores.sort(key=lambda x: x[4])
-        
-        # Seleccionar los beamWidth mejores nodos (poda)
-        mejores_sucesores = todos_sucesores[:beamWidth]
+                    # Verificar si encontramos la meta
+                    if celda in celdas_meta:
+                        # Agregar el nodo meta a la arena
+                        indice_meta = arena.agregar(celda, indice_nodo, g_actual + costos[celda], 0)
+                        generados += len(todos_sucesores) + 1
+                        fin = META
+                        
+                        # Reconstruir y retornar el camino
+                        return reconstruir_camino(arena, indice_meta)
+                    
+                    # Verificar si ya visitamos esta posición (O(1))
+                    if visitados[celda]:
+                        duplicados += 1
+                        continue
+                    if muertas is not None and muertas[celda]:
+                        continue
+                    g_n = g_actual + costos[celda]
+                    if tabla_h is None:
+                        fila, col = divmod(celda, cols)
+                        if varias_metas:
+                            h_n = min(abs(fila - mf) + abs(col - mc) for mf, mc in metas)
+                        else:
+                            h_n = abs(fila - meta_fila) + abs(col - meta_col)
+                    else:
+                        h_n = tabla_h[celda]
+                        if h_n == INFINITO:
+                            continue  # Desde esta celda no se llega a la meta
+                    todos_sucesores.append((celda, indice_nodo, g_n, h_n, g_n + h_n))
+
+                if muertas is not None:
+                    marcar_callejones(grid, muertas, arena.celdas[indice_nodo], protegidas)
+            
+            if muertas is not None:
+                # Modo adaptativo: una celda generada por varios nodos del haz
+                # queda una sola vez (con su mejor f) para no ocupar varios lugares
+                unicos = {}
+                for sucesor in todos_sucesores:
+                    previo = unicos.get(sucesor[0])
+                    if previo is None or sucesor[4] < previo[4]:
+                        unicos[sucesor[0]] = sucesor
+                duplicados += len(todos_sucesores) - len(unicos)
+                todos_sucesores = list(unicos.values())
+
+            generados += len(todos_sucesores)
+            if len(todos_sucesores) > max_abiertos:
+                max_abiertos = len(todos_sucesores)
+            if medir:
+                t1 = time.perf_counter()
+                stats.sumar_tiempo("expansion", t1 - t0)
+            
+            # Si no hay sucesores, no hay camino
+            if not todos_sucesores:
+                fin = SIN_CAMINO
+                return None
+            
+            # Seleccionar los beamWidth mejores nodos por f(n) = g(n) + h(n) (poda).
+            # nsmallest equivale a ordenar de forma estable y cortar, sin ordenar todo
+            mejores_sucesores = heapq.nsmallest(beamWidth, todos_sucesores, key=itemgetter(4))
+            podados += len(todos_sucesores) - len(mejores_sucesores)
+            
+            # Agregar los mejores sucesores a la arena y actualizar openList
+            openList = []
+            for celda, indice_padre, g_n, h_n, f_n in mejores_sucesores:
+                openList.append(arena.agregar(celda, indice_padre, g_n, h_n))
+            if medir:
+                stats.sumar_tiempo("poda", time.perf_counter() - t1)
+            
+            yield {"iteracion": iteracion, "expansiones": expansiones, "nodos": len(arena)}
         
-        # Agregar los mejores sucesores a closedList y actualizar openList
-        openList = []
-        for posicion, indice_padre, g_n, h_n, f_n in mejores_sucesores:
-            closedList.append([posicion, indice_padre, g_n, h_n])
-            openList.append(len(closedList) - 1)
-    
-    # No se encontró camino
-    return None
\ No newline at end of file
+        # No se encontró camino
+        if openList:
+            fin = LIMITE_ITERACIONES
+            logger.warning("beam search se detuvo en el límite de %d iteraciones", max_iteraciones)
+        else:
+            fin = SIN_CAMINO
+        return None
+    finally:
+        if medir:
+            stats.generados += generados
+            stats.expandidos += expansiones
+            stats.niveles += iteracion
+            stats.podados += podados
+            stats.duplicados += duplicados
+            stats.max_abiertos = max(stats.max_abiertos, max_abiertos)
+            stats.fin = fin
@@ -0,0 +1,236 @@
+"""
+Beam search vectorizado con NumPy.
+
+En cada nivel se expande el haz completo de una vez: los vecinos se
+calculan sumando los desplazamientos del Grid a todas las celdas del haz,
+se enmascaran bordes, veneno impasable y celdas visitadas, y g/h/f se
+calculan como vectores. Los beamWidth mejores se eligen con argpartition
+en lugar de ordenar todos los sucesores.
+
+Produce exactamente el mismo camino que beam_search(mode="python"). En
+modo adaptativo los callejones se marcan al final de cada nivel (en Python,
+después de cada nodo), así que el camino puede diferir aunque los dos
+modos encuentran camino en los mismos casos.
+"""
+import time
+
+import numpy as np
+
+from .beam_search import ArenaNodos, manhattan, marcar_callejones, reconstruir_camino
+from .estadisticas import INTERRUMPIDA, LIMITE_ITERACIONES, META, SIN_CAMINO
+from .grid import IMPASABLE, INFINITO, como_metas
+from .pasos import agotar
+
+
+def seleccionar_mejores(f_n, k):
+    """
+    Índices de los k menores valores de f_n, ordenados por (f, posición).
+    Equivale a un ordenamiento estable seguido de un corte en k.
+    """
+    if f_n.size <= k:
+        return np.argsort(f_n, kind="stable")
+
+    # Valor del k-ésimo menor sin ordenar todo el arreglo
+    kesimo = f_n[np.argpartition(f_n, k - 1)[k - 1]]
+
+    # Los empates con el k-ésimo se resuelven por orden de generación
+    menores = np.flatnonzero(f_n < kesimo)
+    empates = np.flatnonzero(f_n == kesimo)[: k - menores.size]
+    elegidas = np.concatenate((menores, empates))
+    return elegidas[np.argsort(f_n[elegidas], kind="stable")]
+
+
+def unicas_por_celda(celdas, f_n):
+    """
+    Índices que dejan cada celda una sola vez: la de menor f (en empate, la
+    primera generada), en el orden en que cada celda apareció por primera vez.
+    """
+    orden = np.lexsort((np.arange(celdas.size), f_n, celdas))
+    celdas_ordenadas = celdas[orden]
+    inicio_grupo = np.ones(celdas.size, dtype=bool)
+    inicio_grupo[1:] = celdas_ordenadas[1:] != celdas_ordenadas[:-1]
+    grupos = np.flatnonzero(inicio_grupo)
+    mejores = orden[grupos]
+    primeras = np.minimum.reduceat(orden, grupos)
+    return mejores[np.argsort(primeras, kind="stable")]
+
+
+def beam_search_vectorizado(grid, inicio, meta, beamWidth, tabla_h=None, stats=None,
+                            al_expandir=None, muertas=None):
+    return agotar(beam_search_vectorizado_pasos(grid, inicio, meta, beamWidth, tabla_h, stats,
+                                                al_expandir, muertas))
+
+
+def beam_search_vectorizado_pasos(grid, inicio, meta, beamWidth, tabla_h=None, stats=None,
+                                  al_expandir=None, muertas=None):
+    """
+    Generador: entrega el progreso después de cada nivel del haz y
+    retorna el camino (o None) al terminar.
+    stats (EstadisticasBusqueda o None) y al_expandir funcionan igual que
+    en beam_search. muertas es el bytearray de callejones del modo
+    adaptativo (ver beam_search._beam_search_pasos) o None.
+    """
+    rows, cols = grid.rows, grid.cols
+    costos = np.frombuffer(grid.costos, dtype=np.uint8)
+    desplazamientos = np.array(grid.desplazamientos, dtype=np.int64)
+
+    arena = ArenaNodos(rows, cols)
+    # Vista NumPy sobre el mismo bytearray de visitados de la arena
+    visitados = np.frombuffer(arena.visitados, dtype=np.uint8)
+
+    metas = como_metas(meta)
+    celdas_meta = np.array([grid.celda(posicion) for posicion in metas], dtype=np.int64)
+    filas_meta = np.array([fila for fila, _ in metas], dtype=np.int64)[:, None]
+    cols_meta = np.array([col for _, col in metas], dtype=np.int64)[:, None]
+    celda_inicio = grid.celda(inicio)
+    if tabla_h is None:
+        h_inicial = min(manhattan(inicio, posicion) for posicion in metas)
+    else:
+        # Con array('q') NumPy usa el mismo buffer, sin copiar la tabla
+        tabla_h = np.asarray(tabla_h, dtype=np.int64)
+        h_inicial = int(tabla_h[celda_inicio])
+    arena.agregar(celda_inicio, -1, 0, h_inicial)
+    if muertas is not None:
+        vista_muertas = np.frombuffer(muertas, dtype=np.uint8)
+        protegidas = (celda_inicio, *celdas_meta.tolist())
+
+    medir = stats is not None
+    if celda_inicio in celdas_meta:
+        if medir:
+            stats.fin = META
+        return [inicio]
+
+    # Con la heurística exacta ya se sabe si la meta es alcanzable
+    if h_inicial >= INFINITO:
+        if medir:
+            stats.fin = SIN_CAMINO
+        return None
+
+    # Estado del haz actual: índices en la arena, celdas y g
+    haz_indices = np.zeros(1, dtype=np.int64)
+    haz_celdas = np.array([celda_inicio], dtype=np.int64)
+    haz_g = np.zeros(1, dtype=np.int64)
+
+    iteracion = 0
+    expansiones = 0
+    max_iteraciones = rows * cols * 2  # Límite de seguridad
+
+    # Contadores; se copian a stats al terminar
+    generados = 0
+    duplicados = 0
+    podados = 0
+    max_abiertos = 0
+    fin = INTERRUMPIDA
+
+    try:
+        while haz_indices.size and iteracion < max_iteraciones:
+            iteracion += 1
+            expansiones += haz_indices.size
+            if medir:
+                t0 = time.perf_counter()
+            if al_expandir is not None:
+                for celda, g_nodo, indice in zip(
+                    haz_celdas.tolist(), haz_g.tolist(), haz_indices.tolist()
+                ):
+                    al_expandir(divmod(celda, cols), g_nodo, g_nodo + arena.h[indice])
+
+            # Matriz (nodos del haz x 4 movimientos) aplanada fila por fila:
+            # mismo orden que la expansión nodo a nodo (arriba, abajo, izquierda, derecha)
+            fila = haz_celdas // cols
+            col = haz_celdas - fila * cols
+            en_tablero = np.stack(
+                (fila > 0, fila < rows - 1, col > 0, col < cols - 1), axis=1
+            ).ravel()
+            vecinas = (haz_celdas[:, None] + desplazamientos).ravel()
+            padres = np.repeat(haz_indices, 4)
+            g_padres = np.repeat(haz_g, 4)
+
+            # Las celdas fuera del tablero se leen en 0 y quedan descartadas por la máscara
+            costo = costos[np.where(en_tablero, vecinas, 0)]
+            validas = en_tablero & (costo != IMPASABLE)
+
+            # Verificar si algún sucesor es la meta (el primero en orden de generación)
+            es_meta = validas & np.isin(vecinas, celdas_meta)
+            if es_meta.any():
+                i = int(np.argmax(es_meta))
+                indice_meta = arena.agregar(
+                    int(vecinas[i]), int(padres[i]), int(g_padres[i] + costo[i]), 0
+                )
+                fin = META
+                return reconstruir_camino(arena, indice_meta)
+
+            # Descartar posiciones ya visitadas (antes de agregar este nivel)
+            no_visitadas = visitados[np.where(validas, vecinas, 0)] == 0
+            if medir:
+                duplicados += int(np.count_nonzero(validas & ~no_visitadas))
+            validas &= no_visitadas
+            if muertas is not None:
+                validas &= vista_muertas[np.where(validas, vecinas, 0)] == 0
+            candidatas = np.flatnonzero(validas)
+            celdas = vecinas[candidatas]
+
+            if tabla_h is None:
+                # Manhattan a la meta más cercana (una fila por meta)
+                filas_n = celdas // cols
+                h_n = (np.abs(filas_n - filas_meta) + np.abs(celdas - filas_n * cols - cols_meta)).min(axis=0)
+            else:
+                # Descartar celdas desde las que no se llega a la meta
+                h_n = tabla_h[celdas]
+                alcanzables = h_n < INFINITO
+                candidatas = candidatas[alcanzables]
+                celdas = celdas[alcanzables]
+                h_n = h_n[alcanzables]
+
+            g_n = g_padres[candidatas] + costo[candidatas]
+            if muertas is not None:
+                for celda in haz_celdas.tolist():
+                    marcar_callejones(grid, muertas, celda, protegidas)
+                # Modo adaptativo: cada celda una sola vez entre los candidatos del nivel
+                unicas = unicas_por_celda(celdas, g_n + h_n)
+                duplicados += candidatas.size - unicas.size
+                candidatas = candidatas[unicas]
+                celdas = celdas[unicas]
+                h_n = h_n[unicas]
+                g_n = g_n[unicas]
+
+            generados += candidatas.size
+            max_abiertos = max(max_abiertos, candidatas.size)
+            if medir:
+                t1 = time.perf_counter()
+                stats.sumar_tiempo("expansion", t1 - t0)
+
+            # Si no hay sucesores, no hay camino
+            if candidatas.size == 0:
+                fin = SIN_CAMINO
+                return None
+
+            # Poda: quedarse con los beamWidth mejores por f(n) = g(n) + h(n)
+            elegidas = seleccionar_mejores(g_n + h_n, beamWidth)
+            podados += candidatas.size - elegidas.size
+
+            haz_celdas = celdas[elegidas]
+            haz_g = g_n[elegidas]
+            primero = arena.extender(
+                haz_celdas.tolist(),
+                padres[candidatas][elegidas].tolist(),
+                haz_g.tolist(),
+                h_n[elegidas].tolist(),
+            )
+            haz_indices = np.arange(primero, primero + elegidas.size, dtype=np.int64)
+            if medir:
+                stats.sumar_tiempo("poda", time.perf_counter() - t1)
+
+            yield {"iteracion": iteracion, "expansiones": expansiones, "nodos": len(arena)}
+
+        # No se encontró camino
+        fin = LIMITE_ITERACIONES if haz_indices.size else SIN_CAMINO
+        return None
+    finally:
+        if medir:
+            stats.generados += generados
+            stats.expandidos += expansiones
+            stats.niveles += iteracion
+            stats.podados += podados
+            stats.duplicados += duplicados
+            stats.max_abiertos = max(stats.max_abiertos, max_abiertos)
+            stats.fin = fin
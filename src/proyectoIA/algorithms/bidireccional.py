@@ -0,0 +1,252 @@
+"""
+Dynamic weighting bidireccional: una búsqueda desde la hormiga y otra desde
+el hongo, que avanzan a la vez hasta encontrarse.
+
+Cada dirección usa el mismo estado plano que buscar_celdas (g, padres y
+cerrados en arreglos de N celdas, heap con entradas obsoletas que se
+descartan al salir); los dos juegos se guardan en pares indexados por la
+dirección, así el bucle es uno solo. En cada vuelta se expande la dirección
+con menos abiertos.
+
+La búsqueda hacia atrás usa los costos invertidos: ir de x a su vecina y
+cuesta costos[x], porque hacia adelante ese paso es entrar a x desde y.
+Cada vez que una dirección mejora el g de una celda que la otra ya
+alcanzó, el camino que pasa por ella es un candidato; mejor guarda el más
+barato. La búsqueda termina cuando una de estas cotas del costo óptimo,
+multiplicada por (1 + epsilon), llega a mejor:
+
+    la f mínima de cualquiera de las dos direcciones (f = g + (1 + peso) * h
+    con peso <= epsilon, así que ya está multiplicada);
+    la suma de los g mínimos de los abiertos de las dos direcciones.
+
+Así el camino entregado conserva la cota de dynamic weighting: cuesta a lo
+sumo (1 + epsilon) veces el óptimo, y con epsilon=0 es óptimo.
+
+Como en dynamic weighting, el veneno es impasable y meta puede ser una
+lista de hongos (la búsqueda hacia atrás sale de todos a la vez).
+"""
+import heapq
+import time
+from array import array
+
+from .componentes import inalcanzable
+from .dynamic import EXPANSIONES_POR_AVISO, reconstruir_camino
+from .estadisticas import INTERRUMPIDA, META, SIN_CAMINO, como_estadisticas
+from .grid import IMPASABLE, INFINITO, como_grid, como_metas
+from .pasos import agotar
+
+ADELANTE = 0
+ATRAS = 1
+
+
+def buscar_encuentro_pasos(grid, inicio, meta, epsilon=3, cada=EXPANSIONES_POR_AVISO, stats=None,
+                           al_expandir=None):
+    """
+    Motor bidireccional sobre índices de celda.
+
+    Yields:
+        cada `cada` expansiones, {"expansiones", "abiertos"}
+
+    Returns:
+        (padres hacia adelante, padres hacia atrás, celda de encuentro o
+        None, expansiones). Con padres hacia atrás, padres[celda] es la
+        celda siguiente en dirección al hongo.
+    """
+    rows, cols = grid.rows, grid.cols
+    costos = grid.costos
+    N = rows * cols
+    ultima_fila = rows - 1
+    ultima_col = cols - 1
+    metas = como_metas(meta)
+    varias_metas = len(metas) > 1
+    meta_fila, meta_col = metas[0]
+    inicio_fila, inicio_col = inicio
+    celda_inicio = inicio_fila * cols + inicio_col
+    # Al hongo sobre veneno no se puede entrar: no se busca desde él
+    celdas_meta = {fila * cols + col for fila, col in metas}
+    iniciales_atras = [celda for celda in celdas_meta if costos[celda] != IMPASABLE]
+
+    g_score = (array('q', [INFINITO]) * N, array('q', [INFINITO]) * N)
+    padres = (array('l', [-1]) * N, array('l', [-1]) * N)
+    cerrados = (bytearray(N), bytearray(N))
+    # Cada entrada: (f, celda, profundidad, g con el que se insertó)
+    abiertos = ([(0, celda_inicio, 0, 0)], [(0, celda, 0, 0) for celda in iniciales_atras])
+    # Los mismos abiertos ordenados por g (entradas (g, celda)), para la cota
+    # de la suma de los g mínimos
+    por_g = ([(0, celda_inicio)], [(0, celda) for celda in iniciales_atras])
+    g_score[ADELANTE][celda_inicio] = 0
+    for celda in iniciales_atras:
+        g_score[ATRAS][celda] = 0
+
+    heappop = heapq.heappop
+    heappush = heapq.heappush
+    mejor = INFINITO
+    encuentro = None
+    if celda_inicio in celdas_meta:
+        mejor, encuentro = 0, celda_inicio
+    expansiones = 0
+    proximo_aviso = cada
+
+    generados = 1 + len(iniciales_atras)
+    duplicados = 0
+    max_abiertos = 1
+    fin = INTERRUMPIDA
+    if stats is not None:
+        t0 = time.perf_counter()
+
+    try:
+        while abiertos[ADELANTE] and abiertos[ATRAS]:
+            lado = ADELANTE if len(abiertos[ADELANTE]) <= len(abiertos[ATRAS]) else ATRAS
+            abiertos_lado = abiertos[lado]
+            g_lado = g_score[lado]
+            g_otro = g_score[1 - lado]
+            padres_lado = padres[lado]
+            cerrados_lado = cerrados[lado]
+            por_g_lado = por_g[lado]
+
+            f_actual, actual, depth, g_actual = heappop(abiertos_lado)
+            if cerrados_lado[actual] or g_actual > g_lado[actual]:
+                duplicados += 1
+                continue
+
+            # Ninguna celda de alguna de las dos direcciones puede dar un
+            # camino mucho mejor (la cima del otro heap puede ser una entrada
+            # obsoleta, que solo hace el corte más conservador)
+            if f_actual >= mejor or abiertos[1 - lado][0][0] >= mejor:
+                break
+            # Un camino mejor que no se encontró todavía pasa por un abierto
+            # de cada dirección, así que cuesta al menos la suma de los g mínimos
+            if mejor != INFINITO:
+                cota = 0
+                for otro_lado in (ADELANTE, ATRAS):
+                    g_min = por_g[otro_lado]
+                    while g_min and (cerrados[otro_lado][g_min[0][1]]
+                                     or g_min[0][0] != g_score[otro_lado][g_min[0][1]]):
+                        heappop(g_min)
+                    cota += g_min[0][0] if g_min else 0
+                if (1 + epsilon) * cota >= mejor:
+                    break
+
+            cerrados_lado[actual] = 1
+            expansiones += 1
+            if expansiones == proximo_aviso:
+                proximo_aviso += cada
+                yield {"expansiones": expansiones, "abiertos": len(abiertos[0]) + len(abiertos[1])}
+            fila, col = divmod(actual, cols)
+            if al_expandir is not None:
+                al_expandir((fila, col), g_actual, f_actual)
+            if lado == ATRAS:
+                if costos[actual] == IMPASABLE:
+                    continue  # La hormiga sobre veneno: desde ahí no se sigue
+                costo_paso = costos[actual]
+            peso = epsilon * (1 - (depth / N))
+
+            for sucesor, valido in (
+                (actual + cols, fila < ultima_fila),
+                (actual - cols, fila > 0),
+                (actual + 1, col < ultima_col),
+                (actual - 1, col > 0),
+            ):
+                if not valido:
+                    continue
+                if lado == ADELANTE:
+                    costo_paso = costos[sucesor]
+                    if costo_paso == IMPASABLE:
+                        continue
+                elif costos[sucesor] == IMPASABLE and sucesor != celda_inicio:
+                    continue
+                tentative_g = g_actual + costo_paso
+                if tentative_g < g_lado[sucesor]:
+                    g_lado[sucesor] = tentative_g
+                    padres_lado[sucesor] = actual
+                    cerrados_lado[sucesor] = 0
+                    if g_otro[sucesor] != INFINITO and tentative_g + g_otro[sucesor] < mejor:
+                        mejor = tentative_g + g_otro[sucesor]
+                        encuentro = sucesor
+
+                    sf, sc = divmod(sucesor, cols)
+                    if lado == ATRAS:
+                        h = abs(sf - inicio_fila) + abs(sc - inicio_col)
+                    elif varias_metas:
+                        h = min(abs(sf - mf) + abs(sc - mc) for mf, mc in metas)
+                    else:
+                        h = abs(sf - meta_fila) + abs(sc - meta_col)
+                    heappush(abiertos_lado, (tentative_g + h + peso * h, sucesor, depth + 1, tentative_g))
+                    heappush(por_g_lado, (tentative_g, sucesor))
+                    generados += 1
+            if stats is not None and len(abiertos_lado) > max_abiertos:
+                max_abiertos = len(abiertos_lado)
+
+        # Si una dirección se agotó, ya vio todas las celdas que alcanza y
+        # con ellas todos los encuentros posibles
+        fin = META if encuentro is not None else SIN_CAMINO
+        return padres[ADELANTE], padres[ATRAS], encuentro, expansiones
+    finally:
+        if stats is not None:
+            stats.generados += generados
+            stats.expandidos += expansiones
+            stats.duplicados += duplicados
+            stats.max_abiertos = max(stats.max_abiertos, max_abiertos)
+            stats.sumar_tiempo("busqueda", time.perf_counter() - t0)
+            stats.fin = fin
+
+
+def unir_caminos(padres_adelante, padres_atras, encuentro, cols):
+    """Camino de la hormiga al encuentro y de ahí al hongo."""
+    camino = reconstruir_camino(padres_adelante, encuentro, cols)
+    celda = padres_atras[encuentro]
+    while celda != -1:
+        camino.append(divmod(celda, cols))
+        celda = padres_atras[celda]
+    return camino
+
+
+def dynamic_weighting_bidireccional(n, inicio, meta, obstaculos=None, epsilon=3, stats=None,
+                                    al_expandir=None, componentes=None):
+    """
+    Dynamic weighting desde la hormiga y desde el hongo a la vez.
+
+    Args:
+        n: tamaño del tablero (n x n), o un Grid ya construido
+        inicio: tupla (fila, col) de la hormiga
+        meta: tupla (fila, col) del hongo, o lista de hongos
+        obstaculos: lista de posiciones con veneno (impasable), solo con la firma antigua
+        epsilon: peso máximo de la heurística, como en dynamic_weighting_search
+        stats: EstadisticasBusqueda o función que la recibe al terminar
+        al_expandir: función (posicion, g, f) llamada en cada expansión de las dos direcciones
+        componentes: como en dynamic_weighting_search
+
+    Returns:
+        camino: lista de posiciones desde inicio hasta un hongo, o None
+    """
+    return agotar(dynamic_weighting_bidireccional_pasos(
+        n, inicio, meta, obstaculos, epsilon, stats=stats, al_expandir=al_expandir,
+        componentes=componentes,
+    ))
+
+
+def dynamic_weighting_bidireccional_pasos(n, inicio, meta, obstaculos=None, epsilon=3,
+                                          cada=EXPANSIONES_POR_AVISO, stats=None, al_expandir=None,
+                                          componentes=None):
+    # Generador: entrega el progreso cada `cada` expansiones y retorna el camino
+    stats, al_terminar = como_estadisticas(stats)
+    try:
+        grid = como_grid(n, obstaculos, IMPASABLE)
+        if inalcanzable(grid, inicio, meta, componentes):
+            if stats is not None:
+                stats.fin = SIN_CAMINO
+            return None
+        padres_adelante, padres_atras, encuentro, _ = yield from buscar_encuentro_pasos(
+            grid, inicio, meta, epsilon, cada, stats, al_expandir
+        )
+        if encuentro is None:
+            return None
+        if stats is not None:
+            t0 = time.perf_counter()
+        camino = unir_caminos(padres_adelante, padres_atras, encuentro, grid.cols)
+        if stats is not None:
+            stats.sumar_tiempo("reconstruccion", time.perf_counter() - t0)
+        return camino
+    finally:
+        if al_terminar is not None:
+            al_terminar(stats)
@@ -0,0 +1,162 @@
+"""
+Caché de resultados de búsqueda.
+
+La clave es (huella del tablero, inicio, meta, algoritmo, opciones): la
+misma consulta sobre el mismo mapa devuelve el camino guardado sin buscar.
+Como la huella cambia con cualquier celda, editar el mapa hace que las
+consultas nuevas no encuentren las entradas viejas; estas salen solas por
+el desalojo LRU.
+
+Opcionalmente las entradas se escriben también en un archivo SQLite, así
+sobreviven a reiniciar el programa. La memoria tiene capacidad fija; el
+archivo no, se vacía con limpiar().
+
+Uso:
+
+    cache = CacheResultados(ruta="resultados.sqlite")
+    camino = cache.buscar(grid, inicio, meta, "beam")
+"""
+import json
+import logging
+import sqlite3
+from collections import OrderedDict
+
+from .paralelo import _obtener_algoritmo
+
+logger = logging.getLogger(__name__)
+
+# Opciones que cambian lo que hace la búsqueda pero no su resultado
+# (o que no se pueden repetir): con ellas no se usa la caché
+OPCIONES_SIN_CACHE = ("stats", "al_expandir")
+
+
+class CacheResultados:
+    """
+    Caché LRU de caminos, con archivo SQLite opcional.
+
+    Args:
+        capacidad: cantidad máxima de resultados en memoria
+        ruta: archivo SQLite donde persistir los resultados (None = solo memoria)
+    """
+
+    def __init__(self, capacidad=256, ruta=None):
+        self.capacidad = capacidad
+        self.ruta = ruta
+        self._resultados = OrderedDict()
+        self.aciertos = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        self._conexion = None
+        if ruta is not None:
+            self._conexion = sqlite3.connect(ruta)
+            self._conexion.execute(
+                "CREATE TABLE IF NOT EXISTS resultados (clave TEXT PRIMARY KEY, camino TEXT)"
+            )
+            self._conexion.commit()
+
+    def __len__(self):
+        return len(self._resultados)
+
+    def __repr__(self):
+        return (
+            f"CacheResultados(capacidad={self.capacidad}, ruta={self.ruta!r}, "
+            f"aciertos={self.aciertos}, fallos={self.fallos})"
+        )
+
+    @staticmethod
+    def clave(grid, inicio, meta, algoritmo, opciones=None):
+        """
+        Clave de la consulta, o None si las opciones no se pueden guardar
+        (tablas de heurística, funciones, stats).
+        """
+        opciones = opciones or {}
+        if any(opciones.get(nombre) is not None for nombre in OPCIONES_SIN_CACHE):
+            return None
+        if not isinstance(algoritmo, str):
+            algoritmo = f"{algoritmo.__module__}.{algoritmo.__qualname__}"
+        try:
+            texto = json.dumps(opciones, sort_keys=True)
+        except TypeError:
+            return None
+        return f"{grid.huella()}|{algoritmo}|{tuple(inicio)}|{tuple(meta)}|{texto}"
+
+    def obtener(self, clave):
+        """Retorna (encontrado, camino); camino puede ser None (no hay camino)."""
+        if clave in self._resultados:
+            self._resultados.move_to_end(clave)
+            self.aciertos += 1
+            return True, self._resultados[clave]
+
+        if self._conexion is not None:
+            fila = self._conexion.execute(
+                "SELECT camino FROM resultados WHERE clave = ?", (clave,)
+            ).fetchone()
+            if fila is not None:
+                camino = json.loads(fila[0])
+                if camino is not None:
+                    camino = [tuple(pos) for pos in camino]
+                self._recordar(clave, camino)
+                self.aciertos += 1
+                self.aciertos_disco += 1
+                return True, camino
+
+        self.fallos += 1
+        return False, None
+
+    def guardar(self, clave, camino):
+        self._recordar(clave, camino)
+        if self._conexion is not None:
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO resultados (clave, camino) VALUES (?, ?)",
+                (clave, json.dumps(camino)),
+            )
+            self._conexion.commit()
+
+    def _recordar(self, clave, camino):
+        self._resultados[clave] = camino
+        self._resultados.move_to_end(clave)
+        if len(self._resultados) > self.capacidad:
+            self._resultados.popitem(last=False)
+
+    def buscar(self, grid, inicio, meta, algorithm="dynamic", **opciones):
+        """
+        Igual que llamar al algoritmo (un nombre de paralelo.ALGORITMOS o una
+        función), pero repite el resultado guardado si la consulta ya se hizo.
+        """
+        clave = self.clave(grid, inicio, meta, algorithm, opciones)
+        if clave is not None:
+            encontrado, camino = self.obtener(clave)
+            if encontrado:
+                return camino
+
+        camino = _obtener_algoritmo(algorithm)(grid, inicio, meta, **opciones)
+        if clave is not None:
+            self.guardar(clave, camino)
+        return camino
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "aciertos_disco": self.aciertos_disco,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            "en_memoria": len(self._resultados),
+        }
+
+    def limpiar(self):
+        """Borra los resultados de memoria y del archivo; los contadores vuelven a 0."""
+        self._resultados.clear()
+        self.aciertos = self.aciertos_disco = self.fallos = 0
+        if self._conexion is not None:
+            self._conexion.execute("DELETE FROM resultados")
+            self._conexion.commit()
+
+    def cerrar(self):
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+
+
+# Caché compartida, solo en memoria
+cache_resultados = CacheResultados()
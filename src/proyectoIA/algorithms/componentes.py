@@ -0,0 +1,243 @@
+"""
+Componentes conexas de las celdas transitables.
+
+Cada celda transitable lleva la etiqueta de su componente (4 vecinos) en un
+arreglo plano; las impasables llevan SIN_COMPONENTE. Con el índice, saber
+si la meta es alcanzable es comparar dos etiquetas, así que las búsquedas
+que reciben el índice (componentes=) lo consultan antes de empezar y
+retornan None de inmediato cuando la hormiga y el hongo están en
+componentes distintas.
+
+Armar el índice recorre todo el tablero (bastante más que una búsqueda que
+encuentra camino), así que lo arma quien va a hacer varias consultas sobre
+el mismo tablero y lo pasa a cada búsqueda: la interfaz, lotes, el servicio
+y solve_many. Las búsquedas no lo buscan por su cuenta.
+
+El índice se arma en una pasada por filas: cada tramo de celdas
+transitables de una fila se une (union-find) con los tramos de la fila
+anterior que se le superponen, y al final cada tramo se etiqueta con una
+asignación de slice.
+
+cambiar_celda actualiza el índice sin recorrer todo el tablero: abrir una
+celda une las componentes vecinas (se reetiquetan las más chicas) y
+bloquearla busca a la vez desde sus vecinas hasta que se tocan o alguna
+se agota, que es entonces una componente nueva.
+"""
+import re
+from array import array
+from collections import deque
+
+from .grid import IMPASABLE, como_metas
+
+# Etiqueta de las celdas impasables
+SIN_COMPONENTE = -1
+
+_TRAMO = re.compile(rb"[^\x00]+")
+
+
+class ComponentesConexas:
+    """
+    Índice de componentes conexas de un Grid.
+
+    Args:
+        grid: tablero; el índice lo guarda y cambiar_celda lo modifica
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self._construir()
+
+    def __repr__(self):
+        return f"ComponentesConexas({self.grid!r}, componentes={len(self.tamanos)})"
+
+    def _construir(self):
+        rows, cols = self.grid.rows, self.grid.cols
+        costos = bytes(self.grid.costos)
+        padre = []
+
+        def raiz(tramo):
+            while padre[tramo] != tramo:
+                padre[tramo] = padre[padre[tramo]]
+                tramo = padre[tramo]
+            return tramo
+
+        # Tramos (inicio, fin) de celdas transitables, fila por fila
+        tramos = []
+        anteriores = []
+        for fila in range(rows):
+            base = fila * cols
+            actuales = []
+            j = 0
+            for coincidencia in _TRAMO.finditer(costos, base, base + cols):
+                inicio, fin = coincidencia.span()
+                indice = len(tramos)
+                tramos.append((inicio, fin))
+                padre.append(indice)
+                actuales.append(indice)
+                # Unir con los tramos de la fila anterior que se superponen
+                while j < len(anteriores) and tramos[anteriores[j]][1] + cols <= inicio:
+                    j += 1
+                k = j
+                while k < len(anteriores) and tramos[anteriores[k]][0] + cols < fin:
+                    a, b = raiz(anteriores[k]), raiz(indice)
+                    if a != b:
+                        padre[b] = a
+                    k += 1
+            anteriores = actuales
+
+        etiquetas = array('i', [SIN_COMPONENTE]) * (rows * cols)
+        tamanos = {}
+        compactas = {}
+        for indice, (inicio, fin) in enumerate(tramos):
+            r = raiz(indice)
+            etiqueta = compactas.setdefault(r, len(compactas))
+            etiquetas[inicio:fin] = array('i', [etiqueta]) * (fin - inicio)
+            tamanos[etiqueta] = tamanos.get(etiqueta, 0) + fin - inicio
+        self.etiquetas = etiquetas
+        # Etiqueta -> cantidad de celdas
+        self.tamanos = tamanos
+        self._siguiente = len(compactas)
+
+    def etiqueta(self, posicion):
+        return self.etiquetas[self.grid.celda(posicion)]
+
+    def conectadas(self, inicio, meta):
+        """True si se puede ir de inicio a meta por celdas transitables."""
+        if inicio == meta:
+            return True
+        etiquetas = self.etiquetas
+        etiqueta_meta = etiquetas[self.grid.celda(meta)]
+        if etiqueta_meta == SIN_COMPONENTE:
+            return False
+        celda_inicio = self.grid.celda(inicio)
+        etiqueta_inicio = etiquetas[celda_inicio]
+        if etiqueta_inicio != SIN_COMPONENTE:
+            return etiqueta_inicio == etiqueta_meta
+        # La hormiga sobre veneno: sale por cualquier vecina transitable
+        return any(etiquetas[vecina] == etiqueta_meta for vecina in self.grid.vecinos(celda_inicio))
+
+    def cambiar_celda(self, posicion, costo):
+        """Cambia el costo de una celda y actualiza las etiquetas afectadas."""
+        grid = self.grid
+        celda = grid.celda(posicion)
+        anterior = grid.costos[celda]
+        grid.cambiar_costo(celda, costo)
+        if (anterior == IMPASABLE) == (costo == IMPASABLE):
+            return  # Sigue siendo transitable (o impasable): las etiquetas no cambian
+        if costo == IMPASABLE:
+            self._bloquear(celda)
+        else:
+            self._abrir(celda)
+
+    def _nueva_etiqueta(self):
+        etiqueta = self._siguiente
+        self._siguiente += 1
+        return etiqueta
+
+    def _reetiquetar(self, celda, anterior, nueva):
+        # Flood fill de la componente `anterior` que contiene a celda
+        etiquetas = self.etiquetas
+        vecinos = self.grid.vecinos
+        etiquetas[celda] = nueva
+        pendientes = [celda]
+        cantidad = 1
+        while pendientes:
+            actual = pendientes.pop()
+            for vecina in vecinos(actual):
+                if etiquetas[vecina] == anterior:
+                    etiquetas[vecina] = nueva
+                    pendientes.append(vecina)
+                    cantidad += 1
+        return cantidad
+
+    def _abrir(self, celda):
+        etiquetas = self.etiquetas
+        tamanos = self.tamanos
+        vecinas = {}
+        for vecina in self.grid.vecinos(celda):
+            vecinas.setdefault(etiquetas[vecina], vecina)
+        if not vecinas:
+            etiqueta = self._nueva_etiqueta()
+            etiquetas[celda] = etiqueta
+            tamanos[etiqueta] = 1
+            return
+
+        # Las componentes vecinas se unen en la más grande
+        principal = max(vecinas, key=tamanos.__getitem__)
+        for etiqueta, vecina in vecinas.items():
+            if etiqueta != principal:
+                tamanos[principal] += self._reetiquetar(vecina, etiqueta, principal)
+                del tamanos[etiqueta]
+        etiquetas[celda] = principal
+        tamanos[principal] += 1
+
+    def _bloquear(self, celda):
+        etiquetas = self.etiquetas
+        tamanos = self.tamanos
+        etiqueta = etiquetas[celda]
+        etiquetas[celda] = SIN_COMPONENTE
+        tamanos[etiqueta] -= 1
+        if tamanos[etiqueta] == 0:
+            del tamanos[etiqueta]
+            return
+        vecinas = self.grid.vecinos(celda)
+        if len(vecinas) <= 1:
+            return  # Una sola salida: la componente no se puede partir
+
+        # Una búsqueda por vecina, avanzando de a una celda por turno. Las que
+        # se tocan se unen en un grupo (union-find sobre las búsquedas); un
+        # grupo que se agota sin tocar a los demás quedó separado
+        vecinos = self.grid.vecinos
+        k = len(vecinas)
+        padre = list(range(k))
+        duena = {vecina: i for i, vecina in enumerate(vecinas)}
+        colas = [deque([vecina]) for vecina in vecinas]
+        visitadas = [[vecina] for vecina in vecinas]
+        vivos = set(range(k))
+
+        def raiz(i):
+            while padre[i] != i:
+                i = padre[i]
+            return i
+
+        while len({raiz(i) for i in vivos}) > 1:
+            for i in list(vivos):
+                if not colas[i]:
+                    continue
+                actual = colas[i].popleft()
+                for vecina in vecinos(actual):
+                    j = duena.get(vecina)
+                    if j is None:
+                        duena[vecina] = i
+                        colas[i].append(vecina)
+                        visitadas[i].append(vecina)
+                    elif raiz(j) != raiz(i):
+                        padre[raiz(j)] = raiz(i)
+
+            grupos = {}
+            for i in vivos:
+                grupos.setdefault(raiz(i), []).append(i)
+            for miembros in grupos.values():
+                if len(grupos) > 1 and not any(colas[i] for i in miembros):
+                    # Grupo cerrado: es una componente nueva
+                    nueva = self._nueva_etiqueta()
+                    cantidad = 0
+                    for i in miembros:
+                        for visitada in visitadas[i]:
+                            etiquetas[visitada] = nueva
+                        cantidad += len(visitadas[i])
+                    tamanos[nueva] = cantidad
+                    tamanos[etiqueta] -= cantidad
+                    vivos.difference_update(miembros)
+                    break
+
+
+def inalcanzable(grid, inicio, meta, componentes=None):
+    """
+    True si el índice prueba que no hay camino de inicio a meta (o a
+    ninguna de las metas, si es una lista). Sin índice retorna False: la
+    comprobación no cuesta nada cuando no se la pidió.
+    """
+    if componentes is None:
+        return False
+    return not any(componentes.conectadas(inicio, posicion) for posicion in como_metas(meta))
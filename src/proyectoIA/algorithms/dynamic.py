@@ -1,42 +1,206 @@
 import heapq
+import time
+from array import array
+
+from .componentes import inalcanzable
+from .estadisticas import INTERRUMPIDA, META, SIN_CAMINO, como_estadisticas
+from .grid import IMPASABLE, INFINITO, como_grid, como_metas
+from .heuristicas import resolver_heuristica
+from .pasos import agotar
+
+# Expansiones entre cada aviso de progreso de los generadores *_pasos
+EXPANSIONES_POR_AVISO = 1000
 
 def manhattan(pos1, pos2):
     return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
 
-def generar_sucesores(posicion, n, obstaculos):
+def generar_sucesores(posicion, grid):
     movimientos = [(1,0), (-1,0), (0,1), (0,-1)]
     sucesores = []
     for dx, dy in movimientos:
         nx, ny = posicion[0] + dx, posicion[1] + dy
-        if 0 <= nx < n and 0 <= ny < n and (nx, ny) not in obstaculos:
+        if 0 <= nx < grid.rows and 0 <= ny < grid.cols and grid.costos[nx * grid.cols + ny] != IMPASABLE:
             sucesores.append((nx, ny))
     return sucesores
 
-def dynamic_weighting_search(n, inicio, meta, obstaculos, epsilon=3):
-    N = n * n 
-    open_list = []
-    heapq.heappush(open_list, (0, inicio, 0))  
-    came_from = {inicio: None}
-    g_score = {inicio: 0}
-
-    while open_list:
-        f_actual, actual, depth = heapq.heappop(open_list)
-
-        if actual == meta:
-            camino = []
-            while actual is not None:
-                camino.append(actual)
-                actual = came_from[actual]
-            return camino[::-1]  
-
-        for sucesor in generar_sucesores(actual, n, obstaculos):
-            tentative_g = g_score[actual] + 1
-            if sucesor not in g_score or tentative_g < g_score[sucesor]:
-                g_score[sucesor] = tentative_g
-                h = manhattan(sucesor, meta)
-               
-                f = tentative_g + h + epsilon * (1 - (depth / N)) * h
-               
-                heapq.heappush(open_list, (f, sucesor, depth + 1))
-                came_from[sucesor] = actual
-    return None
+def reconstruir_camino(padres, celda_meta, cols):
+    # Convierte la cadena de padres (índices de celda) en posiciones (fila, col)
+    camino = []
+    celda = celda_meta
+    while celda != -1:
+        camino.append(divmod(celda, cols))
+        celda = padres[celda]
+    camino.reverse()
+    return camino
+
+def buscar_celdas(grid, inicio, meta, epsilon=3, tabla_h=None, stats=None, al_expandir=None):
+    return agotar(buscar_celdas_pasos(grid, inicio, meta, epsilon, tabla_h, stats=stats,
+                                      al_expandir=al_expandir))
+
+def buscar_celdas_pasos(grid, inicio, meta, epsilon=3, tabla_h=None, cada=EXPANSIONES_POR_AVISO,
+                        stats=None, al_expandir=None):
+    """
+    Motor de dynamic weighting sobre índices de celda (fila * cols + col).
+
+    g y padres se guardan en arreglos preasignados y las celdas expandidas
+    en un bitmap. Las entradas del heap que quedaron obsoletas (su g ya fue
+    mejorado) o que apuntan a una celda ya expandida se descartan al salir.
+    meta: posición o lista de posiciones; con varias, la búsqueda termina en
+        la primera que expande y manhattan es la mínima sobre todas
+    tabla_h: None para usar manhattan, o tabla de h por celda (ver heuristicas.py)
+    stats: EstadisticasBusqueda donde se suman los contadores, o None
+    al_expandir: función (posicion, g, f) llamada en cada expansión, o None
+
+    Yields:
+        cada `cada` expansiones, {"expansiones", "abiertos"}
+
+    Returns:
+        (padres, celda de la meta alcanzada o None, expansiones)
+    """
+    rows, cols = grid.rows, grid.cols
+    costos = grid.costos
+    N = rows * cols
+    ultima_fila = rows - 1
+    ultima_col = cols - 1
+    metas = como_metas(meta)
+    meta_fila, meta_col = metas[0]
+    varias_metas = len(metas) > 1
+    celdas_meta = {fila * cols + col for fila, col in metas}
+    celda_inicio = inicio[0] * cols + inicio[1]
+
+    g_score = array('q', [INFINITO]) * N
+    padres = array('l', [-1]) * N
+    cerrados = bytearray(N)
+    g_score[celda_inicio] = 0
+
+    # Cada entrada: (f, celda, profundidad, g con el que se insertó)
+    open_list = [(0, celda_inicio, 0, 0)]
+    heappop = heapq.heappop
+    heappush = heapq.heappush
+    expansiones = 0
+    proximo_aviso = cada
+
+    # Contadores locales (baratos); se copian a stats solo al terminar
+    generados = 1
+    duplicados = 0
+    max_abiertos = 1
+    fin = INTERRUMPIDA
+    if stats is not None:
+        t0 = time.perf_counter()
+
+    try:
+        while open_list:
+            f_actual, actual, depth, g_actual = heappop(open_list)
+
+            # Entrada duplicada u obsoleta: la celda ya se expandió o tiene un g mejor
+            if cerrados[actual] or g_actual > g_score[actual]:
+                duplicados += 1
+                continue
+
+            if actual in celdas_meta:
+                fin = META
+                return padres, actual, expansiones
+
+            cerrados[actual] = 1
+            expansiones += 1
+            if expansiones == proximo_aviso:
+                proximo_aviso += cada
+                yield {"expansiones": expansiones, "abiertos": len(open_list)}
+            fila, col = divmod(actual, cols)
+            if al_expandir is not None:
+                al_expandir((fila, col), g_actual, f_actual)
+            peso = epsilon * (1 - (depth / N))
+
+            # Mismo orden que generar_sucesores: abajo, arriba, derecha, izquierda
+            for sucesor, valido in (
+                (actual + cols, fila < ultima_fila),
+                (actual - cols, fila > 0),
+                (actual + 1, col < ultima_col),
+                (actual - 1, col > 0),
+            ):
+                if not valido:
+                    continue
+                costo = costos[sucesor]
+                if costo == IMPASABLE:
+                    continue
+                tentative_g = g_actual + costo
+                if tentative_g < g_score[sucesor]:
+                    g_score[sucesor] = tentative_g
+                    padres[sucesor] = actual
+                    # Un g mejor reabre la celda si ya estaba expandida
+                    cerrados[sucesor] = 0
+                    if tabla_h is None:
+                        sf, sc = divmod(sucesor, cols)
+                        if varias_metas:
+                            h = min(abs(sf - mf) + abs(sc - mc) for mf, mc in metas)
+                        else:
+                            h = abs(sf - meta_fila) + abs(sc - meta_col)
+                    else:
+                        h = tabla_h[sucesor]
+                        if h == INFINITO:
+                            continue  # Desde esta celda no se llega a la meta
+
+                    f = tentative_g + h + peso * h
+
+                    heappush(open_list, (f, sucesor, depth + 1, tentative_g))
+                    generados += 1
+            if stats is not None and len(open_list) > max_abiertos:
+                max_abiertos = len(open_list)
+        fin = SIN_CAMINO
+        return padres, None, expansiones
+    finally:
+        if stats is not None:
+            stats.generados += generados
+            stats.expandidos += expansiones
+            stats.duplicados += duplicados
+            stats.max_abiertos = max(stats.max_abiertos, max_abiertos)
+            stats.sumar_tiempo("busqueda", time.perf_counter() - t0)
+            stats.fin = fin
+
+def dynamic_weighting_search(n, inicio, meta, obstaculos=None, epsilon=3, heuristica=None,
+                             stats=None, al_expandir=None, componentes=None):
+    # n puede ser un Grid; con la firma antigua el veneno es impasable.
+    # meta: (fila, col) o lista de hongos; con varios se llega al primero que
+    # encuentra la búsqueda, que es el último elemento del camino. Con muchos
+    # hongos conviene heuristica="exacta" (una búsqueda inversa desde todos)
+    # heuristica: None o "manhattan", "exacta" o una tabla de h por celda
+    # stats: EstadisticasBusqueda o función que la recibe al terminar (ver estadisticas.py)
+    # al_expandir: función (posicion, g, f) llamada en cada expansión
+    # componentes: ComponentesConexas del tablero para descartar al instante las
+    # metas inalcanzables; si es None no se comprueba (ver componentes.py)
+    return agotar(dynamic_weighting_search_pasos(n, inicio, meta, obstaculos, epsilon, heuristica,
+                                                 stats=stats, al_expandir=al_expandir,
+                                                 componentes=componentes))
+
+def dynamic_weighting_search_pasos(n, inicio, meta, obstaculos=None, epsilon=3, heuristica=None,
+                                   cada=EXPANSIONES_POR_AVISO, stats=None, al_expandir=None,
+                                   componentes=None):
+    # Generador: entrega el progreso cada `cada` expansiones y retorna el camino
+    stats, al_terminar = como_estadisticas(stats)
+    try:
+        grid = como_grid(n, obstaculos, IMPASABLE)
+        if inalcanzable(grid, inicio, meta, componentes):
+            # Hormiga y hongo en componentes distintas: no hace falta buscar
+            if stats is not None:
+                stats.fin = SIN_CAMINO
+            return None
+        if stats is not None:
+            t0 = time.perf_counter()
+        tabla_h = resolver_heuristica(heuristica, grid, meta)
+        if stats is not None:
+            stats.sumar_tiempo("heuristica", time.perf_counter() - t0)
+        padres, celda_meta, _ = yield from buscar_celdas_pasos(
+            grid, inicio, meta, epsilon, tabla_h, cada, stats, al_expandir
+        )
+        if celda_meta is None:
+            return None
+        # Los caminos se convierten a tuplas solo al devolverlos
+        if stats is not None:
+            t0 = time.perf_counter()
+        camino = reconstruir_camino(padres, celda_meta, grid.cols)
+        if stats is not None:
+            stats.sumar_tiempo("reconstruccion", time.perf_counter() - t0)
+        return camino
+    finally:
+        if al_terminar is not None:
+            al_terminar(stats)
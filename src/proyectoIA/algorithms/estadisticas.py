@@ -0,0 +1,83 @@
+"""
+Estadísticas opcionales de las búsquedas.
+
+Los algoritmos aceptan `stats`: un EstadisticasBusqueda que se llena al
+terminar, o una función que lo recibe ya lleno. Sin `stats` los contadores
+quedan en variables locales y no se toma ningún tiempo, así que el costo
+de no usarlas es prácticamente nulo (ver benchmarks/estadisticas.py).
+
+Los contadores se acumulan: el mismo objeto puede pasarse a varias
+búsquedas para obtener totales.
+"""
+
+# Motivos de fin de una búsqueda (EstadisticasBusqueda.fin)
+META = "meta"
+SIN_CAMINO = "sin_camino"
+LIMITE_ITERACIONES = "limite_iteraciones"
+INTERRUMPIDA = "interrumpida"
+
+
+class EstadisticasBusqueda:
+    """
+    Contadores de una o más búsquedas.
+
+    Atributos:
+        generados: nodos creados como candidatos (push al heap en dynamic
+            weighting, sucesores evaluados en cada nivel del beam)
+        expandidos: nodos expandidos
+        max_abiertos: tamaño máximo de la lista abierta (heap en dynamic
+            weighting, candidatos de un nivel en beam search)
+        niveles: niveles del haz (solo beam search)
+        podados: candidatos descartados por el ancho del haz (solo beam search)
+        duplicados: entradas repetidas u obsoletas sacadas del heap (dynamic
+            weighting) o sucesores ya visitados (beam search)
+        tiempos: segundos por fase ("heuristica", "busqueda", "poda", ...)
+        fin: motivo del fin de la última búsqueda (META, SIN_CAMINO,
+            LIMITE_ITERACIONES o INTERRUMPIDA)
+    """
+
+    def __init__(self):
+        self.generados = 0
+        self.expandidos = 0
+        self.max_abiertos = 0
+        self.niveles = 0
+        self.podados = 0
+        self.duplicados = 0
+        self.tiempos = {}
+        self.fin = None
+
+    def __repr__(self):
+        return (
+            f"EstadisticasBusqueda(generados={self.generados}, expandidos={self.expandidos}, "
+            f"max_abiertos={self.max_abiertos}, niveles={self.niveles}, podados={self.podados}, "
+            f"duplicados={self.duplicados}, fin={self.fin!r})"
+        )
+
+    def sumar_tiempo(self, fase, segundos):
+        self.tiempos[fase] = self.tiempos.get(fase, 0.0) + segundos
+
+    def como_dict(self):
+        return {
+            "generados": self.generados,
+            "expandidos": self.expandidos,
+            "max_abiertos": self.max_abiertos,
+            "niveles": self.niveles,
+            "podados": self.podados,
+            "duplicados": self.duplicados,
+            "tiempos": dict(self.tiempos),
+            "fin": self.fin,
+        }
+
+
+def como_estadisticas(stats):
+    """
+    Normaliza el argumento `stats` de los algoritmos.
+
+    Returns:
+        (EstadisticasBusqueda o None, función a llamar al terminar o None)
+    """
+    if stats is None or isinstance(stats, EstadisticasBusqueda):
+        return stats, None
+    if callable(stats):
+        return EstadisticasBusqueda(), stats
+    raise TypeError(f"stats debe ser EstadisticasBusqueda o una función, no {type(stats).__name__}")
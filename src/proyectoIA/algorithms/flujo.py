@@ -0,0 +1,219 @@
+"""
+Campo de flujo: una sola búsqueda inversa desde el hongo sirve a todas las
+hormigas del mapa.
+
+La búsqueda (BFS si el costo es uniforme, Dijkstra si no) deja dos
+arreglos planos: el costo hasta la meta de cada celda y la dirección del
+próximo paso (un byte por celda, índice en Grid.desplazamientos). Cada
+hormiga avanza mirando la dirección de su celda, en O(1) por paso, sin
+buscar nada: miles de hormigas cuestan lo mismo que una sola búsqueda.
+Con varios hongos la búsqueda sale de todos a la vez y cada celda apunta
+al más cercano.
+
+Como en dynamic weighting, entrar a una celda cuesta su valor en
+grid.costos y las celdas IMPASABLE no se pueden pisar. Los caminos que
+resultan son óptimos.
+
+Uso:
+
+    campo = flow_field(grid, meta)
+    posiciones = campo.avanzar(posiciones)   # un paso de cada hormiga
+    camino = campo.camino(inicio)
+"""
+import heapq
+import time
+from array import array
+from collections import deque
+
+from .dynamic import EXPANSIONES_POR_AVISO
+from .estadisticas import INTERRUMPIDA, META, como_estadisticas
+from .grid import IMPASABLE, INFINITO, como_grid, como_metas
+from .pasos import agotar
+
+# Dirección de una celda sin próximo paso (la meta o una celda sin camino)
+SIN_DIRECCION = 255
+
+
+class CampoFlujo:
+    """
+    Costo hasta la meta y dirección del próximo paso de cada celda.
+    Se construye con flow_field o flow_field_pasos.
+
+    Atributos:
+        grid: tablero sobre el que se calculó
+        meta: posición del hongo (el primero si hay varios)
+        metas: lista con las posiciones de todos los hongos
+        distancias: array('q') con el costo hasta la meta (INFINITO = sin camino)
+        direcciones: bytearray con el índice en grid.desplazamientos del
+            próximo paso, o SIN_DIRECCION
+    """
+
+    def __init__(self, grid, meta, distancias, direcciones):
+        self.grid = grid
+        self.metas = como_metas(meta)
+        self.meta = self.metas[0]
+        self.celdas_meta = {grid.celda(posicion) for posicion in self.metas}
+        self.distancias = distancias
+        self.direcciones = direcciones
+
+    def __repr__(self):
+        if len(self.metas) > 1:
+            return f"CampoFlujo({self.grid!r}, metas={self.metas})"
+        return f"CampoFlujo({self.grid!r}, meta={self.meta})"
+
+    def costo(self, posicion):
+        """Costo del camino desde posicion hasta la meta más cercana (INFINITO si no hay)."""
+        celda = self.grid.celda(posicion)
+        if self.grid.costos[celda] == IMPASABLE and celda not in self.celdas_meta:
+            siguiente = self.siguiente(celda)
+            if siguiente == -1:
+                return INFINITO
+            return self.grid.costos[siguiente] + self.distancias[siguiente]
+        return self.distancias[celda]
+
+    def siguiente(self, celda):
+        """Celda del próximo paso, o -1 en la meta o si no hay camino."""
+        direccion = self.direcciones[celda]
+        if direccion != SIN_DIRECCION:
+            return celda + self.grid.desplazamientos[direccion]
+        if celda in self.celdas_meta or self.grid.costos[celda] != IMPASABLE:
+            return -1
+        # Hormiga sobre veneno: la búsqueda no pasa por ahí, pero puede
+        # salir hacia la vecina transitable más cercana a la meta
+        costos = self.grid.costos
+        distancias = self.distancias
+        mejor = INFINITO
+        siguiente = -1
+        for vecina in self.grid.vecinos(celda):
+            if distancias[vecina] + costos[vecina] < mejor:
+                mejor = distancias[vecina] + costos[vecina]
+                siguiente = vecina
+        return siguiente
+
+    def paso(self, posicion):
+        """Posición después de un paso (la misma si está en la meta o no tiene camino)."""
+        siguiente = self.siguiente(self.grid.celda(posicion))
+        return posicion if siguiente == -1 else self.grid.posicion(siguiente)
+
+    def avanzar(self, posiciones):
+        """Un paso de cada hormiga; retorna la lista de posiciones nuevas."""
+        return [self.paso(posicion) for posicion in posiciones]
+
+    def camino(self, inicio):
+        """Camino desde inicio hasta la meta más cercana siguiendo el campo, o None."""
+        grid = self.grid
+        actual = grid.celda(inicio)
+        camino = [tuple(inicio)]
+        while actual not in self.celdas_meta:
+            actual = self.siguiente(actual)
+            if actual == -1:
+                return None
+            camino.append(grid.posicion(actual))
+        return camino
+
+
+def flow_field(n, meta, obstaculos=None, stats=None):
+    """
+    Calcula el campo de flujo hacia meta (ejecuta flow_field_pasos hasta el final).
+
+    Args:
+        n: tamaño del tablero (n x n), o un Grid ya construido
+        meta: tupla (fila, col) del hongo, o lista de hongos
+        obstaculos: lista de posiciones con veneno (impasable), solo con la firma antigua
+        stats: EstadisticasBusqueda o función que la recibe al terminar
+
+    Returns:
+        CampoFlujo
+    """
+    return agotar(flow_field_pasos(n, meta, obstaculos, stats=stats))
+
+
+def flow_field_pasos(n, meta, obstaculos=None, cada=EXPANSIONES_POR_AVISO, stats=None):
+    # Generador: entrega el progreso cada `cada` celdas y retorna el CampoFlujo
+    stats, al_terminar = como_estadisticas(stats)
+    grid = como_grid(n, obstaculos, IMPASABLE)
+    rows, cols = grid.rows, grid.cols
+    costos = grid.costos
+    ultima_fila = rows - 1
+    ultima_col = cols - 1
+    arriba, abajo, izquierda, derecha = range(4)
+
+    distancias = array('q', [INFINITO]) * (rows * cols)
+    direcciones = bytearray([SIN_DIRECCION]) * (rows * cols)
+    # Al hongo sobre veneno no se puede entrar: no se busca desde él
+    iniciales = []
+    for posicion in como_metas(meta):
+        celda_meta = grid.celda(posicion)
+        distancias[celda_meta] = 0
+        if costos[celda_meta] != IMPASABLE and celda_meta not in iniciales:
+            iniciales.append(celda_meta)
+    uniforme = grid.costo_uniforme()
+
+    expansiones = 0
+    duplicados = 0
+    max_abiertos = 1
+    fin = INTERRUMPIDA
+    if stats is not None:
+        t0 = time.perf_counter()
+    try:
+        # Al llegar a una vecina desde `actual`, su próximo paso es volver a
+        # `actual`: la dirección guardada es la opuesta a la del recorrido
+        if uniforme:
+            cola = deque(iniciales)
+            while cola:
+                actual = cola.popleft()
+                d = distancias[actual] + 1
+                fila, col = divmod(actual, cols)
+                for vecina, valida, direccion in (
+                    (actual - cols, fila > 0, abajo),
+                    (actual + cols, fila < ultima_fila, arriba),
+                    (actual - 1, col > 0, derecha),
+                    (actual + 1, col < ultima_col, izquierda),
+                ):
+                    if valida and costos[vecina] != IMPASABLE and distancias[vecina] == INFINITO:
+                        distancias[vecina] = d
+                        direcciones[vecina] = direccion
+                        cola.append(vecina)
+                expansiones += 1
+                if len(cola) > max_abiertos:
+                    max_abiertos = len(cola)
+                if expansiones % cada == 0:
+                    yield {"expansiones": expansiones, "abiertos": len(cola)}
+        else:
+            # Ir de u a v cuesta costos[v]: al sacar v se relajan sus vecinos
+            # u con d(v) + costos[v]
+            heap = [(0, celda) for celda in iniciales]
+            while heap:
+                d_actual, actual = heapq.heappop(heap)
+                if d_actual > distancias[actual]:
+                    duplicados += 1
+                    continue
+                d = d_actual + costos[actual]
+                fila, col = divmod(actual, cols)
+                for vecina, valida, direccion in (
+                    (actual - cols, fila > 0, abajo),
+                    (actual + cols, fila < ultima_fila, arriba),
+                    (actual - 1, col > 0, derecha),
+                    (actual + 1, col < ultima_col, izquierda),
+                ):
+                    if valida and costos[vecina] != IMPASABLE and d < distancias[vecina]:
+                        distancias[vecina] = d
+                        direcciones[vecina] = direccion
+                        heapq.heappush(heap, (d, vecina))
+                expansiones += 1
+                if len(heap) > max_abiertos:
+                    max_abiertos = len(heap)
+                if expansiones % cada == 0:
+                    yield {"expansiones": expansiones, "abiertos": len(heap)}
+
+        fin = META
+        return CampoFlujo(grid, meta, distancias, direcciones)
+    finally:
+        if stats is not None:
+            stats.expandidos += expansiones
+            stats.duplicados += duplicados
+            stats.max_abiertos = max(stats.max_abiertos, max_abiertos)
+            stats.sumar_tiempo("busqueda", time.perf_counter() - t0)
+            stats.fin = fin
+        if al_terminar is not None:
+            al_terminar(stats)
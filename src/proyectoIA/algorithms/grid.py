@@ -0,0 +1,175 @@
+"""
+Modelo de ocupación compartido por todos los algoritmos.
+
+El tablero se guarda como una capa plana de costos (un byte por celda,
+índice = fila * cols + columna). El costo de una celda es lo que cuesta
+entrar en ella: COSTO_LIBRE para celdas normales, COSTO_VENENO cuando el
+veneno solo penaliza el paso e IMPASABLE cuando el veneno bloquea la celda.
+"""
+
+import hashlib
+
+# Costos por celda
+IMPASABLE = 0
+COSTO_LIBRE = 1
+COSTO_VENENO = 3
+
+# Distancia o g de una celda no alcanzada
+INFINITO = 2 ** 62
+
+
+class Grid:
+    """
+    Tablero rectangular de rows x cols con una capa de costos plana.
+
+    Args:
+        rows: cantidad de filas
+        cols: cantidad de columnas
+        costos: buffer de rows * cols bytes (bytearray, memoryview, ...).
+            Si es None se crea un tablero sin obstáculos.
+    """
+
+    def __init__(self, rows, cols, costos=None):
+        if rows <= 0 or cols <= 0:
+            raise ValueError(f"Dimensiones inválidas: {rows}x{cols}")
+
+        if costos is None:
+            costos = bytearray([COSTO_LIBRE]) * (rows * cols)
+        elif len(costos) != rows * cols:
+            raise ValueError(
+                f"La capa de costos tiene {len(costos)} celdas, se esperaban {rows * cols}"
+            )
+
+        self.rows = rows
+        self.cols = cols
+        self.costos = costos
+        # Huella calculada (ver huella); cambiar_costo la descarta
+        self._huella = None
+
+        # Desplazamientos lineales precalculados: arriba, abajo, izquierda, derecha
+        self.desplazamientos = (-cols, cols, -1, 1)
+
+    @classmethod
+    def desde_obstaculos(cls, rows, cols, obstaculos, costo_veneno=COSTO_VENENO):
+        """
+        Construye un Grid a partir de la lista de posiciones con veneno.
+        costo_veneno decide si el veneno penaliza (COSTO_VENENO) o bloquea (IMPASABLE).
+        Las posiciones fuera del tablero se ignoran, como en la versión con listas.
+        """
+        grid = cls(rows, cols)
+        costos = grid.costos
+        for fila, col in obstaculos:
+            if 0 <= fila < rows and 0 <= col < cols:
+                costos[fila * cols + col] = costo_veneno
+        return grid
+
+    def __len__(self):
+        return self.rows * self.cols
+
+    def __repr__(self):
+        return f"Grid({self.rows}x{self.cols})"
+
+    # Conversión entre posiciones (fila, col) e índices de celda
+    def celda(self, posicion):
+        return posicion[0] * self.cols + posicion[1]
+
+    def posicion(self, celda):
+        return divmod(celda, self.cols)
+
+    def dentro(self, posicion):
+        return 0 <= posicion[0] < self.rows and 0 <= posicion[1] < self.cols
+
+    def costo(self, posicion):
+        return self.costos[posicion[0] * self.cols + posicion[1]]
+
+    def es_transitable(self, posicion):
+        return self.dentro(posicion) and self.costo(posicion) != IMPASABLE
+
+    def contar_obstaculos(self):
+        """Cantidad de celdas que no son libres (veneno con costo o impasable)."""
+        return len(self) - bytes(self.costos).count(COSTO_LIBRE)
+
+    def costo_uniforme(self):
+        """True si toda celda transitable cuesta COSTO_LIBRE (el veneno, si hay, es impasable)."""
+        # Si al borrar las celdas libres e impasables no queda nada, el costo es uniforme
+        return not bytes(self.costos).translate(None, bytes((IMPASABLE, COSTO_LIBRE)))
+
+    def huella(self):
+        """
+        Hash del contenido (dimensiones y costos). Dos tableros con los mismos
+        costos tienen la misma huella; cualquier cambio de celda la modifica.
+
+        Se calcula la primera vez y queda guardada: los cambios de celda
+        posteriores deben hacerse con cambiar_costo (o seguirse de
+        olvidar_huella) para que no quede vieja.
+        """
+        if self._huella is None:
+            resumen = hashlib.blake2b(digest_size=16)
+            resumen.update(f"{self.rows}x{self.cols}".encode())
+            resumen.update(self.costos)
+            self._huella = resumen.hexdigest()
+        return self._huella
+
+    def olvidar_huella(self):
+        self._huella = None
+
+    def cambiar_costo(self, celda, costo):
+        """Cambia el costo de una celda (índice plano) y descarta la huella guardada."""
+        self.costos[celda] = costo
+        self._huella = None
+
+    def vecinos(self, celda):
+        """
+        Índices de las celdas vecinas transitables, en el orden
+        arriba, abajo, izquierda, derecha.
+        """
+        cols = self.cols
+        costos = self.costos
+        fila, col = divmod(celda, cols)
+        arriba, abajo, izquierda, derecha = self.desplazamientos
+
+        resultado = []
+        if fila > 0 and costos[celda + arriba] != IMPASABLE:
+            resultado.append(celda + arriba)
+        if fila < self.rows - 1 and costos[celda + abajo] != IMPASABLE:
+            resultado.append(celda + abajo)
+        if col > 0 and costos[celda + izquierda] != IMPASABLE:
+            resultado.append(celda + izquierda)
+        if col < cols - 1 and costos[celda + derecha] != IMPASABLE:
+            resultado.append(celda + derecha)
+        return resultado
+
+    def copia(self):
+        return Grid(self.rows, self.cols, bytearray(self.costos))
+
+    def con_costo_veneno(self, costo_veneno):
+        """
+        Copia del tablero donde toda celda que no es libre pasa a tener
+        costo_veneno (por ejemplo IMPASABLE para dynamic weighting).
+        """
+        tabla = bytes(
+            COSTO_LIBRE if costo == COSTO_LIBRE else costo_veneno for costo in range(256)
+        )
+        return Grid(self.rows, self.cols, bytearray(self.costos).translate(tabla))
+
+
+def como_metas(meta):
+    """
+    Acepta una meta (fila, col) o una lista de metas y devuelve siempre una
+    lista de tuplas.
+    """
+    if not meta:
+        raise ValueError("Se necesita al menos una meta")
+    if not isinstance(meta[0], (tuple, list)):
+        return [tuple(meta)]
+    return [tuple(posicion) for posicion in meta]
+
+
+def como_grid(n, obstaculos, costo_veneno):
+    """
+    Acepta un Grid ya construido o la firma antigua (n, lista de obstáculos)
+    y devuelve siempre un Grid.
+    """
+    if isinstance(n, Grid):
+        return n
+    return Grid.desde_obstaculos(n, n, obstaculos or (), costo_veneno)
@@ -0,0 +1,132 @@
+"""
+Heurística exacta: costo real hasta la meta para cada celda del tablero.
+
+Se calcula con una sola búsqueda inversa desde el Hongo (BFS si todas las
+celdas transitables cuestan 1, Dijkstra si hay veneno con costo) y se guarda
+en un arreglo compacto indexado por celda. Con varios hongos la búsqueda
+parte de todos a la vez y da el costo al más cercano. Las tablas se cachean
+por (huella del tablero, metas) con desalojo LRU, así que las consultas repetidas
+contra el mismo hongo solo pagan una búsqueda en el diccionario: el Grid
+guarda su huella y solo la recalcula después de cambiar_costo. Quien ya
+tiene la tabla puede pasarla directamente como heuristica.
+"""
+import heapq
+from array import array
+from collections import OrderedDict, deque
+
+from .grid import IMPASABLE, INFINITO, como_metas
+
+
+def distancias_a_meta(grid, meta):
+    """
+    Costo mínimo desde cada celda hasta meta (INFINITO si no hay camino).
+    meta puede ser una lista de metas: el costo es hasta la más cercana.
+    Entrar a una celda cuesta su valor en grid.costos, igual que en las búsquedas.
+    """
+    rows, cols = grid.rows, grid.cols
+    costos = grid.costos
+    ultima_fila = rows - 1
+    ultima_col = cols - 1
+    distancias = array('q', [INFINITO]) * (rows * cols)
+    celdas_meta = [fila * cols + col for fila, col in como_metas(meta)]
+    for celda_meta in celdas_meta:
+        distancias[celda_meta] = 0
+
+    if grid.costo_uniforme():
+        # Costo uniforme: basta un BFS
+        cola = deque(celdas_meta)
+        while cola:
+            actual = cola.popleft()
+            d = distancias[actual] + 1
+            fila, col = divmod(actual, cols)
+            for vecina, valida in (
+                (actual - cols, fila > 0),
+                (actual + cols, fila < ultima_fila),
+                (actual - 1, col > 0),
+                (actual + 1, col < ultima_col),
+            ):
+                if valida and costos[vecina] != IMPASABLE and distancias[vecina] == INFINITO:
+                    distancias[vecina] = d
+                    cola.append(vecina)
+        return distancias
+
+    # Costos variables: Dijkstra inverso. Ir de u a v cuesta costos[v],
+    # así que al sacar v se relajan sus vecinos u con d(v) + costos[v]
+    heap = [(0, celda_meta) for celda_meta in celdas_meta]
+    while heap:
+        d_actual, actual = heapq.heappop(heap)
+        if d_actual > distancias[actual]:
+            continue
+        d = d_actual + costos[actual]
+        fila, col = divmod(actual, cols)
+        for vecina, valida in (
+            (actual - cols, fila > 0),
+            (actual + cols, fila < ultima_fila),
+            (actual - 1, col > 0),
+            (actual + 1, col < ultima_col),
+        ):
+            if valida and costos[vecina] != IMPASABLE and d < distancias[vecina]:
+                distancias[vecina] = d
+                heapq.heappush(heap, (d, vecina))
+    return distancias
+
+
+class CacheHeuristicas:
+    """
+    Caché LRU de tablas de distancias, con clave (huella del tablero, celdas meta).
+
+    Args:
+        capacidad: cantidad máxima de tablas guardadas
+    """
+
+    def __init__(self, capacidad=16):
+        self.capacidad = capacidad
+        self._tablas = OrderedDict()
+
+    def __len__(self):
+        return len(self._tablas)
+
+    def tabla(self, grid, meta):
+        clave = (grid.huella(), tuple(sorted(grid.celda(posicion) for posicion in como_metas(meta))))
+        tabla = self._tablas.get(clave)
+        if tabla is not None:
+            self._tablas.move_to_end(clave)
+            return tabla
+
+        tabla = distancias_a_meta(grid, meta)
+        self._tablas[clave] = tabla
+        if len(self._tablas) > self.capacidad:
+            self._tablas.popitem(last=False)
+        return tabla
+
+    def limpiar(self):
+        self._tablas.clear()
+
+
+# Caché compartida por los algoritmos
+cache_heuristicas = CacheHeuristicas()
+
+
+def heuristica_exacta(grid, meta):
+    """Tabla de costo exacto hasta meta, tomada de la caché compartida."""
+    return cache_heuristicas.tabla(grid, meta)
+
+
+def resolver_heuristica(heuristica, grid, meta):
+    """
+    Normaliza el argumento `heuristica` de las búsquedas.
+
+    Returns:
+        None para usar manhattan, o una tabla indexada por celda
+    """
+    if heuristica is None:
+        return None
+    if isinstance(heuristica, str):
+        if heuristica == "manhattan":
+            return None
+        if heuristica == "exacta":
+            return heuristica_exacta(grid, meta)
+        raise ValueError(f"Heurística desconocida: {heuristica!r} (use 'manhattan' o 'exacta')")
+    if len(heuristica) != len(grid):
+        raise ValueError("La tabla heurística no tiene el tamaño del tablero")
+    return heuristica
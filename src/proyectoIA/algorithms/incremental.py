@@ -0,0 +1,250 @@
+"""
+Replanificación incremental con D* Lite.
+
+El planificador busca desde la meta hacia la hormiga y guarda su estado
+(g, rhs y la lista abierta) entre llamadas. Cuando aparece o desaparece
+veneno, o la hormiga avanza, solo se reparan las celdas cuyo costo a la
+meta cambió en lugar de buscar de nuevo desde cero.
+
+Como en dynamic weighting, el veneno es impasable y entrar a una celda
+cuesta su costo. El camino es óptimo para el tablero actual.
+
+Uso típico mientras la hormiga camina:
+
+    planificador = PlanificadorIncremental(grid, inicio, meta)
+    camino = planificador.planificar()
+    ...
+    planificador.move_start(posicion_actual)
+    planificador.add_obstacle(celda_con_veneno)
+    camino = planificador.planificar()
+"""
+import heapq
+import time
+from array import array
+
+from .dynamic import EXPANSIONES_POR_AVISO
+from .estadisticas import INTERRUMPIDA, META, SIN_CAMINO, como_estadisticas
+from .grid import COSTO_LIBRE, IMPASABLE, INFINITO, como_grid
+from .pasos import agotar
+
+
+class PlanificadorIncremental:
+    """
+    D* Lite sobre un Grid de 4 vecinos.
+
+    Args:
+        n: tamaño del tablero (n x n), o un Grid ya construido. El
+            planificador trabaja sobre ese Grid y lo modifica con
+            add_obstacle / remove_obstacle.
+        inicio, meta: tuplas (fila, col)
+        obstaculos: lista de posiciones con veneno, solo con la firma antigua
+    """
+
+    def __init__(self, n, inicio, meta, obstaculos=None):
+        self.grid = grid = como_grid(n, obstaculos, IMPASABLE)
+        N = len(grid)
+        self.celda_inicio = grid.celda(inicio)
+        self.celda_meta = grid.celda(meta)
+        self.g = array('q', [INFINITO]) * N
+        self.rhs = array('q', [INFINITO]) * N
+        # Desplazamiento acumulado de las claves por los movimientos del inicio
+        self.km = 0
+        # Lista abierta con borrado perezoso: una entrada vale solo si su
+        # clave coincide con la guardada en _claves
+        self._abiertos = []
+        self._claves = {}
+        self.expansiones = 0
+
+        self.rhs[self.celda_meta] = 0
+        self._insertar(self.celda_meta)
+
+    def __repr__(self):
+        return (
+            f"PlanificadorIncremental({self.grid!r}, inicio={self.inicio}, meta={self.meta}, "
+            f"expansiones={self.expansiones})"
+        )
+
+    @property
+    def inicio(self):
+        return self.grid.posicion(self.celda_inicio)
+
+    @property
+    def meta(self):
+        return self.grid.posicion(self.celda_meta)
+
+    def _adyacentes(self, celda):
+        # Todas las vecinas dentro del tablero, también las impasables:
+        # Grid.vecinos las omite, pero su rhs depende igual de las demás
+        # (importa si la hormiga está sobre veneno)
+        cols = self.grid.cols
+        fila, col = divmod(celda, cols)
+        resultado = []
+        if fila > 0:
+            resultado.append(celda - cols)
+        if fila < self.grid.rows - 1:
+            resultado.append(celda + cols)
+        if col > 0:
+            resultado.append(celda - 1)
+        if col < cols - 1:
+            resultado.append(celda + 1)
+        return resultado
+
+    def _h(self, celda):
+        # Manhattan hasta el inicio (todo paso cuesta al menos 1)
+        cols = self.grid.cols
+        fila, col = divmod(celda, cols)
+        inicio_fila, inicio_col = divmod(self.celda_inicio, cols)
+        return abs(fila - inicio_fila) + abs(col - inicio_col)
+
+    def _clave(self, celda):
+        minimo = min(self.g[celda], self.rhs[celda])
+        return (minimo + self._h(celda) + self.km, minimo)
+
+    def _insertar(self, celda):
+        clave = self._clave(celda)
+        self._claves[celda] = clave
+        heapq.heappush(self._abiertos, (clave[0], clave[1], celda))
+
+    def _actualizar(self, celda):
+        # Recalcula rhs (mejor paso a un vecino más su g) y la pertenencia a la lista abierta
+        if celda != self.celda_meta:
+            costos = self.grid.costos
+            g = self.g
+            mejor = INFINITO
+            for vecina in self.grid.vecinos(celda):
+                costo = costos[vecina]
+                if costo != IMPASABLE and g[vecina] + costo < mejor:
+                    mejor = g[vecina] + costo
+            self.rhs[celda] = mejor
+        if self.g[celda] != self.rhs[celda]:
+            self._insertar(celda)
+        else:
+            self._claves.pop(celda, None)
+
+    def _cambiar_costo(self, posicion, costo):
+        grid = self.grid
+        celda = grid.celda(posicion)
+        if grid.costos[celda] == costo:
+            return
+        grid.cambiar_costo(celda, costo)
+        # Cambian las aristas que entran a la celda, es decir, el rhs de sus vecinas
+        for vecina in self._adyacentes(celda):
+            self._actualizar(vecina)
+
+    def add_obstacle(self, posicion):
+        """Pone veneno (impasable) en la celda."""
+        self._cambiar_costo(posicion, IMPASABLE)
+
+    def remove_obstacle(self, posicion, costo=COSTO_LIBRE):
+        """Quita el veneno de la celda; queda con el costo indicado."""
+        self._cambiar_costo(posicion, costo)
+
+    def move_start(self, posicion):
+        """Mueve el inicio (la hormiga avanzó o se la puso en otra celda)."""
+        celda = self.grid.celda(posicion)
+        if celda == self.celda_inicio:
+            return
+        anterior = self.celda_inicio
+        self.celda_inicio = celda
+        # Las claves ya guardadas usan la heurística del inicio anterior
+        self.km += self._h(anterior)
+
+    def planificar(self, stats=None):
+        """Repara la búsqueda y retorna el camino desde el inicio actual, o None."""
+        return agotar(self.planificar_pasos(stats=stats))
+
+    def planificar_pasos(self, cada=EXPANSIONES_POR_AVISO, stats=None):
+        # Generador: entrega el progreso cada `cada` expansiones y retorna el camino.
+        # Si se interrumpe, el estado queda consistente y la próxima llamada sigue
+        stats, al_terminar = como_estadisticas(stats)
+        g = self.g
+        rhs = self.rhs
+        abiertos = self._abiertos
+        claves = self._claves
+        adyacentes = self._adyacentes
+        celda_inicio = self.celda_inicio
+        heappop = heapq.heappop
+
+        expansiones = 0
+        duplicados = 0
+        max_abiertos = len(claves)
+        fin = INTERRUMPIDA
+        if stats is not None:
+            t0 = time.perf_counter()
+        try:
+            while abiertos:
+                k1, k2, celda = abiertos[0]
+                clave = (k1, k2)
+                if claves.get(celda) != clave:
+                    # Entrada obsoleta o de una celda que ya salió de la lista
+                    heappop(abiertos)
+                    duplicados += 1
+                    continue
+                if clave >= self._clave(celda_inicio) and rhs[celda_inicio] == g[celda_inicio]:
+                    break
+                heappop(abiertos)
+
+                clave_nueva = self._clave(celda)
+                if clave < clave_nueva:
+                    self._insertar(celda)
+                    continue
+                del claves[celda]
+                expansiones += 1
+                if g[celda] > rhs[celda]:
+                    g[celda] = rhs[celda]
+                else:
+                    g[celda] = INFINITO
+                    self._actualizar(celda)
+                for vecina in adyacentes(celda):
+                    self._actualizar(vecina)
+                if len(claves) > max_abiertos:
+                    max_abiertos = len(claves)
+                # El aviso va después de actualizar las vecinas para que el estado
+                # quede consistente si el generador se cierra aquí
+                if expansiones % cada == 0:
+                    yield {"expansiones": expansiones, "abiertos": len(claves)}
+
+            # Descartar las entradas obsoletas cuando ya son la mayoría del heap
+            if len(abiertos) > 2 * len(claves) + 1024:
+                abiertos[:] = [(k1, k2, celda) for celda, (k1, k2) in claves.items()]
+                heapq.heapify(abiertos)
+
+            camino = self.camino()
+            fin = META if camino is not None else SIN_CAMINO
+            return camino
+        finally:
+            self.expansiones += expansiones
+            if stats is not None:
+                stats.expandidos += expansiones
+                stats.duplicados += duplicados
+                stats.max_abiertos = max(stats.max_abiertos, max_abiertos)
+                stats.sumar_tiempo("busqueda", time.perf_counter() - t0)
+                stats.fin = fin
+            if al_terminar is not None:
+                al_terminar(stats)
+
+    def camino(self):
+        """
+        Camino desde el inicio siguiendo en cada paso al vecino con menor
+        costo más g. Válido después de planificar(); None si no hay camino.
+        """
+        grid = self.grid
+        costos = grid.costos
+        g = self.g
+        actual = self.celda_inicio
+        if g[actual] >= INFINITO:
+            return None
+        camino = [grid.posicion(actual)]
+        while actual != self.celda_meta:
+            mejor = INFINITO
+            siguiente = -1
+            for vecina in grid.vecinos(actual):
+                costo = costos[vecina]
+                if costo != IMPASABLE and g[vecina] + costo < mejor:
+                    mejor = g[vecina] + costo
+                    siguiente = vecina
+            if siguiente == -1 or len(camino) > len(grid):
+                return None
+            actual = siguiente
+            camino.append(grid.posicion(actual))
+        return camino
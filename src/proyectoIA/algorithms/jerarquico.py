@@ -0,0 +1,478 @@
+"""
+Búsqueda jerárquica (HPA*) para mapas muy grandes.
+
+El tablero se divide en clusters de tamano x tamano celdas. En cada borde
+entre dos clusters vecinos, cada tramo de celdas transitables de los dos
+lados es una entrada con una o dos transiciones (pares de celdas vecinas,
+una de cada cluster), que son los nodos del grafo abstracto. Las aristas
+son los pasos entre las dos celdas de una transición y las distancias
+dentro de cada cluster entre sus nodos.
+
+Las distancias internas de un cluster se calculan la primera vez que la
+búsqueda lo atraviesa y quedan guardadas. Una consulta agrega el inicio y
+la meta al grafo, busca con A* en el grafo abstracto (pocos nodos) y
+refina cada tramo con una búsqueda limitada al cluster correspondiente.
+
+Cambiar una celda (cambiar_celda) recalcula solo los bordes que la
+contienen y descarta las distancias del cluster; si la celda está en un
+borde, también las del cluster vecino de ese borde. El resto del grafo
+no se toca.
+
+El camino resultante es casi óptimo: las transiciones fijas pueden
+alargarlo un poco respecto de A* sobre todas las celdas.
+"""
+import heapq
+import time
+from collections import OrderedDict
+
+from .dynamic import EXPANSIONES_POR_AVISO
+from .componentes import inalcanzable
+from .estadisticas import INTERRUMPIDA, META, SIN_CAMINO, como_estadisticas
+from .grid import IMPASABLE, INFINITO, como_grid
+from .pasos import agotar
+
+TAMANO_CLUSTER = 16
+
+# Tramos de borde de este largo o más llevan dos transiciones (una en cada punta)
+LARGO_ENTRADA_DOBLE = 6
+
+
+class GrafoAbstracto:
+    """
+    Grafo de entradas entre clusters de un Grid, con las distancias
+    internas de cada cluster calculadas a demanda.
+
+    Args:
+        grid: tablero (el veneno debe ser IMPASABLE o tener costo)
+        tamano: lado de cada cluster en celdas
+    """
+
+    def __init__(self, grid, tamano=TAMANO_CLUSTER):
+        if tamano < 2:
+            raise ValueError(f"El tamaño de cluster debe ser al menos 2: {tamano}")
+        self.grid = grid
+        self.tamano = tamano
+        self.clusters_fila = -(-grid.rows // tamano)
+        self.clusters_col = -(-grid.cols // tamano)
+
+        # Transiciones de cada borde: (cluster a, cluster b) -> [(celda en a, celda en b), ...]
+        self.entradas = {}
+        # Aristas entre clusters: celda -> {celda vecina en otro cluster: costo}
+        self.inter = {}
+        # Nodos de cada cluster y sus distancias internas (None = sin calcular)
+        self.nodos = [set() for _ in range(self.clusters_fila * self.clusters_col)]
+        self.intra = [None] * len(self.nodos)
+
+        for cluster in range(len(self.nodos)):
+            for borde in self._bordes_hacia_adelante(cluster):
+                self._calcular_borde(borde)
+
+    def __repr__(self):
+        calculados = sum(intra is not None for intra in self.intra)
+        return (
+            f"GrafoAbstracto({self.grid.rows}x{self.grid.cols}, tamano={self.tamano}, "
+            f"clusters={len(self.nodos)}, nodos={len(self.inter)}, calculados={calculados})"
+        )
+
+    # Geometría de los clusters
+
+    def cluster_de(self, celda):
+        fila, col = divmod(celda, self.grid.cols)
+        return (fila // self.tamano) * self.clusters_col + col // self.tamano
+
+    def limites(self, cluster):
+        """(primera fila, fila final, primera columna, columna final) del cluster."""
+        cf, cc = divmod(cluster, self.clusters_col)
+        tamano = self.tamano
+        return (
+            cf * tamano, min(self.grid.rows, (cf + 1) * tamano),
+            cc * tamano, min(self.grid.cols, (cc + 1) * tamano),
+        )
+
+    def _bordes_hacia_adelante(self, cluster):
+        # Bordes con el cluster de la derecha y el de abajo
+        cf, cc = divmod(cluster, self.clusters_col)
+        if cc + 1 < self.clusters_col:
+            yield cluster, cluster + 1
+        if cf + 1 < self.clusters_fila:
+            yield cluster, cluster + self.clusters_col
+
+    def _bordes_de_celda(self, celda):
+        # Bordes en los que la celda está del lado de su cluster
+        cluster = self.cluster_de(celda)
+        fila, col = divmod(celda, self.grid.cols)
+        primera_fila, fila_final, primera_col, col_final = self.limites(cluster)
+        cf, cc = divmod(cluster, self.clusters_col)
+        if col == primera_col and cc > 0:
+            yield cluster - 1, cluster
+        if col == col_final - 1 and cc + 1 < self.clusters_col:
+            yield cluster, cluster + 1
+        if fila == primera_fila and cf > 0:
+            yield cluster - self.clusters_col, cluster
+        if fila == fila_final - 1 and cf + 1 < self.clusters_fila:
+            yield cluster, cluster + self.clusters_col
+
+    # Construcción del grafo
+
+    def _calcular_borde(self, borde):
+        grid = self.grid
+        costos = grid.costos
+        cols = grid.cols
+        a, b = borde
+        primera_fila, fila_final, primera_col, col_final = self.limites(a)
+        if a // self.clusters_col == b // self.clusters_col:
+            # Misma fila de clusters (con una sola columna de clusters, b == a + 1 es el de abajo)
+            # Borde vertical: última columna de a contra la primera de b
+            pares = [
+                (fila * cols + col_final - 1, fila * cols + col_final)
+                for fila in range(primera_fila, fila_final)
+            ]
+        else:
+            # Borde horizontal: última fila de a contra la primera de b
+            fila = fila_final - 1
+            pares = [
+                (fila * cols + col, (fila + 1) * cols + col)
+                for col in range(primera_col, col_final)
+            ]
+
+        # Tramos de pares con las dos celdas transitables
+        transiciones = []
+        tramo = []
+        for par in pares + [None]:
+            if par is not None and costos[par[0]] != IMPASABLE and costos[par[1]] != IMPASABLE:
+                tramo.append(par)
+                continue
+            if len(tramo) >= LARGO_ENTRADA_DOBLE:
+                transiciones += [tramo[0], tramo[-1]]
+            elif tramo:
+                transiciones.append(tramo[len(tramo) // 2])
+            tramo = []
+
+        self.entradas[borde] = transiciones
+        for celda_a, celda_b in transiciones:
+            self.inter.setdefault(celda_a, {})[celda_b] = costos[celda_b]
+            self.inter.setdefault(celda_b, {})[celda_a] = costos[celda_a]
+            self.nodos[a].add(celda_a)
+            self.nodos[b].add(celda_b)
+
+    def _quitar_borde(self, borde):
+        a, b = borde
+        for celda_a, celda_b in self.entradas.pop(borde, ()):
+            for celda, otra, cluster in ((celda_a, celda_b, a), (celda_b, celda_a, b)):
+                vecinas = self.inter.get(celda)
+                if vecinas is None:
+                    continue
+                vecinas.pop(otra, None)
+                if not vecinas:
+                    # La celda ya no es transición en ningún borde
+                    del self.inter[celda]
+                    self.nodos[cluster].discard(celda)
+
+    def cambiar_celda(self, posicion, costo):
+        """
+        Cambia el costo de una celda y actualiza solo lo afectado: los
+        bordes que contienen la celda y las distancias internas de su
+        cluster (y del vecino de cada uno de esos bordes).
+        """
+        grid = self.grid
+        celda = grid.celda(posicion)
+        grid.cambiar_costo(celda, costo)
+
+        afectados = {self.cluster_de(celda)}
+        for borde in list(self._bordes_de_celda(celda)):
+            self._quitar_borde(borde)
+            self._calcular_borde(borde)
+            afectados.update(borde)
+        for cluster in afectados:
+            self.intra[cluster] = None
+        return afectados
+
+    def precalcular(self):
+        """Calcula de una vez las distancias internas de todos los clusters."""
+        for cluster in range(len(self.nodos)):
+            self.distancias_internas(cluster)
+
+    # Distancias dentro de un cluster
+
+    def dijkstra_en_cluster(self, origen, cluster, inverso=False):
+        """
+        Costos mínimos desde origen (o hacia origen si inverso) a las celdas
+        del cluster, sin salir de él. Retorna {celda: costo}.
+        """
+        grid = self.grid
+        costos = grid.costos
+        cols = grid.cols
+        primera_fila, fila_final, primera_col, col_final = self.limites(cluster)
+
+        distancias = {origen: 0}
+        heap = [(0, origen)]
+        while heap:
+            d_actual, actual = heapq.heappop(heap)
+            if d_actual > distancias[actual]:
+                continue
+            fila, col = divmod(actual, cols)
+            for vecina, valida in (
+                (actual - cols, fila > primera_fila),
+                (actual + cols, fila < fila_final - 1),
+                (actual - 1, col > primera_col),
+                (actual + 1, col < col_final - 1),
+            ):
+                if not valida or costos[vecina] == IMPASABLE:
+                    continue
+                # Entrar a una celda cuesta su costo; al revés se paga la celda de la que se sale
+                d = d_actual + (costos[actual] if inverso else costos[vecina])
+                if d < distancias.get(vecina, INFINITO):
+                    distancias[vecina] = d
+                    heapq.heappush(heap, (d, vecina))
+        return distancias
+
+    def distancias_internas(self, cluster):
+        """{nodo: {otro nodo del cluster: costo}}; se calcula una vez por cluster."""
+        intra = self.intra[cluster]
+        if intra is None:
+            nodos = self.nodos[cluster]
+            intra = {}
+            for nodo in nodos:
+                distancias = self.dijkstra_en_cluster(nodo, cluster)
+                intra[nodo] = {
+                    otro: distancias[otro]
+                    for otro in nodos
+                    if otro != nodo and otro in distancias
+                }
+            self.intra[cluster] = intra
+        return intra
+
+    def camino_en_cluster(self, origen, destino, cluster):
+        """Camino de celdas entre dos celdas del mismo cluster, sin salir de él."""
+        grid = self.grid
+        costos = grid.costos
+        cols = grid.cols
+        primera_fila, fila_final, primera_col, col_final = self.limites(cluster)
+        destino_fila, destino_col = divmod(destino, cols)
+
+        g = {origen: 0}
+        padres = {origen: -1}
+        heap = [(0, origen)]
+        while heap:
+            _, actual = heapq.heappop(heap)
+            if actual == destino:
+                break
+            fila, col = divmod(actual, cols)
+            for vecina, valida in (
+                (actual - cols, fila > primera_fila),
+                (actual + cols, fila < fila_final - 1),
+                (actual - 1, col > primera_col),
+                (actual + 1, col < col_final - 1),
+            ):
+                if not valida or costos[vecina] == IMPASABLE:
+                    continue
+                nuevo_g = g[actual] + costos[vecina]
+                if nuevo_g < g.get(vecina, INFINITO):
+                    g[vecina] = nuevo_g
+                    padres[vecina] = actual
+                    vf, vc = divmod(vecina, cols)
+                    heapq.heappush(heap, (nuevo_g + abs(vf - destino_fila) + abs(vc - destino_col), vecina))
+        else:
+            return None
+
+        camino = []
+        celda = destino
+        while celda != -1:
+            camino.append(celda)
+            celda = padres[celda]
+        camino.reverse()
+        return camino
+
+
+class CacheGrafos:
+    """
+    Cache LRU de grafos abstractos por (huella del tablero, tamaño de cluster).
+    Si el tablero cambia con GrafoAbstracto.cambiar_celda, el grafo sigue
+    siendo válido pero la huella cambia; conviene guardar el grafo y pasarlo
+    directamente con hpa_search(..., grafo=grafo).
+    """
+
+    def __init__(self, capacidad=4):
+        self.capacidad = capacidad
+        self._grafos = OrderedDict()
+
+    def __len__(self):
+        return len(self._grafos)
+
+    def grafo(self, grid, tamano=TAMANO_CLUSTER):
+        clave = (grid.huella(), tamano)
+        grafo = self._grafos.get(clave)
+        if grafo is not None:
+            self._grafos.move_to_end(clave)
+            return grafo
+
+        # El grafo guarda su propia copia: cambios posteriores al grid no lo afectan
+        grafo = GrafoAbstracto(grid.copia(), tamano)
+        self._grafos[clave] = grafo
+        if len(self._grafos) > self.capacidad:
+            self._grafos.popitem(last=False)
+        return grafo
+
+    def limpiar(self):
+        self._grafos.clear()
+
+
+# Cache compartido por hpa_search
+cache_grafos = CacheGrafos()
+
+
+def buscar_abstracto_pasos(grafo, inicio, meta, cada=EXPANSIONES_POR_AVISO, stats=None):
+    """
+    A* sobre el grafo abstracto con el inicio y la meta agregados.
+
+    Returns:
+        lista de celdas (inicio, nodos abstractos..., meta) o None
+    """
+    grid = grafo.grid
+    cols = grid.cols
+    celda_inicio = grid.celda(inicio)
+    celda_meta = grid.celda(meta)
+    meta_fila, meta_col = meta
+    cluster_inicio = grafo.cluster_de(celda_inicio)
+    cluster_meta = grafo.cluster_de(celda_meta)
+
+    # Aristas temporales: del inicio a los nodos de su cluster y de los
+    # nodos del cluster de la meta hacia la meta
+    desde_inicio = grafo.dijkstra_en_cluster(celda_inicio, cluster_inicio)
+    salida_inicio = {
+        nodo: desde_inicio[nodo] for nodo in grafo.nodos[cluster_inicio] if nodo in desde_inicio
+    }
+    hacia_meta = grafo.dijkstra_en_cluster(celda_meta, cluster_meta, inverso=True)
+    if cluster_inicio == cluster_meta and celda_meta in desde_inicio:
+        salida_inicio[celda_meta] = desde_inicio[celda_meta]
+
+    g_score = {celda_inicio: 0}
+    padres = {celda_inicio: -1}
+    cerrados = set()
+    # Entre empates de f sale primero el de mayor g, como en JPS
+    open_list = [(0, 0, celda_inicio)]
+    expansiones = 0
+    generados = 1
+    duplicados = 0
+    max_abiertos = 1
+    fin = INTERRUMPIDA
+    try:
+        while open_list:
+            _, _, actual = heapq.heappop(open_list)
+            if actual in cerrados:
+                duplicados += 1
+                continue
+            if actual == celda_meta:
+                fin = META
+                camino = []
+                while actual != -1:
+                    camino.append(actual)
+                    actual = padres[actual]
+                camino.reverse()
+                return camino
+            cerrados.add(actual)
+            expansiones += 1
+            if expansiones % cada == 0:
+                yield {"expansiones": expansiones, "abiertos": len(open_list)}
+
+            if actual == celda_inicio:
+                # El inicio puede ser también una transición
+                vecinas = list(salida_inicio.items())
+                vecinas += grafo.inter.get(actual, {}).items()
+            else:
+                cluster = grafo.cluster_de(actual)
+                vecinas = list(grafo.distancias_internas(cluster).get(actual, {}).items())
+                vecinas += grafo.inter.get(actual, {}).items()
+                if cluster == cluster_meta and actual in hacia_meta:
+                    vecinas.append((celda_meta, hacia_meta[actual]))
+
+            g_actual = g_score[actual]
+            for vecina, costo in vecinas:
+                tentative_g = g_actual + costo
+                if tentative_g < g_score.get(vecina, INFINITO):
+                    g_score[vecina] = tentative_g
+                    padres[vecina] = actual
+                    fila, col = divmod(vecina, cols)
+                    h = abs(fila - meta_fila) + abs(col - meta_col)
+                    heapq.heappush(open_list, (tentative_g + h, -tentative_g, vecina))
+                    generados += 1
+            if len(open_list) > max_abiertos:
+                max_abiertos = len(open_list)
+        fin = SIN_CAMINO
+        return None
+    finally:
+        if stats is not None:
+            stats.generados += generados
+            stats.expandidos += expansiones
+            stats.duplicados += duplicados
+            stats.max_abiertos = max(stats.max_abiertos, max_abiertos)
+            stats.fin = fin
+
+
+def refinar(grafo, abstracto):
+    """Convierte la secuencia de nodos abstractos en un camino celda por celda."""
+    cols = grafo.grid.cols
+    celdas = [abstracto[0]]
+    for origen, destino in zip(abstracto, abstracto[1:]):
+        cluster = grafo.cluster_de(origen)
+        if cluster != grafo.cluster_de(destino):
+            # Arista entre clusters: las dos celdas son vecinas
+            celdas.append(destino)
+            continue
+        tramo = grafo.camino_en_cluster(origen, destino, cluster)
+        celdas.extend(tramo[1:])
+    return [divmod(celda, cols) for celda in celdas]
+
+
+def hpa_search(n, inicio, meta, obstaculos=None, tamano_cluster=TAMANO_CLUSTER, grafo=None,
+               stats=None, componentes=None):
+    """
+    Búsqueda jerárquica (ejecuta hpa_search_pasos hasta el final).
+
+    Args:
+        n: tamaño del tablero (n x n), o un Grid ya construido
+        inicio, meta: tuplas (fila, col)
+        obstaculos: lista de posiciones con veneno (impasable), solo con la firma antigua
+        tamano_cluster: lado de los clusters si hay que construir el grafo
+        grafo: GrafoAbstracto ya construido; si es None se toma de cache_grafos
+        stats, componentes: como en dynamic_weighting_search
+
+    Returns:
+        camino celda por celda desde inicio hasta meta, o None
+    """
+    return agotar(hpa_search_pasos(n, inicio, meta, obstaculos, tamano_cluster, grafo,
+                                   stats=stats, componentes=componentes))
+
+
+def hpa_search_pasos(n, inicio, meta, obstaculos=None, tamano_cluster=TAMANO_CLUSTER, grafo=None,
+                     cada=EXPANSIONES_POR_AVISO, stats=None, componentes=None):
+    # Generador: entrega el progreso de la búsqueda abstracta y retorna el camino
+    stats, al_terminar = como_estadisticas(stats)
+    try:
+        grid = como_grid(n, obstaculos, IMPASABLE) if grafo is None else grafo.grid
+        if inalcanzable(grid, inicio, meta, componentes):
+            # Hormiga y hongo en componentes distintas: no hace falta buscar
+            if stats is not None:
+                stats.fin = SIN_CAMINO
+            return None
+        if grafo is None:
+            t0 = time.perf_counter()
+            grafo = cache_grafos.grafo(grid, tamano_cluster)
+            if stats is not None:
+                stats.sumar_tiempo("abstraccion", time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        abstracto = yield from buscar_abstracto_pasos(grafo, inicio, meta, cada, stats)
+        if stats is not None:
+            stats.sumar_tiempo("busqueda", time.perf_counter() - t0)
+        if abstracto is None:
+            return None
+
+        t0 = time.perf_counter()
+        camino = refinar(grafo, abstracto)
+        if stats is not None:
+            stats.sumar_tiempo("refinamiento", time.perf_counter() - t0)
+        return camino
+    finally:
+        if al_terminar is not None:
+            al_terminar(stats)
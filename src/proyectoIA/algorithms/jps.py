@@ -0,0 +1,282 @@
+"""
+Jump Point Search para tableros de costo uniforme con 4 vecinos.
+
+Es el caso de dynamic weighting en la GUI: el veneno es impasable y cada
+movimiento cuesta 1. Entre los muchos caminos óptimos simétricos se elige
+uno canónico (primero vertical, después horizontal, girando solo donde un
+obstáculo obliga) y la búsqueda salta en línea recta hasta la siguiente
+celda donde ese camino podría girar (punto de salto). Solo los puntos de
+salto entran al heap, así que en mapas abiertos se expanden muchos menos
+nodos que celdas recorre el camino.
+
+Reglas de salto:
+    horizontal: se detiene en la meta o en una celda con un vecino vertical
+        forzado (libre, mientras que el vecino vertical de la celda anterior
+        está bloqueado).
+    vertical: se detiene en la meta, en una celda con un vecino horizontal
+        forzado o cuando un salto horizontal desde la celda encuentra algo.
+
+Con epsilon=0 es A* sobre los puntos de salto y el costo del camino es
+óptimo (el mismo que dynamic_weighting_search(..., epsilon=0)). Con
+epsilon > 0 usa el mismo peso dinámico que dynamic weighting, con la
+profundidad medida en pasos (g).
+"""
+import heapq
+import logging
+import time
+from array import array
+
+from .dynamic import EXPANSIONES_POR_AVISO, buscar_celdas_pasos, reconstruir_camino
+from .componentes import inalcanzable
+from .estadisticas import INTERRUMPIDA, META, SIN_CAMINO, como_estadisticas
+from .grid import IMPASABLE, INFINITO, como_grid
+from .pasos import agotar
+
+logger = logging.getLogger(__name__)
+
+# Direcciones de llegada a un nodo (un bit cada una en `llegadas`)
+ARRIBA, ABAJO, IZQUIERDA, DERECHA, INICIO = range(5)
+
+
+def _crear_saltos(grid, celda_meta):
+    # Funciones de salto con el tablero en variables locales del cierre
+    rows, cols = grid.rows, grid.cols
+    costos = grid.costos
+    ultima_fila = rows - 1
+    ultima_col = cols - 1
+
+    def saltar_horizontal(celda, paso):
+        # paso es -1 (izquierda) o 1 (derecha); retorna el punto de salto o -1
+        fila, col = divmod(celda, cols)
+        hay_arriba = fila > 0
+        hay_abajo = fila < ultima_fila
+        while True:
+            col += paso
+            if col < 0 or col > ultima_col:
+                return -1
+            siguiente = celda + paso
+            if costos[siguiente] == IMPASABLE:
+                return -1
+            if siguiente == celda_meta:
+                return siguiente
+            # Vecino vertical forzado: libre junto a la celda nueva, bloqueado junto a la anterior
+            if hay_arriba and costos[siguiente - cols] != IMPASABLE and costos[celda - cols] == IMPASABLE:
+                return siguiente
+            if hay_abajo and costos[siguiente + cols] != IMPASABLE and costos[celda + cols] == IMPASABLE:
+                return siguiente
+            celda = siguiente
+
+    def saltar_vertical(celda, paso):
+        # paso es -cols (arriba) o cols (abajo); retorna el punto de salto o -1
+        fila, col = divmod(celda, cols)
+        delta = 1 if paso > 0 else -1
+        hay_izquierda = col > 0
+        hay_derecha = col < ultima_col
+        while True:
+            fila += delta
+            if fila < 0 or fila > ultima_fila:
+                return -1
+            siguiente = celda + paso
+            if costos[siguiente] == IMPASABLE:
+                return -1
+            if siguiente == celda_meta:
+                return siguiente
+            if hay_izquierda and costos[siguiente - 1] != IMPASABLE and costos[celda - 1] == IMPASABLE:
+                return siguiente
+            if hay_derecha and costos[siguiente + 1] != IMPASABLE and costos[celda + 1] == IMPASABLE:
+                return siguiente
+            # El camino canónico puede girar aquí si un salto horizontal encuentra algo
+            if saltar_horizontal(siguiente, -1) != -1 or saltar_horizontal(siguiente, 1) != -1:
+                return siguiente
+            celda = siguiente
+
+    return saltar_horizontal, saltar_vertical
+
+
+def _direcciones(celda, llegada, grid):
+    # Direcciones a explorar desde un nodo según cómo se llegó a él
+    if llegada == INICIO:
+        return (ARRIBA, ABAJO, IZQUIERDA, DERECHA)
+    if llegada in (ARRIBA, ABAJO):
+        return (llegada, IZQUIERDA, DERECHA)
+
+    # Llegada horizontal: seguir, más los verticales forzados
+    cols = grid.cols
+    costos = grid.costos
+    fila = celda // cols
+    anterior = celda - 1 if llegada == DERECHA else celda + 1
+    direcciones = [llegada]
+    if fila > 0 and costos[celda - cols] != IMPASABLE and costos[anterior - cols] == IMPASABLE:
+        direcciones.append(ARRIBA)
+    if fila < grid.rows - 1 and costos[celda + cols] != IMPASABLE and costos[anterior + cols] == IMPASABLE:
+        direcciones.append(ABAJO)
+    return direcciones
+
+
+def buscar_puntos_salto_pasos(grid, inicio, meta, epsilon=0, cada=EXPANSIONES_POR_AVISO,
+                              stats=None, al_expandir=None):
+    """
+    Motor de JPS sobre índices de celda. Requiere un grid de costo uniforme.
+
+    Yields:
+        cada `cada` expansiones, {"expansiones", "abiertos"}
+
+    Returns:
+        (padres, celda_meta o None, expansiones); padres une cada punto de
+        salto con el anterior
+    """
+    rows, cols = grid.rows, grid.cols
+    N = rows * cols
+    meta_fila, meta_col = meta
+    celda_inicio = inicio[0] * cols + inicio[1]
+    celda_meta = meta_fila * cols + meta_col
+    saltar_horizontal, saltar_vertical = _crear_saltos(grid, celda_meta)
+    pasos = (-cols, cols, -1, 1)
+
+    g_score = array('q', [INFINITO]) * N
+    padres = array('l', [-1]) * N
+    # Bits de las direcciones con las que ya se agregó cada celda con su mejor g:
+    # un mismo punto puede necesitar expandirse desde dos direcciones
+    llegadas = bytearray(N)
+    g_score[celda_inicio] = 0
+    llegadas[celda_inicio] = 1 << INICIO
+
+    # Cada entrada: (f, -g, celda, dirección de llegada). Entre empates de f
+    # sale primero el de mayor g, el más cercano a la meta
+    open_list = [(0, 0, celda_inicio, INICIO)]
+    heappop = heapq.heappop
+    heappush = heapq.heappush
+    expansiones = 0
+    proximo_aviso = cada
+
+    generados = 1
+    duplicados = 0
+    max_abiertos = 1
+    fin = INTERRUMPIDA
+    if stats is not None:
+        t0 = time.perf_counter()
+
+    try:
+        while open_list:
+            f_actual, g_negativo, actual, llegada = heappop(open_list)
+            g_actual = -g_negativo
+
+            # Entrada obsoleta: la celda se alcanzó después con un g mejor
+            if g_actual > g_score[actual]:
+                duplicados += 1
+                continue
+
+            if actual == celda_meta:
+                fin = META
+                return padres, celda_meta, expansiones
+
+            expansiones += 1
+            if expansiones == proximo_aviso:
+                proximo_aviso += cada
+                yield {"expansiones": expansiones, "abiertos": len(open_list)}
+            fila, col = divmod(actual, cols)
+            if al_expandir is not None:
+                al_expandir((fila, col), g_actual, f_actual)
+
+            for direccion in _direcciones(actual, llegada, grid):
+                if direccion >= IZQUIERDA:
+                    salto = saltar_horizontal(actual, pasos[direccion])
+                else:
+                    salto = saltar_vertical(actual, pasos[direccion])
+                if salto == -1:
+                    continue
+
+                sf, sc = divmod(salto, cols)
+                tentative_g = g_actual + abs(sf - fila) + abs(sc - col)
+                bit = 1 << direccion
+                if tentative_g < g_score[salto]:
+                    g_score[salto] = tentative_g
+                    padres[salto] = actual
+                    llegadas[salto] = bit
+                elif tentative_g > g_score[salto] or llegadas[salto] & bit:
+                    continue
+                else:
+                    # Mismo g desde otra dirección: también hay que expandirla
+                    llegadas[salto] |= bit
+
+                h = abs(sf - meta_fila) + abs(sc - meta_col)
+                f = tentative_g + h
+                if epsilon:
+                    f += epsilon * (1 - (tentative_g / N)) * h
+                heappush(open_list, (f, -tentative_g, salto, direccion))
+                generados += 1
+            if stats is not None and len(open_list) > max_abiertos:
+                max_abiertos = len(open_list)
+        fin = SIN_CAMINO
+        return padres, None, expansiones
+    finally:
+        if stats is not None:
+            stats.generados += generados
+            stats.expandidos += expansiones
+            stats.duplicados += duplicados
+            stats.max_abiertos = max(stats.max_abiertos, max_abiertos)
+            stats.sumar_tiempo("busqueda", time.perf_counter() - t0)
+            stats.fin = fin
+
+
+def completar_camino(padres, celda_meta, cols):
+    """Une los puntos de salto con los tramos rectos que hay entre ellos."""
+    puntos = reconstruir_camino(padres, celda_meta, cols)
+    camino = puntos[:1]
+    for fila, col in puntos[1:]:
+        anterior_fila, anterior_col = camino[-1]
+        paso_fila = (fila > anterior_fila) - (fila < anterior_fila)
+        paso_col = (col > anterior_col) - (col < anterior_col)
+        while camino[-1] != (fila, col):
+            anterior_fila += paso_fila
+            anterior_col += paso_col
+            camino.append((anterior_fila, anterior_col))
+    return camino
+
+
+def jump_point_search(n, inicio, meta, obstaculos=None, epsilon=0, stats=None, al_expandir=None,
+                      componentes=None):
+    """
+    Jump Point Search (ejecuta jump_point_search_pasos hasta el final).
+
+    Args:
+        n: tamaño del tablero (n x n), o un Grid ya construido
+        inicio, meta: tuplas (fila, col)
+        obstaculos: lista de posiciones con veneno (impasable), solo con la firma antigua
+        epsilon: peso dinámico como en dynamic weighting; 0 da un camino óptimo
+        stats, al_expandir, componentes: como en dynamic_weighting_search
+
+    Returns:
+        camino celda por celda desde inicio hasta meta, o None
+    """
+    return agotar(jump_point_search_pasos(n, inicio, meta, obstaculos, epsilon,
+                                          stats=stats, al_expandir=al_expandir, componentes=componentes))
+
+
+def jump_point_search_pasos(n, inicio, meta, obstaculos=None, epsilon=0, cada=EXPANSIONES_POR_AVISO,
+                            stats=None, al_expandir=None, componentes=None):
+    # Generador: entrega el progreso cada `cada` expansiones y retorna el camino.
+    # Si el grid tiene celdas con costo distinto de 1, JPS no aplica y se usa
+    # el motor de dynamic weighting con el mismo epsilon.
+    stats, al_terminar = como_estadisticas(stats)
+    try:
+        grid = como_grid(n, obstaculos, IMPASABLE)
+        if inalcanzable(grid, inicio, meta, componentes):
+            # Hormiga y hongo en componentes distintas: no hace falta buscar
+            if stats is not None:
+                stats.fin = SIN_CAMINO
+            return None
+        if grid.costo_uniforme():
+            motor = buscar_puntos_salto_pasos(grid, inicio, meta, epsilon, cada, stats, al_expandir)
+            completar = completar_camino
+        else:
+            logger.info("El tablero no tiene costo uniforme; se usa dynamic weighting sin saltos")
+            motor = buscar_celdas_pasos(grid, inicio, meta, epsilon, None, cada, stats, al_expandir)
+            completar = reconstruir_camino
+        padres, celda_meta, _ = yield from motor
+        if celda_meta is None:
+            return None
+        return completar(padres, celda_meta, grid.cols)
+    finally:
+        if al_terminar is not None:
+            al_terminar(stats)
@@ -1,5 +1,5 @@
-from dynamic import dynamic_weighting_search
-from beam_search import beam_search
+from proyectoIA.algorithms.dynamic import dynamic_weighting_search
+from proyectoIA.algorithms.beam_search import beam_search
 import time  
 
 
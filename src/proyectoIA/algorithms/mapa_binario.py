@@ -0,0 +1,244 @@
+"""
+Formato binario de mapas, pensado para abrirse con mmap.
+
+    cabecera (32 bytes, little endian)
+        firma        4 bytes  b"PIAM"
+        versión      1 byte
+        relleno      3 bytes
+        filas        uint32
+        columnas     uint32
+        hormiga      int32 fila, int32 columna (-1, -1 si no hay)
+        hongo        int32 fila, int32 columna (-1, -1 si no hay)
+    costos           filas * columnas bytes, la capa del Grid tal cual
+    hormigas         solo en las versiones 2 y 3 (mapas con más de una
+                     hormiga): uint32 cantidad y luego int32 fila, int32
+                     columna de cada una; la cabecera repite la primera
+    hongos           solo en la versión 3 (mapas con más de un hongo),
+                     con el mismo formato que las hormigas
+
+Al abrirlo, el Grid usa como capa de costos una vista del archivo mapeado
+en memoria: no se lee el archivo completo ni se copian las celdas, el
+sistema operativo trae las páginas a medida que los algoritmos las tocan.
+
+Uso como conversor:
+
+    python -m proyectoIA.algorithms.mapa_binario mapa.txt mapa.piam
+    python -m proyectoIA.algorithms.mapa_binario mapa.piam mapa.txt
+"""
+import argparse
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .archivo_mapa import (
+    ErrorMapa,
+    Mapa,
+    MapaInvalido,
+    _validar_posiciones,
+    cargar_mapa,
+    guardar_mapa,
+)
+from .grid import Grid
+
+logger = logging.getLogger(__name__)
+
+FIRMA = b"PIAM"
+VERSION = 1
+# Versión con la lista de hormigas al final; solo se escribe si hay más de una
+VERSION_COLONIA = 2
+# Versión con las listas de hormigas y de hongos; solo si hay más de un hongo
+VERSION_HONGOS = 3
+CABECERA = struct.Struct("<4sB3xIIiiii")
+CANTIDAD = struct.Struct("<I")
+
+# Modos de apertura: solo lectura, escritura al archivo o copia privada
+# (copy-on-write: las celdas modificadas no llegan al archivo)
+MODOS = {
+    "r": mmap.ACCESS_READ,
+    "w": mmap.ACCESS_WRITE,
+    "c": mmap.ACCESS_COPY,
+}
+
+_SIN_POSICION = (-1, -1)
+
+
+def _error(mensaje):
+    return MapaInvalido([ErrorMapa(None, mensaje)])
+
+
+def es_binario(ruta):
+    """True si el archivo empieza con la firma del formato binario."""
+    with open(ruta, "rb") as archivo:
+        return archivo.read(len(FIRMA)) == FIRMA
+
+
+def guardar_binario(mapa, destino):
+    """
+    Escribe un Mapa en formato binario.
+
+    Args:
+        mapa: Mapa a guardar
+        destino: ruta (str o PathLike) o archivo abierto en modo binario
+    """
+    if isinstance(destino, (str, bytes, os.PathLike)):
+        with open(destino, "wb") as archivo:
+            guardar_binario(mapa, archivo)
+        return
+
+    if len(mapa.hongos) > 1:
+        version = VERSION_HONGOS
+    elif len(mapa.hormigas) > 1:
+        version = VERSION_COLONIA
+    else:
+        version = VERSION
+    destino.write(CABECERA.pack(
+        FIRMA, version, mapa.rows, mapa.cols,
+        *(mapa.inicio or _SIN_POSICION),
+        *(mapa.meta or _SIN_POSICION),
+    ))
+    destino.write(mapa.grid.costos)
+    if version >= VERSION_COLONIA:
+        _escribir_posiciones(destino, mapa.hormigas)
+    if version >= VERSION_HONGOS:
+        _escribir_posiciones(destino, mapa.hongos)
+
+
+def _escribir_posiciones(destino, posiciones):
+    coordenadas = array("i", (valor for posicion in posiciones for valor in posicion))
+    if sys.byteorder == "big":
+        coordenadas.byteswap()
+    destino.write(CANTIDAD.pack(len(posiciones)))
+    destino.write(coordenadas.tobytes())
+
+
+def abrir_binario(ruta, modo="r"):
+    """
+    Abre un mapa binario sin copiar la capa de costos.
+
+    Args:
+        ruta: archivo en formato binario
+        modo: "r" solo lectura, "w" los cambios se escriben en el archivo,
+            "c" los cambios quedan solo en memoria
+
+    Returns:
+        Mapa cuyo Grid usa una memoryview del archivo mapeado como costos
+    """
+    try:
+        acceso = MODOS[modo]
+    except KeyError:
+        raise ValueError(f"Modo desconocido: {modo!r} (opciones: {', '.join(MODOS)})") from None
+
+    # ACCESS_COPY solo necesita lectura: "r" y "c" abren archivos de solo lectura
+    with open(ruta, "r+b" if modo == "w" else "rb") as archivo:
+        tamano = os.fstat(archivo.fileno()).st_size
+        if tamano < CABECERA.size:
+            raise _error(f"{os.fsdecode(ruta)} es demasiado corto para ser un mapa binario")
+        # El mapeo sigue vivo después de cerrar el archivo
+        memoria = mmap.mmap(archivo.fileno(), 0, access=acceso)
+
+    firma, version, rows, cols, *posiciones = CABECERA.unpack_from(memoria)
+    if firma != FIRMA:
+        raise _error(f"{os.fsdecode(ruta)} no es un mapa binario (firma {firma!r})")
+    if version not in (VERSION, VERSION_COLONIA, VERSION_HONGOS):
+        raise _error(f"versión de mapa binario no soportada: {version}")
+    if rows <= 0 or cols <= 0:
+        raise _error(f"dimensiones inválidas: {rows}x{cols}")
+    fin = CABECERA.size + rows * cols
+    if tamano < fin:
+        raise _error(f"faltan {fin - tamano} bytes de costos para un mapa de {rows}x{cols}")
+
+    grid = Grid(rows, cols, memoryview(memoria)[CABECERA.size:fin])
+    inicio = tuple(posiciones[:2])
+    meta = tuple(posiciones[2:])
+    hormigas = hongos = None
+    if version >= VERSION_COLONIA:
+        hormigas, fin = _leer_posiciones(memoria, fin, tamano)
+        if hormigas is None:
+            raise _error(f"{os.fsdecode(ruta)}: la lista de hormigas está incompleta")
+    if version >= VERSION_HONGOS:
+        hongos, fin = _leer_posiciones(memoria, fin, tamano)
+        if hongos is None:
+            raise _error(f"{os.fsdecode(ruta)}: la lista de hongos está incompleta")
+    inicio = None if inicio == _SIN_POSICION else inicio
+    meta = None if meta == _SIN_POSICION else meta
+
+    # Las posiciones se validan como en el formato de texto: una fuera del
+    # tablero haría fallar (o apuntar a otra celda) a los algoritmos después
+    errores = []
+    for nombre, posiciones in (
+        ("posiciones de la cabecera", [inicio, meta]),
+        ("hormigas", hormigas or ()),
+        ("hongos", hongos or ()),
+    ):
+        _validar_posiciones(
+            grid,
+            [(None, posicion) for posicion in posiciones if posicion is not None],
+            nombre,
+            errores,
+        )
+    if errores:
+        raise MapaInvalido(errores)
+
+    mapa = Mapa(grid, inicio, meta, hormigas=hormigas, hongos=hongos)
+    logger.info("Mapa binario %s abierto: %r", os.fsdecode(ruta), mapa)
+    return mapa
+
+
+def _leer_posiciones(memoria, desde, tamano):
+    # Retorna (lista de posiciones, fin de la lista), o (None, desde) si el
+    # archivo está cortado
+    if tamano < desde + CANTIDAD.size:
+        return None, desde
+    (cantidad,) = CANTIDAD.unpack_from(memoria, desde)
+    inicio = desde + CANTIDAD.size
+    hasta = inicio + cantidad * 8
+    if tamano < hasta:
+        return None, desde
+    coordenadas = array("i")
+    coordenadas.frombytes(memoria[inicio:hasta])
+    if sys.byteorder == "big":
+        coordenadas.byteswap()
+    return list(zip(coordenadas[0::2], coordenadas[1::2])), hasta
+
+
+def abrir_mapa(ruta, modo="r"):
+    """Abre un mapa en cualquiera de los dos formatos según su firma."""
+    if es_binario(ruta):
+        return abrir_binario(ruta, modo)
+    return cargar_mapa(ruta)
+
+
+def texto_a_binario(origen, destino):
+    """Convierte un mapa de texto a binario. Retorna el Mapa leído."""
+    mapa = cargar_mapa(origen)
+    guardar_binario(mapa, destino)
+    return mapa
+
+
+def binario_a_texto(origen, destino):
+    """Convierte un mapa binario a texto. Retorna el Mapa leído."""
+    mapa = abrir_binario(origen)
+    guardar_mapa(mapa, destino)
+    return mapa
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convierte mapas entre el formato de texto y el binario"
+    )
+    parser.add_argument("origen", help="mapa de entrada (el formato se detecta por su contenido)")
+    parser.add_argument("destino", help="mapa de salida en el otro formato")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if es_binario(args.origen):
+        binario_a_texto(args.origen, args.destino)
+    else:
+        texto_a_binario(args.origen, args.destino)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Resolución de muchas consultas (inicio, meta) sobre el mismo mapa en paralelo.
+
+La capa de costos del Grid se copia una sola vez a memoria compartida; cada
+proceso trabajador la abre al iniciar y arma su propio Grid sobre ese buffer,
+así que por consulta solo viajan las coordenadas y el camino resultante.
+Con los algoritmos por nombre, cada proceso arma además un índice de
+componentes conexas que comparten todas sus consultas.
+"""
+import os
+from multiprocessing import Pool, shared_memory
+
+from .beam_search import beam_search
+from .bidireccional import dynamic_weighting_bidireccional
+from .componentes import ComponentesConexas
+from .dynamic import dynamic_weighting_search
+from .grid import Grid
+from .jerarquico import hpa_search
+from .jps import jump_point_search
+
+ALGORITMOS = {
+    "beam": beam_search,
+    "dynamic": dynamic_weighting_search,
+    "jps": jump_point_search,
+    "hpa": hpa_search,
+    "bidireccional": dynamic_weighting_bidireccional,
+}
+
+# Estado de cada proceso trabajador (lo arma _iniciar_trabajador)
+_trabajador = {}
+
+
+def _obtener_algoritmo(algorithm):
+    if callable(algorithm):
+        return algorithm
+    try:
+        return ALGORITMOS[algorithm]
+    except KeyError:
+        raise ValueError(
+            f"Algoritmo desconocido: {algorithm!r} (opciones: {', '.join(ALGORITMOS)})"
+        ) from None
+
+
+def _con_componentes(grid, algorithm, opciones):
+    # Los algoritmos de ALGORITMOS aceptan componentes=; una función propia, no siempre
+    if callable(algorithm) or "componentes" in opciones:
+        return opciones
+    return {**opciones, "componentes": ComponentesConexas(grid)}
+
+
+def _iniciar_trabajador(nombre_memoria, rows, cols, algorithm, opciones):
+    memoria = shared_memory.SharedMemory(name=nombre_memoria)
+    _trabajador["memoria"] = memoria  # Mantener abierta mientras viva el proceso
+    _trabajador["grid"] = Grid(rows, cols, memoria.buf[: rows * cols])
+    _trabajador["algoritmo"] = _obtener_algoritmo(algorithm)
+    _trabajador["opciones"] = _con_componentes(_trabajador["grid"], algorithm, opciones)
+
+
+def _resolver(consulta):
+    inicio, meta = consulta
+    return _trabajador["algoritmo"](_trabajador["grid"], inicio, meta, **_trabajador["opciones"])
+
+
+def solve_many(grid, queries, algorithm="dynamic", workers=None, chunksize=None, **opciones):
+    """
+    Resuelve muchas consultas contra el mismo mapa.
+
+    Args:
+        grid: Grid compartido por todas las consultas
+        queries: iterable de tuplas (inicio, meta)
+        algorithm: "beam", "dynamic", "jps", "hpa", "bidireccional" o una función de
+            búsqueda definida a nivel de módulo con la firma (grid, inicio, meta, **opciones)
+        workers: cantidad de procesos (por defecto, uno por núcleo).
+            Con 1 se resuelve todo en el proceso actual.
+        chunksize: consultas por envío a cada trabajador
+        **opciones: argumentos extra para el algoritmo (epsilon, heuristica, ...).
+            Con un algoritmo por nombre y sin componentes=, cada proceso arma
+            el índice de componentes del tablero (ver componentes.py)
+
+    Yields:
+        El camino (o None) de cada consulta, en el mismo orden que queries
+    """
+    algoritmo = _obtener_algoritmo(algorithm)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        opciones = _con_componentes(grid, algorithm, opciones)
+        for inicio, meta in queries:
+            yield algoritmo(grid, inicio, meta, **opciones)
+        return
+
+    if chunksize is None:
+        chunksize = 16
+
+    total = len(grid)
+    memoria = shared_memory.SharedMemory(create=True, size=total)
+    try:
+        memoria.buf[:total] = grid.costos
+        with Pool(
+            workers,
+            initializer=_iniciar_trabajador,
+            initargs=(memoria.name, grid.rows, grid.cols, algorithm, opciones),
+        ) as pool:
+            # imap entrega los resultados en orden a medida que están listos
+            yield from pool.imap(_resolver, queries, chunksize)
+    finally:
+        memoria.close()
+        memoria.unlink()
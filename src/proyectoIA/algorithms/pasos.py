@@ -0,0 +1,58 @@
+"""
+Ejecución paso a paso de las búsquedas.
+
+Las búsquedas están escritas como generadores (`*_pasos`): cada `yield`
+entrega un diccionario de progreso (al menos la clave "expansiones") y el
+`return` final del generador es el camino encontrado o None. Así se pueden
+cancelar, limitar en tiempo o expansiones, o mostrar avance sin hilos
+dentro de los algoritmos.
+"""
+import time
+
+# Estados con los que termina ejecutar_pasos
+COMPLETA = "completa"
+CANCELADA = "cancelada"
+SIN_TIEMPO = "sin_tiempo"
+SIN_EXPANSIONES = "sin_expansiones"
+
+
+def agotar(pasos):
+    """Ejecuta el generador hasta el final y retorna su resultado."""
+    try:
+        while True:
+            next(pasos)
+    except StopIteration as fin:
+        return fin.value
+
+
+def ejecutar_pasos(pasos, tiempo_max=None, max_expansiones=None, cancelado=None, al_avanzar=None):
+    """
+    Ejecuta una búsqueda paso a paso respetando un presupuesto.
+
+    Args:
+        pasos: generador de búsqueda (por ejemplo beam_search_pasos(...))
+        tiempo_max: segundos de reloj permitidos (None = sin límite)
+        max_expansiones: expansiones permitidas (None = sin límite)
+        cancelado: función sin argumentos que retorna True para detener
+        al_avanzar: función que recibe cada diccionario de progreso
+
+    Returns:
+        (camino o None, estado) donde estado es COMPLETA, CANCELADA,
+        SIN_TIEMPO o SIN_EXPANSIONES
+    """
+    limite = None if tiempo_max is None else time.perf_counter() + tiempo_max
+    try:
+        while True:
+            progreso = next(pasos)
+            if al_avanzar is not None:
+                al_avanzar(progreso)
+            if cancelado is not None and cancelado():
+                return None, CANCELADA
+            if limite is not None and time.perf_counter() > limite:
+                return None, SIN_TIEMPO
+            if max_expansiones is not None and progreso["expansiones"] >= max_expansiones:
+                return None, SIN_EXPANSIONES
+    except StopIteration as fin:
+        return fin.value, COMPLETA
+    finally:
+        pasos.close()
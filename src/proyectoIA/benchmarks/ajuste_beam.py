@@ -0,0 +1,193 @@
+"""
+Ajuste de la política de ancho de haz a partir de corridas medidas.
+
+Corre beam search con varios anchos fijos sobre mapas generados y, para
+cada clase de mapa (tamaño, densidad), elige el ancho más rápido que cumple
+dos condiciones: su tasa de éxito llega al `objetivo` (como fracción de la
+mejor tasa de la clase, porque con veneno impasable hay mapas sin camino) y
+su costo medio no supera en más de `tolerancia` al mejor costo medio.
+El resultado es una tabla con el formato de POLITICA_POR_DEFECTO; guardada
+con --politica se usa como beam_search(..., politica=cargar_politica(ruta)).
+
+También muestra cómo le va al modo adaptativo partiendo del ancho elegido.
+
+Uso:
+    python -m proyectoIA.benchmarks.ajuste_beam --tamanos 30 100 --densidades 0.2 0.4 \\
+        --semillas 10 --objetivo 0.95 --politica politica.json
+
+Con --veneno-impasable el veneno no se puede atravesar, como en los mapas
+donde beam search se queda sin camino al podar el único pasillo.
+"""
+import argparse
+import itertools
+import json
+import statistics
+import time
+
+from ..algorithms.beam_search import POLITICA_POR_DEFECTO, beam_search, calcular_beam_width
+from ..algorithms.grid import IMPASABLE
+from .arnes import costo_camino, metadatos
+from .generador import TIPOS, generar_mapa
+
+ANCHOS = [2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64]
+
+
+def cargar_politica(ruta):
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def _mapas(tamanos, densidades, tipos, semillas, veneno_impasable):
+    for tamano, densidad, tipo, semilla in itertools.product(tamanos, densidades, tipos, range(semillas)):
+        mapa = generar_mapa(tamano, densidad=densidad, tipo=tipo, semilla=semilla)
+        grid = mapa.grid.con_costo_veneno(IMPASABLE) if veneno_impasable else mapa.grid
+        yield tamano, densidad, tipo, semilla, grid, mapa.inicio, mapa.meta
+
+
+def medir(tamanos, densidades, tipos, semillas, anchos, veneno_impasable=False):
+    """Una fila por (tamaño, densidad, tipo, semilla, ancho)."""
+    filas = []
+    for tamano, densidad, tipo, semilla, grid, inicio, meta in _mapas(
+        tamanos, densidades, tipos, semillas, veneno_impasable
+    ):
+        for ancho in anchos:
+            t0 = time.perf_counter()
+            camino = beam_search(grid, inicio, meta, beamWidth=ancho)
+            filas.append({
+                "tamano": tamano,
+                "densidad": densidad,
+                "tipo": tipo,
+                "semilla": semilla,
+                "ancho": ancho,
+                "exito": camino is not None,
+                "tiempo_s": time.perf_counter() - t0,
+                "costo": costo_camino(grid, camino) if camino else None,
+            })
+    return filas
+
+
+def elegir(filas, objetivo, tolerancia):
+    """
+    Para cada (tamaño, densidad) retorna (ancho, tasa de éxito, tiempo medio,
+    costo medio) del ancho elegido.
+    """
+    grupos = {}
+    for fila in filas:
+        grupos.setdefault((fila["tamano"], fila["densidad"], fila["ancho"]), []).append(fila)
+
+    candidatos = {}
+    for (tamano, densidad, ancho), grupo in grupos.items():
+        tasa = sum(fila["exito"] for fila in grupo) / len(grupo)
+        tiempo = statistics.fmean(fila["tiempo_s"] for fila in grupo)
+        costos = [fila["costo"] for fila in grupo if fila["exito"]]
+        costo = statistics.fmean(costos) if costos else None
+        candidatos.setdefault((tamano, densidad), []).append((ancho, tasa, tiempo, costo))
+
+    elegidos = {}
+    for clase, opciones in candidatos.items():
+        mejor_tasa = max(opcion[1] for opcion in opciones)
+        mejor_costo = min((opcion[3] for opcion in opciones if opcion[3] is not None), default=None)
+        suficientes = [
+            opcion for opcion in opciones
+            if opcion[1] >= objetivo * mejor_tasa
+            and (mejor_costo is None or opcion[3] <= mejor_costo * (1 + tolerancia))
+        ]
+        if suficientes:
+            elegidos[clase] = min(suficientes, key=lambda opcion: opcion[2])
+        else:
+            elegidos[clase] = max(opciones, key=lambda opcion: (opcion[1], -opcion[2]))
+    return elegidos
+
+
+def armar_politica(elegidos, tamanos, densidades):
+    # Los umbrales son los valores medidos: los mapas más grandes o más
+    # densos que el último usan la última fila o columna
+    tamanos = sorted(tamanos)
+    densidades = sorted(densidades)
+    return {
+        "lados": tamanos[:-1],
+        "densidades": densidades[:-1],
+        "anchos": [
+            [elegidos[(tamano, densidad)][0] for densidad in densidades]
+            for tamano in tamanos
+        ],
+    }
+
+
+def comparar_adaptativo(politica, tamanos, densidades, tipos, semillas, veneno_impasable=False):
+    """Tasa de éxito y tiempo medio con la política fija y en modo adaptativo."""
+    medidas = {}
+    for tamano, densidad, _, _, grid, inicio, meta in _mapas(
+        tamanos, densidades, tipos, semillas, veneno_impasable
+    ):
+        clase = medidas.setdefault((tamano, densidad), {"fijo": [], "adaptativo": []})
+        for modo, adaptativo in (("fijo", False), ("adaptativo", True)):
+            t0 = time.perf_counter()
+            camino = beam_search(grid, inicio, meta, adaptativo=adaptativo, politica=politica)
+            clase[modo].append((camino is not None, time.perf_counter() - t0))
+
+    resultados = {}
+    for clase, por_modo in medidas.items():
+        resultados[clase] = {
+            modo: (
+                sum(exito for exito, _ in valores) / len(valores),
+                statistics.fmean(tiempo for _, tiempo in valores),
+            )
+            for modo, valores in por_modo.items()
+        }
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ajusta la política de ancho de beam search")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[20, 50, 100])
+    parser.add_argument("--densidades", type=float, nargs="+", default=[0.2, 0.4])
+    parser.add_argument("--tipos", nargs="+", choices=TIPOS, default=list(TIPOS))
+    parser.add_argument("--semillas", type=int, default=5, help="mapas por combinación")
+    parser.add_argument("--anchos", type=int, nargs="+", default=ANCHOS)
+    parser.add_argument("--objetivo", type=float, default=0.9,
+                        help="tasa de éxito mínima, como fracción de la mejor de la clase")
+    parser.add_argument("--tolerancia", type=float, default=0.1,
+                        help="aumento relativo permitido del costo medio sobre el mejor")
+    parser.add_argument("--veneno-impasable", action="store_true")
+    parser.add_argument("--politica", help="archivo .json donde guardar la política")
+    parser.add_argument("--salida", help="archivo .json con todas las mediciones")
+    args = parser.parse_args(argv)
+
+    filas = medir(args.tamanos, args.densidades, args.tipos, args.semillas, args.anchos,
+                  args.veneno_impasable)
+    elegidos = elegir(filas, args.objetivo, args.tolerancia)
+    politica = armar_politica(elegidos, args.tamanos, args.densidades)
+
+    print(f"{'n':>5} {'dens.':>6} {'actual':>7} {'ancho':>6} {'éxito':>6} {'tiempo (s)':>11} {'costo':>8}")
+    for (tamano, densidad), (ancho, tasa, tiempo, costo) in sorted(elegidos.items()):
+        actual = calcular_beam_width(tamano, int(densidad * tamano * tamano), politica=POLITICA_POR_DEFECTO)
+        costo = "-" if costo is None else f"{costo:.1f}"
+        print(f"{tamano:>5} {densidad:>6} {actual:>7} {ancho:>6} {tasa:>6.0%} {tiempo:>11.4f} {costo:>8}")
+
+    print()
+    print(f"{'n':>5} {'dens.':>6} {'éxito fijo':>11} {'tiempo':>9} {'éxito adapt.':>13} {'tiempo':>9}")
+    comparacion = comparar_adaptativo(politica, args.tamanos, args.densidades, args.tipos, args.semillas,
+                                      args.veneno_impasable)
+    for (tamano, densidad), modos in sorted(comparacion.items()):
+        (tasa_fija, tiempo_fijo), (tasa_adaptativa, tiempo_adaptativo) = modos["fijo"], modos["adaptativo"]
+        print(
+            f"{tamano:>5} {densidad:>6} {tasa_fija:>11.0%} {tiempo_fijo:>9.4f} "
+            f"{tasa_adaptativa:>13.0%} {tiempo_adaptativo:>9.4f}"
+        )
+
+    print()
+    print(json.dumps(politica))
+    if args.politica:
+        with open(args.politica, "w", encoding="utf-8") as archivo:
+            json.dump(politica, archivo, indent=2)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(
+                {"metadatos": metadatos(), "objetivo": args.objetivo, "politica": politica, "filas": filas},
+                archivo, indent=2, ensure_ascii=False,
+            )
+
+
+if __name__ == "__main__":
+    main()
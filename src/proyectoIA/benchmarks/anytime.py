@@ -0,0 +1,51 @@
+"""
+Búsqueda anytime: cuándo llega cada mejora y con qué cota, frente a
+dynamic weighting (un solo camino subóptimo) y A* (epsilon=0, óptimo).
+
+Uso:
+    python -m proyectoIA.benchmarks.anytime [tamaño ...]
+"""
+import sys
+import time
+
+from ..algorithms.anytime import dynamic_weighting_anytime
+from ..algorithms.dynamic import dynamic_weighting_search
+from ..algorithms.estadisticas import EstadisticasBusqueda
+from ..algorithms.grid import IMPASABLE
+from .arnes import costo_camino
+from .generador import generar_mapa
+
+
+def _cronometrar(funcion):
+    stats = EstadisticasBusqueda()
+    t0 = time.perf_counter()
+    camino = funcion(stats)
+    return camino, time.perf_counter() - t0, stats.expandidos
+
+
+def main(tamanos):
+    for n in tamanos:
+        for tipo, densidad in (("abierto", 0.2), ("laberinto", 0.3)):
+            mapa = generar_mapa(n, densidad=densidad, tipo=tipo, semilla=n)
+            grid = mapa.grid.con_costo_veneno(IMPASABLE)
+            inicio, meta = mapa.inicio, mapa.meta
+            print(f"{tipo} n={n}")
+
+            for nombre, epsilon in (("dynamic", 3), ("A*", 0)):
+                camino, segundos, expandidos = _cronometrar(
+                    lambda stats: dynamic_weighting_search(grid, inicio, meta, epsilon=epsilon, stats=stats)
+                )
+                costo = costo_camino(grid, camino) if camino else None
+                print(f"  {nombre:<10} {segundos * 1000:>9.1f} ms  costo {costo}  expandidos {expandidos}")
+
+            for mejora in dynamic_weighting_anytime(grid, inicio, meta, epsilon=5):
+                print(
+                    f"  {'anytime':<10} {mejora['tiempo'] * 1000:>9.1f} ms  costo {mejora['costo']}  "
+                    f"expandidos {mejora['expansiones']}  epsilon {mejora['epsilon']}  "
+                    f"cota {mejora['cota']:.3f}"
+                )
+
+
+if __name__ == "__main__":
+    tamanos = [int(arg) for arg in sys.argv[1:]] or [200, 500]
+    main(tamanos)
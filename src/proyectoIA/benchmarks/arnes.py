@@ -0,0 +1,296 @@
+"""
+Arnés de benchmarks: corre cada variante de los algoritmos sobre una grilla
+de parámetros de mapas generados con semilla y guarda los resultados.
+
+Por corrida se registra tiempo de reloj, memoria pico (tracemalloc, en una
+ejecución aparte para no inflar el tiempo), expansiones, costo del camino y
+si se llegó al hongo. El resumen agrupa las semillas de cada combinación y
+da la tasa de éxito. La salida .json incluye metadatos (commit, versión de
+Python) para comparar corridas con proyectoIA.benchmarks.comparar.
+
+Uso:
+    python -m proyectoIA.benchmarks.arnes --tamanos 50 100 --densidades 0.1 0.3 \\
+        --tipos abierto laberinto --semillas 5 --salida resultados.json
+"""
+import argparse
+import csv
+import datetime
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+from ..algorithms.beam_search import beam_search
+from ..algorithms.bidireccional import dynamic_weighting_bidireccional
+from ..algorithms.dynamic import dynamic_weighting_search
+from ..algorithms.estadisticas import EstadisticasBusqueda
+from ..algorithms.grid import COSTO_LIBRE, IMPASABLE
+from ..algorithms.heuristicas import cache_heuristicas
+from ..algorithms.jerarquico import cache_grafos, hpa_search
+from ..algorithms.jps import jump_point_search
+from .generador import TIPOS, generar_mapa
+from .referencia import beam_search_lista, dynamic_weighting_search_dict
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    HAY_NUMPY = False
+else:
+    HAY_NUMPY = True
+
+
+# Cada variante recibe (grid, inicio, meta) y retorna (camino o None, expansiones o None).
+# El grid ya tiene la semántica del veneno del algoritmo (ver VENENO_IMPASABLE).
+
+def _beam(grid, inicio, meta, **opciones):
+    stats = EstadisticasBusqueda()
+    return beam_search(grid, inicio, meta, stats=stats, **opciones), stats.expandidos
+
+
+def _dynamic(grid, inicio, meta, **opciones):
+    stats = EstadisticasBusqueda()
+    return dynamic_weighting_search(grid, inicio, meta, stats=stats, **opciones), stats.expandidos
+
+
+def _bidireccional(grid, inicio, meta, **opciones):
+    stats = EstadisticasBusqueda()
+    return dynamic_weighting_bidireccional(grid, inicio, meta, stats=stats, **opciones), stats.expandidos
+
+
+def _jps(grid, inicio, meta, **opciones):
+    stats = EstadisticasBusqueda()
+    return jump_point_search(grid, inicio, meta, stats=stats, **opciones), stats.expandidos
+
+
+def _hpa(grid, inicio, meta, **opciones):
+    stats = EstadisticasBusqueda()
+    return hpa_search(grid, inicio, meta, stats=stats, **opciones), stats.expandidos
+
+
+def _obstaculos(grid):
+    cols = grid.cols
+    return [divmod(celda, cols) for celda, costo in enumerate(grid.costos) if costo != COSTO_LIBRE]
+
+
+VARIANTES = {
+    "beam": lambda grid, inicio, meta: _beam(grid, inicio, meta),
+    "beam_exacta": lambda grid, inicio, meta: _beam(grid, inicio, meta, heuristica="exacta"),
+    "beam_vectorizado": lambda grid, inicio, meta: _beam(grid, inicio, meta, mode="vectorized"),
+    "beam_original": lambda grid, inicio, meta: (
+        beam_search_lista(grid.rows, inicio, meta, _obstaculos(grid)), None
+    ),
+    "dynamic": lambda grid, inicio, meta: _dynamic(grid, inicio, meta),
+    "dynamic_exacta": lambda grid, inicio, meta: _dynamic(grid, inicio, meta, heuristica="exacta"),
+    "dynamic_original": lambda grid, inicio, meta: dynamic_weighting_search_dict(
+        grid, inicio, meta
+    ),
+    "dynamic_bidireccional": lambda grid, inicio, meta: _bidireccional(grid, inicio, meta),
+    "jps": lambda grid, inicio, meta: _jps(grid, inicio, meta),
+    "jps_dw": lambda grid, inicio, meta: _jps(grid, inicio, meta, epsilon=3),
+    "hpa": lambda grid, inicio, meta: _hpa(grid, inicio, meta),
+}
+
+# Variantes donde el veneno es impasable (en las demás cuesta COSTO_VENENO)
+VENENO_IMPASABLE = {
+    "dynamic", "dynamic_exacta", "dynamic_original", "dynamic_bidireccional", "jps", "jps_dw", "hpa",
+}
+
+# Las versiones originales son lentas; se corren solo si se piden
+VARIANTES_POR_DEFECTO = [
+    nombre for nombre in VARIANTES
+    if not nombre.endswith("_original") and (HAY_NUMPY or nombre != "beam_vectorizado")
+]
+
+CAMPOS = [
+    "variante", "tipo", "tamano", "densidad", "semilla",
+    "exito", "tiempo_s", "memoria_pico_kb", "expansiones", "costo", "pasos",
+]
+
+
+def costo_camino(grid, camino):
+    # El costo de un movimiento es el costo de la celda a la que se entra
+    costos = grid.costos
+    cols = grid.cols
+    return sum(costos[fila * cols + col] for fila, col in camino[1:])
+
+
+def medir(variante, grid, inicio, meta, repeticiones=1, memoria=True):
+    """
+    Corre una variante y retorna un diccionario con las métricas.
+    El tiempo es el mínimo de `repeticiones` corridas.
+    """
+    funcion = VARIANTES[variante]
+    tiempos = []
+    for _ in range(repeticiones):
+        # Las tablas de heurística y el grafo abstracto se construyen dentro de la medición
+        cache_heuristicas.limpiar()
+        cache_grafos.limpiar()
+        t0 = time.perf_counter()
+        camino, expansiones = funcion(grid, inicio, meta)
+        tiempos.append(time.perf_counter() - t0)
+
+    memoria_pico = None
+    if memoria:
+        cache_heuristicas.limpiar()
+        cache_grafos.limpiar()
+        tracemalloc.start()
+        try:
+            funcion(grid, inicio, meta)
+            memoria_pico = tracemalloc.get_traced_memory()[1] // 1024
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "exito": camino is not None,
+        "tiempo_s": min(tiempos),
+        "memoria_pico_kb": memoria_pico,
+        "expansiones": expansiones,
+        "costo": None if camino is None else costo_camino(grid, camino),
+        "pasos": None if camino is None else len(camino) - 1,
+    }
+
+
+def correr(tamanos, densidades, tipos, semillas, variantes, repeticiones=1, memoria=True,
+           al_medir=None):
+    """
+    Recorre la grilla de parámetros y retorna la lista de filas (una por
+    mapa y variante). al_medir(fila) se llama después de cada medición.
+    """
+    filas = []
+    for tamano, densidad, tipo, semilla in itertools.product(
+        tamanos, densidades, tipos, range(semillas)
+    ):
+        mapa = generar_mapa(tamano, densidad=densidad, tipo=tipo, semilla=semilla)
+        grid_impasable = mapa.grid.con_costo_veneno(IMPASABLE)
+        for variante in variantes:
+            grid = grid_impasable if variante in VENENO_IMPASABLE else mapa.grid
+            fila = {
+                "variante": variante,
+                "tipo": tipo,
+                "tamano": tamano,
+                "densidad": densidad,
+                "semilla": semilla,
+            }
+            fila.update(medir(variante, grid, mapa.inicio, mapa.meta, repeticiones, memoria))
+            filas.append(fila)
+            if al_medir is not None:
+                al_medir(fila)
+    return filas
+
+
+def _media(valores):
+    valores = [valor for valor in valores if valor is not None]
+    return statistics.fmean(valores) if valores else None
+
+
+def resumir(filas):
+    """Agrupa las semillas de cada (variante, tipo, tamano, densidad)."""
+    clave = lambda fila: (fila["variante"], fila["tipo"], fila["tamano"], fila["densidad"])
+    resumen = []
+    for (variante, tipo, tamano, densidad), grupo in itertools.groupby(
+        sorted(filas, key=clave), key=clave
+    ):
+        grupo = list(grupo)
+        exitosas = [fila for fila in grupo if fila["exito"]]
+        memorias = [fila["memoria_pico_kb"] for fila in grupo if fila["memoria_pico_kb"] is not None]
+        resumen.append({
+            "variante": variante,
+            "tipo": tipo,
+            "tamano": tamano,
+            "densidad": densidad,
+            "corridas": len(grupo),
+            "tasa_exito": len(exitosas) / len(grupo),
+            "tiempo_medio_s": statistics.fmean(fila["tiempo_s"] for fila in grupo),
+            "tiempo_mediana_s": statistics.median(fila["tiempo_s"] for fila in grupo),
+            "memoria_pico_kb": max(memorias) if memorias else None,
+            "expansiones_media": _media(fila["expansiones"] for fila in grupo),
+            "costo_medio": _media(fila["costo"] for fila in exitosas),
+        })
+    return resumen
+
+
+def metadatos():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "numpy": HAY_NUMPY,
+    }
+
+
+def guardar(ruta, filas, resumen, parametros):
+    # .csv guarda solo las filas; cualquier otra extensión, JSON completo
+    if ruta.endswith(".csv"):
+        with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=CAMPOS)
+            escritor.writeheader()
+            escritor.writerows(filas)
+        return
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(
+            {"metadatos": metadatos(), "parametros": parametros, "resumen": resumen, "filas": filas},
+            archivo, indent=2, ensure_ascii=False,
+        )
+
+
+def imprimir_resumen(resumen):
+    # La columna de variantes toma el ancho del nombre más largo
+    ancho = max(len(nombre) for nombre in VARIANTES)
+    print(
+        f"{'variante':<{ancho}} {'tipo':<10} {'n':>5} {'dens.':>6} {'éxito':>6} "
+        f"{'tiempo (s)':>11} {'mem (KB)':>9} {'expans.':>9} {'costo':>8}"
+    )
+    for fila in resumen:
+        memoria = "-" if fila["memoria_pico_kb"] is None else fila["memoria_pico_kb"]
+        expansiones = "-" if fila["expansiones_media"] is None else f"{fila['expansiones_media']:.0f}"
+        costo = "-" if fila["costo_medio"] is None else f"{fila['costo_medio']:.1f}"
+        print(
+            f"{fila['variante']:<{ancho}} {fila['tipo']:<10} {fila['tamano']:>5} {fila['densidad']:>6} "
+            f"{fila['tasa_exito']:>6.0%} {fila['tiempo_medio_s']:>11.4f} {memoria:>9} "
+            f"{expansiones:>9} {costo:>8}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de beam search y dynamic weighting")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[50, 100])
+    parser.add_argument("--densidades", type=float, nargs="+", default=[0.1, 0.3])
+    parser.add_argument("--tipos", nargs="+", choices=TIPOS, default=list(TIPOS))
+    parser.add_argument("--semillas", type=int, default=3, help="mapas por combinación")
+    parser.add_argument("--variantes", nargs="+", choices=list(VARIANTES), default=VARIANTES_POR_DEFECTO)
+    parser.add_argument("--repeticiones", type=int, default=1, help="se guarda el mejor tiempo")
+    parser.add_argument("--sin-memoria", action="store_true", help="no medir memoria pico")
+    parser.add_argument("--salida", nargs="*", default=[], help="archivos .json y/o .csv")
+    args = parser.parse_args(argv)
+
+    parametros = {
+        "tamanos": args.tamanos,
+        "densidades": args.densidades,
+        "tipos": args.tipos,
+        "semillas": args.semillas,
+        "variantes": args.variantes,
+        "repeticiones": args.repeticiones,
+    }
+    filas = correr(
+        args.tamanos, args.densidades, args.tipos, args.semillas, args.variantes,
+        repeticiones=args.repeticiones, memoria=not args.sin_memoria,
+    )
+    resumen = resumir(filas)
+    imprimir_resumen(resumen)
+    for ruta in args.salida:
+        guardar(ruta, filas, resumen, parametros)
+
+
+if __name__ == "__main__":
+    main()
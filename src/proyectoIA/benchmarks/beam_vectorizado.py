@@ -0,0 +1,41 @@
+"""
+Compara beam search nodo a nodo (mode="python") contra la expansión
+vectorizada del haz completo (mode="vectorized") para distintos anchos.
+Requiere NumPy.
+
+Uso:
+    python -m proyectoIA.benchmarks.beam_vectorizado [tamaño ...]
+"""
+import sys
+import time
+
+import numpy  # noqa: F401  (se importa aquí para no medir la carga de NumPy)
+
+from ..algorithms.beam_search import beam_search
+from .generador import generar_mapa
+
+ANCHOS = (3, 10, 100, 300, 1000)
+
+
+def medir(grid, inicio, meta, ancho, modo):
+    t0 = time.perf_counter()
+    camino = beam_search(grid, inicio, meta, beamWidth=ancho, mode=modo)
+    return camino, time.perf_counter() - t0
+
+
+def main(tamanos):
+    print(f"{'n':>6} {'ancho':>6} {'python (s)':>11} {'vectorizado (s)':>16} {'aceleración':>12}")
+    for n in tamanos:
+        mapa = generar_mapa(n, densidad=0.3, semilla=n)
+        grid, inicio, meta = mapa.grid, mapa.inicio, mapa.meta
+        for ancho in ANCHOS:
+            camino_py, t_py = medir(grid, inicio, meta, ancho, "python")
+            camino_np, t_np = medir(grid, inicio, meta, ancho, "vectorized")
+            if camino_py != camino_np:
+                raise AssertionError(f"Los caminos difieren para n={n}, ancho={ancho}")
+            print(f"{n:>6} {ancho:>6} {t_py:>11.4f} {t_np:>16.4f} {t_py / t_np:>11.1f}x")
+
+
+if __name__ == "__main__":
+    tamanos = [int(arg) for arg in sys.argv[1:]] or [100, 300]
+    main(tamanos)
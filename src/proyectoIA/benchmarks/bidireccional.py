@@ -0,0 +1,76 @@
+"""
+Dynamic weighting bidireccional frente al de una sola dirección: expansiones
+y tiempo de reloj en laberintos (con distintas fracciones de paredes) y en
+un mapa abierto, con el peso por defecto y con epsilon=0 (A*).
+
+Cada mapa se genera con la primera semilla (desde el tamaño) en la que el
+hongo es alcanzable, así todas las filas comparan búsquedas que encuentran
+camino.
+
+Uso:
+    python -m proyectoIA.benchmarks.bidireccional [tamaño ...]
+"""
+import argparse
+import time
+
+from ..algorithms.bidireccional import dynamic_weighting_bidireccional
+from ..algorithms.componentes import ComponentesConexas
+from ..algorithms.dynamic import dynamic_weighting_search
+from ..algorithms.estadisticas import EstadisticasBusqueda
+from ..algorithms.grid import IMPASABLE
+from .arnes import costo_camino
+from .generador import generar_mapa
+
+# (tipo, densidad): en los laberintos, la fracción de paredes que quedan
+MAPAS = (("laberinto", 1.0), ("laberinto", 0.9), ("laberinto", 0.5), ("laberinto", 0.3), ("abierto", 0.3))
+EPSILONS = (3, 0)
+# Semillas que se prueban antes de rendirse con un mapa sin camino
+INTENTOS_SEMILLA = 100
+
+
+def _medir(busqueda, grid, inicio, meta, epsilon):
+    stats = EstadisticasBusqueda()
+    t0 = time.perf_counter()
+    camino = busqueda(grid, inicio, meta, epsilon=epsilon, stats=stats)
+    segundos = time.perf_counter() - t0
+    return stats.expandidos, segundos, costo_camino(grid, camino) if camino else None
+
+
+def mapa_resoluble(n, tipo, densidad):
+    """Primer mapa (semillas n, n + 1, ...) con la meta alcanzable; retorna (mapa, grid, semilla)."""
+    for semilla in range(n, n + INTENTOS_SEMILLA):
+        mapa = generar_mapa(n, densidad=densidad, tipo=tipo, semilla=semilla)
+        grid = mapa.grid.con_costo_veneno(IMPASABLE)
+        if ComponentesConexas(grid).conectadas(mapa.inicio, mapa.meta):
+            return mapa, grid, semilla
+    raise ValueError(f"ningún mapa {tipo} {n}x{n} con densidad {densidad} tiene camino")
+
+
+def comparar(tamanos):
+    print(
+        f"{'tipo':<10} {'dens.':>5} {'n':>5} {'sem.':>5} {'eps':>4} {'exp. uni':>9} {'exp. bi':>9} "
+        f"{'t uni (s)':>10} {'t bi (s)':>9} {'costo uni':>10} {'costo bi':>9}"
+    )
+    for n in tamanos:
+        for tipo, densidad in MAPAS:
+            mapa, grid, semilla = mapa_resoluble(n, tipo, densidad)
+            for epsilon in EPSILONS:
+                exp_uni, t_uni, costo_uni = _medir(dynamic_weighting_search, grid, mapa.inicio, mapa.meta, epsilon)
+                exp_bi, t_bi, costo_bi = _medir(
+                    dynamic_weighting_bidireccional, grid, mapa.inicio, mapa.meta, epsilon
+                )
+                print(
+                    f"{tipo:<10} {densidad:>5} {n:>5} {semilla:>5} {epsilon:>4} {exp_uni:>9} {exp_bi:>9} "
+                    f"{t_uni:>10.4f} {t_bi:>9.4f} {str(costo_uni):>10} {str(costo_bi):>9}"
+                )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dynamic weighting bidireccional frente al de una dirección")
+    parser.add_argument("tamanos", type=int, nargs="*", default=[201, 501], help="lados de los mapas")
+    args = parser.parse_args(argv)
+    comparar(args.tamanos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compara dos resultados JSON del arnés y marca las regresiones.
+
+Una combinación (variante, tipo, tamaño, densidad) es regresión si su
+tiempo medio o sus expansiones medias crecen más que la tolerancia, si baja
+la tasa de éxito o si sube el costo medio del camino.
+
+Uso:
+    python -m proyectoIA.benchmarks.comparar base.json nuevo.json [--tolerancia 0.2]
+
+Termina con código 1 si encuentra alguna regresión.
+"""
+import argparse
+import json
+import sys
+
+
+def _clave(fila):
+    return fila["variante"], fila["tipo"], fila["tamano"], fila["densidad"]
+
+
+def _cambio(antes, despues):
+    if antes is None or despues is None or antes == 0:
+        return None
+    return despues / antes - 1
+
+
+def comparar(base, nuevo, tolerancia=0.2):
+    """
+    Retorna una lista de (clave, métrica, antes, después) con las regresiones
+    entre dos resultados cargados del arnés.
+    """
+    anteriores = {_clave(fila): fila for fila in base["resumen"]}
+    regresiones = []
+    for fila in nuevo["resumen"]:
+        clave = _clave(fila)
+        anterior = anteriores.get(clave)
+        if anterior is None:
+            continue
+        for metrica in ("tiempo_medio_s", "expansiones_media"):
+            cambio = _cambio(anterior[metrica], fila[metrica])
+            if cambio is not None and cambio > tolerancia:
+                regresiones.append((clave, metrica, anterior[metrica], fila[metrica]))
+        if fila["tasa_exito"] < anterior["tasa_exito"]:
+            regresiones.append((clave, "tasa_exito", anterior["tasa_exito"], fila["tasa_exito"]))
+        if (anterior["costo_medio"] is not None and fila["costo_medio"] is not None
+                and fila["costo_medio"] > anterior["costo_medio"]):
+            regresiones.append((clave, "costo_medio", anterior["costo_medio"], fila["costo_medio"]))
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara dos corridas del arnés")
+    parser.add_argument("base")
+    parser.add_argument("nuevo")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="aumento relativo permitido en tiempo y expansiones")
+    args = parser.parse_args(argv)
+
+    with open(args.base, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+    with open(args.nuevo, encoding="utf-8") as archivo:
+        nuevo = json.load(archivo)
+
+    print(f"base: {base['metadatos'].get('commit')}  nuevo: {nuevo['metadatos'].get('commit')}")
+    regresiones = comparar(base, nuevo, args.tolerancia)
+    for (variante, tipo, tamano, densidad), metrica, antes, despues in regresiones:
+        print(f"REGRESIÓN {variante} {tipo} n={tamano} d={densidad}: {metrica} {antes:.4g} -> {despues:.4g}")
+    if not regresiones:
+        print("Sin regresiones")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
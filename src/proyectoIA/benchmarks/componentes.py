@@ -0,0 +1,73 @@
+"""
+Hongo encerrado por veneno: cuánto tardan las búsquedas en rendirse sin el
+índice de componentes conexas y con él, cuánto cuesta armarlo y cuánto
+cuesta actualizarlo al cambiar una celda.
+
+Uso:
+    python -m proyectoIA.benchmarks.componentes [tamaño ...]
+"""
+import random
+import sys
+import time
+
+from ..algorithms.beam_search import beam_search
+from ..algorithms.componentes import ComponentesConexas
+from ..algorithms.dynamic import dynamic_weighting_search
+from ..algorithms.grid import COSTO_LIBRE, IMPASABLE
+from .generador import generar_mapa
+
+CAMBIOS = 200
+
+
+def _cronometrar(funcion):
+    t0 = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - t0
+
+
+def encerrar(grid, meta):
+    """Rodea la meta con veneno impasable."""
+    for vecina in grid.vecinos(grid.celda(meta)):
+        grid.costos[vecina] = IMPASABLE
+
+
+def main(tamanos):
+    print(
+        f"{'tipo':<10} {'n':>5} {'índice (s)':>11} {'dynamic (s)':>12} {'con índice':>11} "
+        f"{'beam (s)':>9} {'con índice':>11} {'cambio (ms)':>12}"
+    )
+    for n in tamanos:
+        for tipo, densidad in (("abierto", 0.2), ("laberinto", 0.3)):
+            mapa = generar_mapa(n, densidad=densidad, tipo=tipo, semilla=n)
+            grid = mapa.grid.con_costo_veneno(IMPASABLE)
+            encerrar(grid, mapa.meta)
+            inicio, meta = mapa.inicio, mapa.meta
+
+            componentes, t_indice = _cronometrar(lambda: ComponentesConexas(grid.copia()))
+            _, t_dynamic = _cronometrar(lambda: dynamic_weighting_search(grid, inicio, meta))
+            _, t_dynamic_indice = _cronometrar(
+                lambda: dynamic_weighting_search(grid, inicio, meta, componentes=componentes)
+            )
+            _, t_beam = _cronometrar(lambda: beam_search(grid, inicio, meta))
+            _, t_beam_indice = _cronometrar(lambda: beam_search(grid, inicio, meta, componentes=componentes))
+
+            # Poner y sacar veneno en celdas libres al azar
+            azar = random.Random(n)
+            libres = [celda for celda, costo in enumerate(grid.costos) if costo != IMPASABLE]
+
+            def cambiar():
+                for _ in range(CAMBIOS // 2):
+                    posicion = grid.posicion(azar.choice(libres))
+                    componentes.cambiar_celda(posicion, IMPASABLE)
+                    componentes.cambiar_celda(posicion, COSTO_LIBRE)
+
+            _, t_cambios = _cronometrar(cambiar)
+            print(
+                f"{tipo:<10} {n:>5} {t_indice:>11.3f} {t_dynamic:>12.4f} {t_dynamic_indice:>11.6f} "
+                f"{t_beam:>9.4f} {t_beam_indice:>11.6f} {t_cambios / CAMBIOS * 1000:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    tamanos = [int(arg) for arg in sys.argv[1:]] or [200, 500]
+    main(tamanos)
@@ -0,0 +1,38 @@
+"""
+Compara el beam search original (closedList con búsqueda lineal) contra
+la versión con arena de nodos e índice de visitados O(1).
+
+Uso:
+    python -m proyectoIA.benchmarks.escalado_beam [tamaño ...]
+"""
+import sys
+import time
+
+from ..algorithms.beam_search import beam_search
+from .generador import generar_mapa
+from .referencia import beam_search_lista
+
+
+def medir(funcion, n, inicio, meta, obstaculos):
+    t0 = time.perf_counter()
+    camino = funcion(n, inicio, meta, obstaculos)
+    return camino, time.perf_counter() - t0
+
+
+def main(tamanos):
+    print(f"{'n':>6} {'original (s)':>14} {'arena (s)':>12} {'aceleración':>12}")
+    for n in tamanos:
+        # Mapa abierto: aísla el costo del almacén de nodos, sin que pese
+        # la búsqueda de obstáculos en la lista
+        mapa = generar_mapa(n, densidad=0.0, semilla=n)
+        inicio, meta, obstaculos = mapa.inicio, mapa.meta, list(mapa.venenos())
+        camino_ref, t_ref = medir(beam_search_lista, n, inicio, meta, obstaculos)
+        camino, t_arena = medir(beam_search, n, inicio, meta, obstaculos)
+        if camino != camino_ref:
+            raise AssertionError(f"Los caminos difieren para n={n}")
+        print(f"{n:>6} {t_ref:>14.4f} {t_arena:>12.4f} {t_ref / t_arena:>11.1f}x")
+
+
+if __name__ == "__main__":
+    tamanos = [int(arg) for arg in sys.argv[1:]] or [25, 50, 100, 200]
+    main(tamanos)
@@ -0,0 +1,77 @@
+"""
+Costo de las estadísticas y del hook de expansión.
+
+Mide cada algoritmo sin stats (el camino normal), con un
+EstadisticasBusqueda y con un hook al_expandir que no hace nada, y muestra
+cuánto más cuestan las dos últimas. Sin stats ni hook los algoritmos solo
+mantienen contadores locales; la columna "vs base" compara ese camino con
+la copia sin instrumentar de los mismos ciclos (ver referencia.py), medida
+en la misma corrida.
+
+Uso:
+    python -m proyectoIA.benchmarks.estadisticas [tamaño ...]
+"""
+import sys
+import time
+from functools import partial
+
+from ..algorithms.beam_search import beam_search, calcular_beam_width
+from ..algorithms.dynamic import dynamic_weighting_search
+from ..algorithms.estadisticas import EstadisticasBusqueda
+from ..algorithms.grid import IMPASABLE
+from .generador import generar_mapa
+from .referencia import beam_search_sin_instrumentar, dynamic_weighting_sin_instrumentar
+
+REPETICIONES = 15
+
+
+def _mejores_tiempos(funciones, numero):
+    # Las variantes se alternan en cada repetición para que el ruido de la
+    # máquina les afecte por igual; se guarda el mejor tiempo de cada una
+    mejores = [float("inf")] * len(funciones)
+    for _ in range(REPETICIONES):
+        for i, funcion in enumerate(funciones):
+            t0 = time.perf_counter()
+            for _ in range(numero):
+                funcion()
+            mejores[i] = min(mejores[i], (time.perf_counter() - t0) / numero)
+    return mejores
+
+
+def main(tamanos):
+    print(
+        f"{'algoritmo':<10} {'n':>5} {'sin stats (ms)':>15} {'vs base':>9} {'con stats':>10} "
+        f"{'con hook':>10} {'expandidos':>11}"
+    )
+    for n in tamanos:
+        mapa = generar_mapa(n, densidad=0.2, tipo="abierto", semilla=n)
+        grid_beam = mapa.grid
+        grid_dynamic = mapa.grid.con_costo_veneno(IMPASABLE)
+        ancho = calcular_beam_width(grid_beam.rows, grid_beam.contar_obstaculos(), grid_beam.cols)
+        variantes = (
+            ("beam", grid_beam, partial(beam_search, beamWidth=ancho),
+             partial(beam_search_sin_instrumentar, beamWidth=ancho)),
+            ("dynamic", grid_dynamic, dynamic_weighting_search, dynamic_weighting_sin_instrumentar),
+        )
+        for nombre, grid, algoritmo, sin_instrumentar in variantes:
+            inicio, meta = mapa.inicio, mapa.meta
+            stats = EstadisticasBusqueda()
+            camino = algoritmo(grid, inicio, meta, stats=stats)
+            assert sin_instrumentar(grid, inicio, meta) == camino
+            numero = max(1, 20000 // max(1, stats.expandidos))
+
+            referencia, base, con_stats, con_hook = _mejores_tiempos([
+                lambda: sin_instrumentar(grid, inicio, meta),
+                lambda: algoritmo(grid, inicio, meta),
+                lambda: algoritmo(grid, inicio, meta, stats=EstadisticasBusqueda()),
+                lambda: algoritmo(grid, inicio, meta, al_expandir=lambda posicion, g, f: None),
+            ], numero)
+            print(
+                f"{nombre:<10} {n:>5} {base * 1000:>15.3f} {base / referencia - 1:>+9.1%} "
+                f"{con_stats / base - 1:>+10.1%} {con_hook / base - 1:>+10.1%} {stats.expandidos:>11}"
+            )
+
+
+if __name__ == "__main__":
+    tamanos = [int(arg) for arg in sys.argv[1:]] or [50, 200, 500]
+    main(tamanos)
@@ -0,0 +1,55 @@
+"""
+Compara dynamic weighting original (diccionarios, sin descartar entradas
+obsoletas) contra el motor con arreglos planos y detección de entradas
+obsoletas: expansiones, expansiones ahorradas y tiempo.
+
+Uso:
+    python -m proyectoIA.benchmarks.expansiones_dynamic [tamaño ...]
+"""
+import sys
+import time
+from itertools import product
+
+from ..algorithms.dynamic import buscar_celdas, reconstruir_camino
+from ..algorithms.grid import COSTO_VENENO, IMPASABLE
+from .generador import generar_mapa
+from .referencia import dynamic_weighting_search_dict
+
+DENSIDADES = (0.0, 0.1, 0.3)
+# Veneno como bloqueo (caso de la GUI) y como celda con costo 3
+COSTOS_VENENO = (IMPASABLE, COSTO_VENENO)
+
+
+def main(tamanos):
+    print(
+        f"{'n':>6} {'veneno':>7} {'costo':>6} {'exp. orig':>10} {'exp. nuevo':>11} "
+        f"{'ahorradas':>10} {'t orig (s)':>11} {'t nuevo (s)':>12} {'largo':>11}"
+    )
+    for n, densidad, costo_veneno in product(tamanos, DENSIDADES, COSTOS_VENENO):
+        mapa = generar_mapa(n, densidad=densidad, semilla=n)
+        inicio, meta = mapa.inicio, mapa.meta
+        grid = mapa.grid.con_costo_veneno(costo_veneno)
+
+        t0 = time.perf_counter()
+        camino_ref, exp_ref = dynamic_weighting_search_dict(grid, inicio, meta)
+        t_ref = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        padres, celda_meta, exp_nuevo = buscar_celdas(grid, inicio, meta)
+        camino = None
+        if celda_meta is not None:
+            camino = reconstruir_camino(padres, celda_meta, grid.cols)
+        t_nuevo = time.perf_counter() - t0
+
+        largo_ref = len(camino_ref) if camino_ref else "-"
+        largo = len(camino) if camino else "-"
+        print(
+            f"{n:>6} {densidad:>7.2f} {costo_veneno:>6} {exp_ref:>10} {exp_nuevo:>11} "
+            f"{exp_ref - exp_nuevo:>10} {t_ref:>11.4f} {t_nuevo:>12.4f} "
+            f"{f'{largo_ref}/{largo}':>11}"
+        )
+
+
+if __name__ == "__main__":
+    tamanos = [int(arg) for arg in sys.argv[1:]] or [50, 100, 200]
+    main(tamanos)
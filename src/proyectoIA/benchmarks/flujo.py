@@ -0,0 +1,69 @@
+"""
+Colonias: un campo de flujo para todas las hormigas frente a una búsqueda
+por hormiga (dynamic weighting y A*, que es dynamic weighting con epsilon=0).
+
+Uso:
+    python -m proyectoIA.benchmarks.flujo [tamaño ...] [--hormigas N]
+"""
+import argparse
+import random
+import time
+
+from ..algorithms.dynamic import dynamic_weighting_search
+from ..algorithms.flujo import flow_field
+from ..algorithms.grid import IMPASABLE
+from .generador import generar_mapa
+
+
+def _cronometrar(funcion):
+    t0 = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Campo de flujo frente a una búsqueda por hormiga")
+    parser.add_argument("tamanos", type=int, nargs="*", default=[100, 300])
+    parser.add_argument("--hormigas", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'tipo':<10} {'n':>5} {'hormigas':>9} {'campo (s)':>10} {'pasos (s)':>10} "
+        f"{'dynamic (s)':>12} {'A* (s)':>9} {'llegan':>7}"
+    )
+    for n in args.tamanos:
+        for tipo, densidad in (("abierto", 0.2), ("laberinto", 0.3)):
+            mapa = generar_mapa(n, densidad=densidad, tipo=tipo, semilla=n)
+            grid = mapa.grid.con_costo_veneno(IMPASABLE)
+            meta = mapa.meta
+            azar = random.Random(n)
+            libres = [celda for celda, costo in enumerate(grid.costos) if costo != IMPASABLE]
+            hormigas = [grid.posicion(azar.choice(libres)) for _ in range(args.hormigas)]
+
+            campo, t_campo = _cronometrar(lambda: flow_field(grid, meta))
+
+            # Todas las hormigas caminan hasta quedar quietas
+            def caminar():
+                posiciones = hormigas
+                while True:
+                    nuevas = campo.avanzar(posiciones)
+                    if nuevas == posiciones:
+                        return posiciones
+                    posiciones = nuevas
+
+            finales, t_pasos = _cronometrar(caminar)
+            _, t_dynamic = _cronometrar(lambda: [
+                dynamic_weighting_search(grid, inicio, meta) for inicio in hormigas
+            ])
+            _, t_astar = _cronometrar(lambda: [
+                dynamic_weighting_search(grid, inicio, meta, epsilon=0) for inicio in hormigas
+            ])
+            llegan = sum(posicion == meta for posicion in finales)
+            print(
+                f"{tipo:<10} {n:>5} {len(hormigas):>9} {t_campo:>10.3f} {t_pasos:>10.3f} "
+                f"{t_dynamic:>12.3f} {t_astar:>9.3f} {llegan:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
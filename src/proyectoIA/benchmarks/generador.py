@@ -0,0 +1,131 @@
+"""
+Generador reproducible de mapas para los benchmarks.
+
+La misma semilla produce siempre el mismo mapa. La hormiga queda en la
+esquina superior izquierda y el hongo en la inferior derecha, las dos en
+celdas libres.
+
+Tipos de mapa:
+    "abierto": cada celda tiene veneno con probabilidad `densidad`.
+    "laberinto": laberinto perfecto (backtracking iterativo) con paredes
+        de veneno; `densidad` es la fracción de paredes interiores que se
+        conservan, así que valores menores abren atajos y ciclos.
+
+Uso:
+    python -m proyectoIA.benchmarks.generador tamaño densidad tipo semilla salida
+"""
+import argparse
+import random
+
+from ..algorithms.archivo_mapa import Mapa, guardar_mapa
+from ..algorithms.grid import COSTO_LIBRE, COSTO_VENENO, Grid
+from ..algorithms.mapa_binario import guardar_binario
+
+TIPOS = ("abierto", "laberinto")
+
+
+def _abierto(grid, densidad, rng):
+    costos = grid.costos
+    aleatorio = rng.random
+    for celda in range(len(grid)):
+        if aleatorio() < densidad:
+            costos[celda] = COSTO_VENENO
+
+
+def _laberinto(grid, densidad, rng):
+    rows, cols = grid.rows, grid.cols
+    costos = grid.costos
+    costos[:] = bytes([COSTO_VENENO]) * len(grid)
+
+    # Las celdas del laberinto están en filas y columnas pares; las impares
+    # son paredes que se abren al conectar dos celdas vecinas
+    visitadas = bytearray(len(grid))
+    pila = [0]
+    visitadas[0] = 1
+    costos[0] = COSTO_LIBRE
+    while pila:
+        actual = pila[-1]
+        fila, col = divmod(actual, cols)
+        vecinas = [
+            (f, c)
+            for f, c in ((fila - 2, col), (fila + 2, col), (fila, col - 2), (fila, col + 2))
+            if 0 <= f < rows and 0 <= c < cols and not visitadas[f * cols + c]
+        ]
+        if not vecinas:
+            pila.pop()
+            continue
+        f, c = rng.choice(vecinas)
+        siguiente = f * cols + c
+        visitadas[siguiente] = 1
+        costos[siguiente] = COSTO_LIBRE
+        costos[((fila + f) // 2) * cols + (col + c) // 2] = COSTO_LIBRE
+        pila.append(siguiente)
+
+    # Paredes entre celdas del laberinto (fila o columna impar, no las dos)
+    # que se quitan para dejar solo la fracción `densidad`
+    if densidad < 1:
+        for fila in range(rows):
+            for col in range(1 - fila % 2, cols, 2):
+                celda = fila * cols + col
+                if costos[celda] == COSTO_VENENO and rng.random() >= densidad:
+                    costos[celda] = COSTO_LIBRE
+
+    # Con dimensiones pares la esquina inferior derecha cae sobre paredes
+    if rows % 2 == 0 and cols % 2 == 0:
+        costos[(rows - 2) * cols + cols - 1] = COSTO_LIBRE
+
+
+def generar_mapa(rows, cols=None, densidad=0.2, tipo="abierto", semilla=0):
+    """
+    Genera un mapa reproducible.
+
+    Args:
+        rows: cantidad de filas
+        cols: cantidad de columnas (por defecto igual a rows)
+        densidad: probabilidad de veneno ("abierto") o fracción de paredes
+            conservadas ("laberinto"), entre 0 y 1
+        tipo: "abierto" o "laberinto"
+        semilla: semilla del generador aleatorio
+
+    Returns:
+        Mapa con el veneno marcado como COSTO_VENENO
+    """
+    if cols is None:
+        cols = rows
+    if not 0 <= densidad <= 1:
+        raise ValueError(f"La densidad debe estar entre 0 y 1: {densidad}")
+
+    rng = random.Random(f"{tipo}:{rows}x{cols}:{densidad}:{semilla}")
+    grid = Grid(rows, cols)
+    if tipo == "abierto":
+        _abierto(grid, densidad, rng)
+    elif tipo == "laberinto":
+        _laberinto(grid, densidad, rng)
+    else:
+        raise ValueError(f"Tipo de mapa desconocido: {tipo!r} (opciones: {', '.join(TIPOS)})")
+
+    inicio = (0, 0)
+    meta = (rows - 1, cols - 1)
+    grid.costos[grid.celda(inicio)] = COSTO_LIBRE
+    grid.costos[grid.celda(meta)] = COSTO_LIBRE
+    return Mapa(grid, inicio, meta)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera un mapa reproducible")
+    parser.add_argument("tamano", type=int)
+    parser.add_argument("densidad", type=float)
+    parser.add_argument("tipo", choices=TIPOS)
+    parser.add_argument("semilla", type=int)
+    parser.add_argument("salida", help="archivo .txt (texto) o cualquier otro (binario)")
+    args = parser.parse_args(argv)
+
+    mapa = generar_mapa(args.tamano, densidad=args.densidad, tipo=args.tipo, semilla=args.semilla)
+    if args.salida.endswith(".txt"):
+        guardar_mapa(mapa, args.salida)
+    else:
+        guardar_binario(mapa, args.salida)
+
+
+if __name__ == "__main__":
+    main()
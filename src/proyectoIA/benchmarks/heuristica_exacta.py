@@ -0,0 +1,72 @@
+"""
+Beam search y dynamic weighting con manhattan contra la heurística exacta
+cacheada: tasa de éxito en mapas con mucho veneno impasable y costo de la
+primera consulta (construye la tabla) frente a consultas repetidas contra
+el mismo hongo.
+
+Uso:
+    python -m proyectoIA.benchmarks.heuristica_exacta [tamaño ...]
+"""
+import random
+import sys
+import time
+
+from ..algorithms.beam_search import beam_search
+from ..algorithms.dynamic import dynamic_weighting_search
+from ..algorithms.grid import COSTO_LIBRE, IMPASABLE
+from ..algorithms.heuristicas import cache_heuristicas
+from .generador import generar_mapa
+
+DENSIDAD = 0.35
+CONSULTAS = 200
+
+
+def inicios_aleatorios(grid, cantidad, semilla):
+    rng = random.Random(semilla)
+    libres = [celda for celda in range(len(grid)) if grid.costos[celda] != IMPASABLE]
+    return [grid.posicion(rng.choice(libres)) for _ in range(cantidad)]
+
+
+def correr(algoritmo, grid, inicios, meta, heuristica):
+    exitos = 0
+    t0 = time.perf_counter()
+    for inicio in inicios:
+        if algoritmo(grid, inicio, meta, heuristica=heuristica) is not None:
+            exitos += 1
+    return exitos, time.perf_counter() - t0
+
+
+def main(tamanos):
+    print(
+        f"{'n':>6} {'algoritmo':>10} {'heurística':>11} {'éxitos':>9} "
+        f"{'total (s)':>10} {'por consulta (ms)':>18}"
+    )
+    for n in tamanos:
+        grid = generar_mapa(n, densidad=DENSIDAD, semilla=n).grid.con_costo_veneno(IMPASABLE)
+        # Hongo en el centro, para que la mayoría de las hormigas tenga camino
+        meta = (n // 2, n // 2)
+        grid.costos[grid.celda(meta)] = COSTO_LIBRE
+        inicios = inicios_aleatorios(grid, CONSULTAS, semilla=n)
+
+        for nombre, algoritmo in (("beam", beam_search), ("dynamic", dynamic_weighting_search)):
+            for heuristica in ("manhattan", "exacta"):
+                exitos, total = correr(algoritmo, grid, inicios, meta, heuristica)
+                print(
+                    f"{n:>6} {nombre:>10} {heuristica:>11} {exitos:>5}/{len(inicios):<3} "
+                    f"{total:>10.4f} {1000 * total / len(inicios):>18.3f}"
+                )
+
+        # Primera consulta (arma la tabla) contra una consulta con la tabla en caché
+        cache_heuristicas.limpiar()
+        t0 = time.perf_counter()
+        beam_search(grid, inicios[0], meta, heuristica="exacta")
+        primera = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        beam_search(grid, inicios[1], meta, heuristica="exacta")
+        repetida = time.perf_counter() - t0
+        print(f"{n:>6} primera consulta {1000 * primera:.2f} ms, repetida {1000 * repetida:.2f} ms")
+
+
+if __name__ == "__main__":
+    tamanos = [int(arg) for arg in sys.argv[1:]] or [50, 200]
+    main(tamanos)
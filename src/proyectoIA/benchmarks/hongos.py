@@ -0,0 +1,69 @@
+"""
+Varios hongos: una búsqueda que termina en el primero que alcanza frente a
+una búsqueda por hongo (quedándose con el camino más barato). Muestra
+también el costo de una búsqueda con un solo hongo como referencia.
+
+Uso:
+    python -m proyectoIA.benchmarks.hongos [tamaño ...] [--hongos N]
+"""
+import argparse
+import random
+import time
+
+from ..algorithms.beam_search import beam_search
+from ..algorithms.dynamic import dynamic_weighting_search
+from ..algorithms.grid import IMPASABLE
+from .arnes import costo_camino
+from .generador import generar_mapa
+
+
+def _cronometrar(funcion):
+    t0 = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - t0
+
+
+def _mas_barato(grid, caminos):
+    caminos = [camino for camino in caminos if camino]
+    return min(caminos, key=lambda camino: costo_camino(grid, camino), default=None)
+
+
+def _costo(grid, camino):
+    return "-" if camino is None else costo_camino(grid, camino)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Búsqueda con varios hongos frente a una por hongo")
+    parser.add_argument("tamanos", type=int, nargs="*", default=[100, 300])
+    parser.add_argument("--hongos", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'algoritmo':<10} {'tipo':<10} {'n':>5} {'un hongo (s)':>13} {'varios (s)':>11} "
+        f"{'por hongo (s)':>14} {'costo':>6} {'mejor':>6}"
+    )
+    for n in args.tamanos:
+        for tipo, densidad in (("abierto", 0.2), ("laberinto", 0.3)):
+            mapa = generar_mapa(n, densidad=densidad, tipo=tipo, semilla=n)
+            azar = random.Random(n)
+            libres = [celda for celda, costo in enumerate(mapa.grid.costos) if costo != IMPASABLE]
+            hongos = [mapa.meta] + [mapa.grid.posicion(azar.choice(libres)) for _ in range(args.hongos - 1)]
+            # Beam search atraviesa el veneno; dynamic weighting no
+            for nombre, algoritmo, grid in (
+                ("beam", beam_search, mapa.grid),
+                ("dynamic", dynamic_weighting_search, mapa.grid.con_costo_veneno(IMPASABLE)),
+            ):
+                _, t_uno = _cronometrar(lambda: algoritmo(grid, mapa.inicio, mapa.meta))
+                camino, t_varios = _cronometrar(lambda: algoritmo(grid, mapa.inicio, hongos))
+                caminos, t_por_hongo = _cronometrar(lambda: [
+                    algoritmo(grid, mapa.inicio, hongo) for hongo in hongos
+                ])
+                print(
+                    f"{nombre:<10} {tipo:<10} {n:>5} {t_uno:>13.4f} {t_varios:>11.4f} "
+                    f"{t_por_hongo:>14.4f} {_costo(grid, camino):>6} "
+                    f"{_costo(grid, _mas_barato(grid, caminos)):>6}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+HPA* en mapas grandes: construcción del grafo abstracto, primera consulta
+(calcula las distancias internas de los clusters que atraviesa), cálculo
+de las distancias de todos los clusters, consultas sobre el grafo completo
+y costo de cambiar una celda frente a reconstruir el grafo (columna
+"grafo"). JPS con las mismas consultas como referencia.
+
+Uso:
+    python -m proyectoIA.benchmarks.jerarquico [tamaño ...]
+"""
+import random
+import sys
+import time
+
+from ..algorithms.estadisticas import EstadisticasBusqueda
+from ..algorithms.grid import COSTO_LIBRE, IMPASABLE
+from ..algorithms.jerarquico import GrafoAbstracto, hpa_search
+from ..algorithms.jps import jump_point_search
+from .generador import generar_mapa
+
+CONSULTAS = 20
+CAMBIOS = 200
+
+
+def _cronometrar(funcion):
+    t0 = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - t0
+
+
+def main(tamanos):
+    print(
+        f"{'tipo':<10} {'n':>5} {'grafo (s)':>10} {'1ª consulta':>12} {'precálculo':>11} "
+        f"{'consulta (ms)':>14} {'jps (ms)':>9} {'cambio (ms)':>12} {'expandidos':>11}"
+    )
+    for n in tamanos:
+        for tipo, densidad in (("abierto", 0.2), ("laberinto", 0.5)):
+            mapa = generar_mapa(n, densidad=densidad, tipo=tipo, semilla=n)
+            grid = mapa.grid.con_costo_veneno(IMPASABLE)
+            azar = random.Random(n)
+            libres = [celda for celda, costo in enumerate(grid.costos) if costo != IMPASABLE]
+            consultas = [
+                (divmod(azar.choice(libres), n), divmod(azar.choice(libres), n))
+                for _ in range(CONSULTAS)
+            ]
+
+            grafo, t_grafo = _cronometrar(lambda: GrafoAbstracto(grid.copia()))
+            _, t_primera = _cronometrar(lambda: hpa_search(grid, *consultas[0], grafo=grafo))
+            _, t_precalculo = _cronometrar(grafo.precalcular)
+            stats = EstadisticasBusqueda()
+            _, t_consultas = _cronometrar(lambda: [
+                hpa_search(grid, inicio, meta, grafo=grafo, stats=stats) for inicio, meta in consultas
+            ])
+            _, t_jps = _cronometrar(lambda: [
+                jump_point_search(grid, inicio, meta) for inicio, meta in consultas
+            ])
+
+            # Cambios sueltos de celdas entre libre e impasable
+            _, t_cambios = _cronometrar(lambda: [
+                grafo.cambiar_celda(divmod(azar.choice(libres), n), azar.choice((IMPASABLE, COSTO_LIBRE)))
+                for _ in range(CAMBIOS)
+            ])
+            print(
+                f"{tipo:<10} {n:>5} {t_grafo:>10.3f} {t_primera:>12.3f} {t_precalculo:>11.3f} "
+                f"{t_consultas / CONSULTAS * 1000:>14.2f} {t_jps / CONSULTAS * 1000:>9.2f} "
+                f"{t_cambios / CAMBIOS * 1000:>12.3f} {stats.expandidos // CONSULTAS:>11}"
+            )
+
+
+if __name__ == "__main__":
+    tamanos = [int(arg) for arg in sys.argv[1:]] or [200, 1000]
+    main(tamanos)
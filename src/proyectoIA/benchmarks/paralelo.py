@@ -0,0 +1,44 @@
+"""
+Escalado de solve_many con la cantidad de procesos trabajadores.
+
+Uso:
+    python -m proyectoIA.benchmarks.paralelo [consultas] [tamaño]
+"""
+import os
+import random
+import sys
+import time
+
+from ..algorithms.grid import COSTO_LIBRE, IMPASABLE
+from ..algorithms.paralelo import solve_many
+from .generador import generar_mapa
+
+
+def main(consultas, n):
+    grid = generar_mapa(n, densidad=0.2, semilla=n).grid.con_costo_veneno(IMPASABLE)
+    meta = (n // 2, n // 2)
+    grid.costos[grid.celda(meta)] = COSTO_LIBRE
+
+    rng = random.Random(n)
+    libres = [celda for celda in range(len(grid)) if grid.costos[celda] != IMPASABLE]
+    queries = [(grid.posicion(rng.choice(libres)), meta) for _ in range(consultas)]
+
+    print(f"{consultas} consultas en {n}x{n}, {os.cpu_count()} núcleos disponibles")
+    print(f"{'procesos':>9} {'tiempo (s)':>11} {'aceleración':>12}")
+    base = None
+    referencia = None
+    for workers in (1, 2, 4, 8):
+        t0 = time.perf_counter()
+        caminos = list(solve_many(grid, queries, algorithm="dynamic", workers=workers))
+        total = time.perf_counter() - t0
+        if referencia is None:
+            base, referencia = total, caminos
+        elif caminos != referencia:
+            raise AssertionError(f"Resultados distintos con {workers} procesos")
+        print(f"{workers:>9} {total:>11.3f} {base / total:>11.2f}x")
+
+
+if __name__ == "__main__":
+    consultas = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    main(consultas, n)
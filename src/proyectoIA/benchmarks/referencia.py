@@ -0,0 +1,277 @@
+# Implementaciones originales de los algoritmos, conservadas solo para
+# comparar resultados y tiempos contra las versiones optimizadas.
+import heapq
+from array import array
+from operator import itemgetter
+
+from ..algorithms.beam_search import (
+    ArenaNodos,
+    calcular_beam_width,
+    expandir_nodo,
+    isNodoMeta,
+    manhattan,
+    reconstruir_camino,
+)
+from ..algorithms.dynamic import EXPANSIONES_POR_AVISO, generar_sucesores
+from ..algorithms.dynamic import reconstruir_camino as reconstruir_camino_celdas
+from ..algorithms.grid import IMPASABLE, INFINITO, como_grid, como_metas
+from ..algorithms.pasos import agotar
+
+
+def reconstruir_camino_lista(closedList, indice_meta):
+    camino = []
+    indice_actual = indice_meta
+
+    while indice_actual is not None:
+        nodo = closedList[indice_actual]
+        camino.append(nodo[0])
+        indice_actual = nodo[1]
+
+    camino.reverse()
+    return camino
+
+
+def beam_search_lista(n, inicio, meta, obstaculos):
+    """
+    Beam search original: closedList como lista de listas y búsqueda
+    lineal de posiciones visitadas (cuadrático en nodos expandidos).
+    """
+    beamWidth = calcular_beam_width(n, len(obstaculos))
+
+    closedList = []
+    h_inicial = manhattan(inicio, meta)
+    closedList.append([inicio, None, 0, h_inicial])
+
+    if isNodoMeta(meta, inicio):
+        return [inicio]
+
+    openList = [0]
+
+    iteracion = 0
+    max_iteraciones = n * n * 2
+
+    while openList and iteracion < max_iteraciones:
+        iteracion += 1
+        todos_sucesores = []
+
+        for indice_nodo in openList:
+            nodo = closedList[indice_nodo]
+            sucesores = expandir_nodo(nodo, meta, obstaculos, n, indice_nodo)
+
+            for sucesor in sucesores:
+                indice_padre, posicion, g_n, h_n, f_n = sucesor
+
+                if isNodoMeta(meta, posicion):
+                    closedList.append([posicion, indice_padre, g_n, h_n])
+                    indice_meta = len(closedList) - 1
+                    return reconstruir_camino_lista(closedList, indice_meta)
+
+                ya_visitado = any(n[0] == posicion for n in closedList)
+
+                if not ya_visitado:
+                    todos_sucesores.append((posicion, indice_padre, g_n, h_n, f_n))
+
+        if not todos_sucesores:
+            return None
+
+        todos_sucesores.sort(key=lambda x: x[4])
+        mejores_sucesores = todos_sucesores[:beamWidth]
+
+        openList = []
+        for posicion, indice_padre, g_n, h_n, f_n in mejores_sucesores:
+            closedList.append([posicion, indice_padre, g_n, h_n])
+            openList.append(len(closedList) - 1)
+
+    return None
+
+
+def dynamic_weighting_search_dict(n, inicio, meta, obstaculos=None, epsilon=3):
+    """
+    Dynamic weighting original: g_score y came_from en diccionarios con
+    claves de tupla, sin descartar entradas repetidas del heap.
+
+    Returns:
+        (camino o None, expansiones)
+    """
+    grid = como_grid(n, obstaculos, IMPASABLE)
+    N = grid.rows * grid.cols
+    open_list = []
+    heapq.heappush(open_list, (0, inicio, 0))
+    came_from = {inicio: None}
+    g_score = {inicio: 0}
+    expansiones = 0
+
+    while open_list:
+        f_actual, actual, depth = heapq.heappop(open_list)
+
+        if actual == meta:
+            camino = []
+            while actual is not None:
+                camino.append(actual)
+                actual = came_from[actual]
+            return camino[::-1], expansiones
+
+        expansiones += 1
+        for sucesor in generar_sucesores(actual, grid):
+            tentative_g = g_score[actual] + grid.costo(sucesor)
+            if sucesor not in g_score or tentative_g < g_score[sucesor]:
+                g_score[sucesor] = tentative_g
+                h = manhattan(sucesor, meta)
+                f = tentative_g + h + epsilon * (1 - (depth / N)) * h
+                heapq.heappush(open_list, (f, sucesor, depth + 1))
+                came_from[sucesor] = actual
+    return None, expansiones
+
+
+# Copias congeladas de los ciclos de beam_search (modo python) y del motor
+# de celdas de dynamic weighting sin estadísticas ni hook: lo mismo que
+# hacen hoy, salvo los contadores, los tiempos y las llamadas a al_expandir.
+# benchmarks/estadisticas.py las usa para medir cuánto cuesta la
+# instrumentación cuando no se pide.
+
+def beam_search_sin_instrumentar(grid, inicio, meta, beamWidth):
+    return agotar(_beam_search_sin_instrumentar_pasos(grid, inicio, meta, beamWidth))
+
+
+def _beam_search_sin_instrumentar_pasos(grid, inicio, meta, beamWidth, tabla_h=None, muertas=None):
+    rows, cols = grid.rows, grid.cols
+    costos = grid.costos
+    arena = ArenaNodos(rows, cols)
+    visitados = arena.visitados
+
+    metas = como_metas(meta)
+    celdas_meta = {grid.celda(posicion) for posicion in metas}
+    meta_fila, meta_col = metas[0]
+    varias_metas = len(metas) > 1
+    celda_inicio = grid.celda(inicio)
+    if tabla_h is None:
+        h_inicial = min(manhattan(inicio, posicion) for posicion in metas)
+    else:
+        h_inicial = tabla_h[celda_inicio]
+    arena.agregar(celda_inicio, -1, 0, h_inicial)
+    if celda_inicio in celdas_meta:
+        return [inicio]
+    if h_inicial >= INFINITO:
+        return None
+
+    openList = [0]
+    iteracion = 0
+    expansiones = 0
+    max_iteraciones = rows * cols * 2
+
+    while openList and iteracion < max_iteraciones:
+        iteracion += 1
+        expansiones += len(openList)
+        todos_sucesores = []
+
+        for indice_nodo in openList:
+            g_actual = arena.g[indice_nodo]
+            for celda in grid.vecinos(arena.celdas[indice_nodo]):
+                if celda in celdas_meta:
+                    indice_meta = arena.agregar(celda, indice_nodo, g_actual + costos[celda], 0)
+                    return reconstruir_camino(arena, indice_meta)
+                if visitados[celda]:
+                    continue
+                if muertas is not None and muertas[celda]:
+                    continue
+                g_n = g_actual + costos[celda]
+                if tabla_h is None:
+                    fila, col = divmod(celda, cols)
+                    if varias_metas:
+                        h_n = min(abs(fila - mf) + abs(col - mc) for mf, mc in metas)
+                    else:
+                        h_n = abs(fila - meta_fila) + abs(col - meta_col)
+                else:
+                    h_n = tabla_h[celda]
+                    if h_n == INFINITO:
+                        continue
+                todos_sucesores.append((celda, indice_nodo, g_n, h_n, g_n + h_n))
+
+        if not todos_sucesores:
+            return None
+
+        mejores_sucesores = heapq.nsmallest(beamWidth, todos_sucesores, key=itemgetter(4))
+        openList = []
+        for celda, indice_padre, g_n, h_n, f_n in mejores_sucesores:
+            openList.append(arena.agregar(celda, indice_padre, g_n, h_n))
+
+        yield {"iteracion": iteracion, "expansiones": expansiones, "nodos": len(arena)}
+
+    return None
+
+
+def dynamic_weighting_sin_instrumentar(grid, inicio, meta, epsilon=3):
+    padres, celda_meta = agotar(_buscar_celdas_sin_instrumentar_pasos(grid, inicio, meta, epsilon))
+    if celda_meta is None:
+        return None
+    return reconstruir_camino_celdas(padres, celda_meta, grid.cols)
+
+
+def _buscar_celdas_sin_instrumentar_pasos(grid, inicio, meta, epsilon=3, tabla_h=None,
+                                          cada=EXPANSIONES_POR_AVISO):
+    rows, cols = grid.rows, grid.cols
+    costos = grid.costos
+    N = rows * cols
+    ultima_fila = rows - 1
+    ultima_col = cols - 1
+    metas = como_metas(meta)
+    meta_fila, meta_col = metas[0]
+    varias_metas = len(metas) > 1
+    celdas_meta = {fila * cols + col for fila, col in metas}
+    celda_inicio = inicio[0] * cols + inicio[1]
+
+    g_score = array('q', [INFINITO]) * N
+    padres = array('l', [-1]) * N
+    cerrados = bytearray(N)
+    g_score[celda_inicio] = 0
+
+    open_list = [(0, celda_inicio, 0, 0)]
+    heappop = heapq.heappop
+    heappush = heapq.heappush
+    expansiones = 0
+    proximo_aviso = cada
+
+    while open_list:
+        f_actual, actual, depth, g_actual = heappop(open_list)
+        if cerrados[actual] or g_actual > g_score[actual]:
+            continue
+        if actual in celdas_meta:
+            return padres, actual
+
+        cerrados[actual] = 1
+        expansiones += 1
+        if expansiones == proximo_aviso:
+            proximo_aviso += cada
+            yield {"expansiones": expansiones, "abiertos": len(open_list)}
+        fila, col = divmod(actual, cols)
+        peso = epsilon * (1 - (depth / N))
+
+        for sucesor, valido in (
+            (actual + cols, fila < ultima_fila),
+            (actual - cols, fila > 0),
+            (actual + 1, col < ultima_col),
+            (actual - 1, col > 0),
+        ):
+            if not valido:
+                continue
+            costo = costos[sucesor]
+            if costo == IMPASABLE:
+                continue
+            tentative_g = g_actual + costo
+            if tentative_g < g_score[sucesor]:
+                g_score[sucesor] = tentative_g
+                padres[sucesor] = actual
+                cerrados[sucesor] = 0
+                if tabla_h is None:
+                    sf, sc = divmod(sucesor, cols)
+                    if varias_metas:
+                        h = min(abs(sf - mf) + abs(sc - mc) for mf, mc in metas)
+                    else:
+                        h = abs(sf - meta_fila) + abs(sc - meta_col)
+                else:
+                    h = tabla_h[sucesor]
+                    if h == INFINITO:
+                        continue
+                f = tentative_g + h + peso * h
+                heappush(open_list, (f, sucesor, depth + 1, tentative_g))
+    return padres, None
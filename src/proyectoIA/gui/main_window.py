@@ -1,7 +1,19 @@
+import os
+import sqlite3
 import sys
-from ..algorithms.beam_search import beam_search
-from ..algorithms.dynamic import dynamic_weighting_search
-from PySide6.QtCore import QTimer
+from ..algorithms.beam_search import beam_search_pasos
+from ..algorithms.dynamic import dynamic_weighting_search_pasos
+from ..algorithms.jps import jump_point_search_pasos
+from ..algorithms.flujo import flow_field_pasos
+from ..algorithms.incremental import PlanificadorIncremental
+from ..algorithms.cache_resultados import CacheResultados
+from ..algorithms.componentes import ComponentesConexas
+from ..algorithms.grid import COSTO_LIBRE, COSTO_VENENO, IMPASABLE
+from ..algorithms.pasos import COMPLETA, CANCELADA, SIN_TIEMPO, SIN_EXPANSIONES
+from PySide6.QtCore import QThread, QPropertyAnimation, QPointF, QStandardPaths, QTimer, Signal
+
+from .renderizado import CapaBordes, CapaRastro, crear_imagen_mapa
+from .trabajador import TrabajadorBusqueda
 
 from .mapa import (
     load_map,
@@ -16,19 +28,29 @@ from PySide6.QtWidgets import (
     QSpinBox,
     QVBoxLayout,
     QHBoxLayout,
-    QGraphicsRectItem,
+    QGraphicsPixmapItem,
     QPushButton,
     QGraphicsTextItem,
+    QLabel,
+    QCheckBox,
+    QFileDialog,
 )
 from PySide6.QtCore import Qt
 from PySide6.QtGui import (
+    QColor,
     QWheelEvent,
-    QBrush,
     QFont,
+    QPixmap,
 )
 
 # Clase para crear un mapa zoomable
 class ZoomableGridView(QGraphicsView):
+    # Clic sin arrastrar: punto en coordenadas de la escena
+    clic_escena = Signal(QPointF)
+
+    # Movimiento máximo (pixeles) entre presionar y soltar para contar como clic
+    tolerancia_clic = 4
+
     def __init__(self, scene, parent=None):
         super().__init__(scene, parent)
         self.setRenderHint(self.renderHints())
@@ -37,6 +59,21 @@ class ZoomableGridView(QGraphicsView):
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
         self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self._presionado_en = None
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._presionado_en = event.position()
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        if event.button() != Qt.LeftButton or self._presionado_en is None:
+            return
+        movimiento = event.position() - self._presionado_en
+        self._presionado_en = None
+        if movimiento.manhattanLength() <= self.tolerancia_clic:
+            self.clic_escena.emit(self.mapToScene(event.position().toPoint()))
 
     # Zoom con la rueda del mouse
     def wheelEvent(self, event: QWheelEvent):
@@ -50,6 +87,21 @@ class ZoomableGridView(QGraphicsView):
 
         self.scale(zoom_factor, zoom_factor)
 
+# Con más hormigas que esto el campo de flujo las dibuja como puntos
+MAX_EMOJIS_COLONIA = 50
+COLOR_COLONIA = QColor(90, 50, 0)
+
+# Caché de resultados en la carpeta de caché del usuario, para que las
+# consultas repetidas sigan siendo instantáneas después de reiniciar
+def abrir_cache_resultados():
+    carpeta = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+    try:
+        os.makedirs(carpeta, exist_ok=True)
+        return CacheResultados(ruta=os.path.join(carpeta, "resultados.sqlite"))
+    except (OSError, sqlite3.Error) as e:
+        print(f"No se pudo abrir la caché en disco ({e}); se usa solo memoria")
+        return CacheResultados()
+
 # Cuerpo principal de la ventana
 class GridWidget(QWidget):
     def __init__(self):
@@ -59,17 +111,20 @@ class GridWidget(QWidget):
         self.cell_size = 20  # pixeles
 
         # Configuración de la animación
+        # Una sola QPropertyAnimation mueve la hormiga por todo el camino;
+        # el rastro se pinta en una capa de imagen (CapaRastro)
         self.camino_actual = []
         self.indice_animacion = 0
-        self.timer_animacion = QTimer()
-        self.timer_animacion.timeout.connect(self.actualizar_animacion)
-        self.velocidad_animacion = 300 
+        self.animacion = None
+        self.rastro_item = None
+        self.velocidad_animacion = 300  # milisegundos por paso
 
         self.ant_item = None
         self.mushroom_item = None
 
-        # Cargar mapa inicial
-        self.rows, self.cols, self.grid_data = load_map()
+        # Cargar mapa inicial (None = txt/mapa.txt)
+        self.ruta_mapa = None
+        self.rows, self.cols, self.grid_data, self.grid = load_map()
 
         # Auxiliar para mostrar movimientos sin perder el mapa original
         # Modificar para las animaciones
@@ -78,6 +133,7 @@ class GridWidget(QWidget):
         self.scene = QGraphicsScene()
         self.view = ZoomableGridView(self.scene)
         self.view.setMinimumSize(600, 400)
+        self.view.clic_escena.connect(self.celda_clicada)
 
         # Boton iniciar Beam Search
         self.btn_beam = QPushButton("Iniciar Beam Search")
@@ -87,17 +143,98 @@ class GridWidget(QWidget):
         self.btn_dw = QPushButton("Iniciar Dynamic Weighting")
         self.btn_dw.clicked.connect(self.iniciar_dw)
 
-        
+        # Boton iniciar Jump Point Search
+        self.btn_jps = QPushButton("Iniciar Jump Point Search")
+        self.btn_jps.clicked.connect(self.iniciar_jps)
+
+        # Boton iniciar D* Lite: después, cada clic en una celda pone o quita
+        # veneno y el camino se repara desde donde está la hormiga
+        self.btn_dstar = QPushButton("Iniciar D* Lite")
+        self.btn_dstar.clicked.connect(self.iniciar_dstar)
+        self.planificador = None
+
+        # Boton campo de flujo: una búsqueda desde el hongo y todas las
+        # hormigas del mapa caminan siguiendo sus direcciones
+        self.btn_flujo = QPushButton("Iniciar campo de flujo")
+        self.btn_flujo.clicked.connect(self.iniciar_flujo)
+        self.campo = None
+        self.colonia = []
+        self.emojis_colonia = []
+        self.capa_colonia = None
+        self.temporizador_colonia = QTimer(self)
+        self.temporizador_colonia.timeout.connect(self.avanzar_colonia)
+        # Con la búsqueda terminada, función que anima el resultado en lugar
+        # de animar_camino (la usa el campo de flujo)
+        self.animar_resultado = None
+
+        # Búsqueda en segundo plano: hilo, trabajador y presupuesto
+        self.hilo_busqueda = None
+        self.trabajador = None
+
+        # Resultados ya calculados: la clave de la búsqueda en curso se guarda
+        # para registrar su camino al terminar
+        self.cache = abrir_cache_resultados()
+        self.clave_busqueda = None
+
+        # Componentes conexas del mapa con veneno impasable: se arman en la
+        # primera búsqueda y cada clic en el mapa las actualiza sin rehacerlas
+        self.componentes = None
+
+        self.btn_cancelar = QPushButton("Cancelar búsqueda")
+        self.btn_cancelar.setEnabled(False)
+        self.btn_cancelar.clicked.connect(self.cancelar_busqueda)
+
+        self.tiempo_max = QSpinBox()
+        self.tiempo_max.setRange(1, 3600)
+        self.tiempo_max.setValue(30)
+        self.tiempo_max.setSuffix(" s")
+
+        self.max_expansiones = QSpinBox()
+        self.max_expansiones.setRange(1, 1_000_000)
+        self.max_expansiones.setValue(10_000)
+        self.max_expansiones.setSuffix(" mil")
+
+        self.lbl_progreso = QLabel("Listo")
+        self.lbl_progreso.setWordWrap(True)
+
+        # Controles de la animación
+        self.velocidad = QSpinBox()
+        self.velocidad.setRange(1, 2000)
+        self.velocidad.setValue(self.velocidad_animacion)
+        self.velocidad.setSuffix(" ms/paso")
+        self.velocidad.valueChanged.connect(self.cambiar_velocidad)
+
+        self.chk_saltar = QCheckBox("Mostrar solo el resultado")
+
+        self.btn_saltar = QPushButton("Saltar al final")
+        self.btn_saltar.clicked.connect(self.saltar_al_final)
 
         # Boton resetear mapa
         self.reiniciar_todo = QPushButton("Reiniciar")
         self.reiniciar_todo.clicked.connect(self.reiniciar)
 
+        self.btn_abrir = QPushButton("Abrir mapa...")
+        self.btn_abrir.clicked.connect(self.abrir_archivo)
+
         # Panel lateral
         self.panel = QVBoxLayout()
         self.panel.addWidget(self.btn_beam)
         self.panel.addWidget(self.btn_dw)
+        self.panel.addWidget(self.btn_jps)
+        self.panel.addWidget(self.btn_dstar)
+        self.panel.addWidget(self.btn_flujo)
+        self.panel.addWidget(self.btn_cancelar)
+        self.panel.addWidget(QLabel("Tiempo máximo"))
+        self.panel.addWidget(self.tiempo_max)
+        self.panel.addWidget(QLabel("Máximo de expansiones"))
+        self.panel.addWidget(self.max_expansiones)
+        self.panel.addWidget(self.lbl_progreso)
+        self.panel.addWidget(QLabel("Velocidad de animación"))
+        self.panel.addWidget(self.velocidad)
+        self.panel.addWidget(self.chk_saltar)
+        self.panel.addWidget(self.btn_saltar)
         self.panel.addWidget(self.reiniciar_todo)
+        self.panel.addWidget(self.btn_abrir)
         self.panel.addStretch()
 
         self.side_widget = QWidget()
@@ -119,6 +256,8 @@ class GridWidget(QWidget):
     def set_grid_size(self, size):
         self.rows, self.cols = size
 
+    # Dibuja el mapa como una sola imagen (un píxel por celda escalado por
+    # cell_size) más los emojis de la hormiga y el hongo
     def redraw_grid(self):
         self.scene.clear()
         self.ant_item = None
@@ -128,81 +267,313 @@ class GridWidget(QWidget):
         height = self.rows * self.cell_size
         self.scene.setSceneRect(0, 0, width, height)
 
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell_type = self.temp_grid_data.get((row, col), CellTypes.EMPTY)
-                color = color_map[cell_type]
-
-                rect = QGraphicsRectItem(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
-                rect.setBrush(QBrush(color))
-                self.scene.addItem(rect)
-                
-                if cell_type == CellTypes.ANT:
-                    self.ant_item = QGraphicsTextItem("🐜")
-                    font = QFont()
-                    font.setPointSize(int(self.cell_size * 0.8))
-                    self.ant_item.setFont(font)
-                    # Center the emoji in the cell
-                    self.ant_item.setPos(
-                        col * self.cell_size + self.cell_size * 0.1,
-                        row * self.cell_size - self.cell_size * 0.2
-                    )
-                    self.scene.addItem(self.ant_item)
-                
-                elif cell_type == CellTypes.OBJECTIVE:
-                    self.mushroom_item = QGraphicsTextItem("🍄")
-                    font = QFont()
-                    font.setPointSize(int(self.cell_size * 0.8))
-                    self.mushroom_item.setFont(font)
-                    # Center the emoji in the cell
-                    self.mushroom_item.setPos(
-                        col * self.cell_size + self.cell_size * 0.1,
-                        row * self.cell_size - self.cell_size * 0.2
-                    )
-                    self.mushroom_item.setZValue(1)
-                    self.scene.addItem(self.mushroom_item)
+        self.imagen_mapa = crear_imagen_mapa(self.rows, self.cols, self.temp_grid_data)
+        self.mapa_item = QGraphicsPixmapItem(QPixmap.fromImage(self.imagen_mapa))
+        self.mapa_item.setScale(self.cell_size)
+        # Sin suavizado: cada píxel se ve como un bloque de color
+        self.mapa_item.setTransformationMode(Qt.FastTransformation)
+        self.scene.addItem(self.mapa_item)
+
+        # Bordes de celda (solo se dibujan al hacer zoom)
+        bordes = CapaBordes(self.rows, self.cols, self.cell_size)
+        bordes.setZValue(0.8)
+        self.scene.addItem(bordes)
+        self.rastro_item = None
+
+        for pos, cell_type in self.temp_grid_data.items():
+            if not (0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols):
+                continue
+            if cell_type == CellTypes.ANT:
+                self.ant_item = self.crear_emoji("🐜", pos)
+            elif cell_type == CellTypes.OBJECTIVE:
+                self.mushroom_item = self.crear_emoji("🍄", pos)
+
+    def crear_emoji(self, texto, pos):
+        item = QGraphicsTextItem(texto)
+        font = QFont()
+        font.setPointSize(int(self.cell_size * 0.8))
+        item.setFont(font)
+        item.setPos(self.posicion_emoji(pos))
+        item.setZValue(1)
+        self.scene.addItem(item)
+        return item
+
+    # Center the emoji in the cell
+    def posicion_emoji(self, pos):
+        return QPointF(
+            pos[1] * self.cell_size + self.cell_size * 0.1,
+            pos[0] * self.cell_size - self.cell_size * 0.2
+        )
 
     # Funcion para reiniciar el mapa
     def reiniciar(self):
-        self.timer_animacion.stop()
-        self.rows, self.cols, self.grid_data = load_map()
+        self.detener_busqueda()
+        self.detener_animacion()
+        self.planificador = None
+        self.componentes = None
+        self.camino_actual = []
+        self.rows, self.cols, self.grid_data, self.grid = load_map(self.ruta_mapa)
         self.temp_grid_data = self.grid_data.copy()
         self.redraw_grid()
         print("Mapa reiniciado")
 
-    def iniciar_beam(self):
+    # Abre otro mapa (formato de texto o binario)
+    def abrir_archivo(self):
+        ruta, _ = QFileDialog.getOpenFileName(
+            self, "Abrir mapa", "", "Mapas (*.txt *.piam);;Todos los archivos (*)"
+        )
+        if not ruta:
+            return
+        ruta_anterior = self.ruta_mapa
+        self.ruta_mapa = ruta
         try:
-            self.timer_animacion.stop()
+            self.reiniciar()
+        except Exception as e:
+            print(f"Error: {e}")
+            self.ruta_mapa = ruta_anterior
 
+    def iniciar_beam(self):
+        try:
             inicio, meta, obstaculos = self.extraer_datos_mapa()
             
+            meta = self.metas_busqueda(meta)
             print(f"   Inicio: {inicio}, Meta: {meta}, Obstáculos: {len(obstaculos)}")
             
-            camino = beam_search(self.rows, inicio, meta, obstaculos)
-            
-            if camino:
-                print(f"Camino encontrado con {len(camino)-1} pasos")
-                self.animar_camino(camino)
-            else:
-                print("No se encontró un camino")
+            # En beam search el veneno se puede atravesar con costo 3
+            grid = self.grid.copia()
+            clave = self.cache.clave(grid, inicio, meta, "beam")
+            self.iniciar_busqueda(beam_search_pasos(grid, inicio, meta), "Beam Search", clave)
         except Exception as e:
             print(f"Error: {e}")
 
     def iniciar_dw(self):
         try:
-            self.timer_animacion.stop()
             inicio, meta, obstaculos = self.extraer_datos_mapa()
+            meta = self.metas_busqueda(meta)
             print(f"   Inicio: {inicio}, Meta: {meta}, Obstáculos: {len(obstaculos)}")
             
-            camino = dynamic_weighting_search(self.rows, inicio, meta, obstaculos)
-            
-            if camino:
-                print(f"Camino encontrado con {len(camino)-1} pasos")
-                self.animar_camino(camino)
-            else:
-                print("No se encontró un camino")
+            # En dynamic weighting el veneno es impasable
+            grid = self.grid.con_costo_veneno(IMPASABLE)
+            clave = self.cache.clave(grid, inicio, meta, "dynamic")
+            pasos = dynamic_weighting_search_pasos(grid, inicio, meta, componentes=self.obtener_componentes(grid))
+            self.iniciar_busqueda(pasos, "Dynamic Weighting", clave)
         except Exception as e:
             print(f"Error: {e}")
+
+    def iniciar_jps(self):
+        try:
+            inicio, meta, obstaculos = self.extraer_datos_mapa()
+            print(f"   Inicio: {inicio}, Meta: {meta}, Obstáculos: {len(obstaculos)}")
+
+            # Igual que dynamic weighting: veneno impasable y cada paso cuesta 1
+            grid = self.grid.con_costo_veneno(IMPASABLE)
+            clave = self.cache.clave(grid, inicio, meta, "jps")
+            pasos = jump_point_search_pasos(grid, inicio, meta, componentes=self.obtener_componentes(grid))
+            self.iniciar_busqueda(pasos, "Jump Point Search", clave)
+        except Exception as e:
+            print(f"Error: {e}")
+
+    def iniciar_dstar(self):
+        try:
+            inicio, meta, obstaculos = self.extraer_datos_mapa()
+            print(f"   Inicio: {inicio}, Meta: {meta}, Obstáculos: {len(obstaculos)}")
+
+            # Veneno impasable, como en dynamic weighting
+            grid = self.grid.con_costo_veneno(IMPASABLE)
+            planificador = PlanificadorIncremental(grid, inicio, meta)
+            self.iniciar_busqueda(planificador.planificar_pasos(), "D* Lite")
+            self.planificador = planificador
+            self.camino_actual = []
+        except Exception as e:
+            print(f"Error: {e}")
+
+    def iniciar_flujo(self):
+        try:
+            _, meta, obstaculos = self.extraer_datos_mapa()
+            meta = self.metas_busqueda(meta)
+            print(f"   Hormigas: {len(self.extraer_hormigas())}, Meta: {meta}, Obstáculos: {len(obstaculos)}")
+
+            # Veneno impasable, como en dynamic weighting
+            grid = self.grid.con_costo_veneno(IMPASABLE)
+            self.iniciar_busqueda(flow_field_pasos(grid, meta), "Campo de flujo")
+            self.animar_resultado = self.animar_colonia
+        except Exception as e:
+            print(f"Error: {e}")
+
+    # Índice de componentes del mapa actual (grid: tablero con veneno impasable)
+    def obtener_componentes(self, grid):
+        if self.componentes is None:
+            self.componentes = ComponentesConexas(grid.copia())
+        return self.componentes
+
+    # Clic en el mapa: pone o quita veneno. Con D* Lite activo, replanifica
+    # desde la posición actual de la hormiga y sigue animando el camino nuevo
+    def celda_clicada(self, punto):
+        pos = (int(punto.y() // self.cell_size), int(punto.x() // self.cell_size))
+        if not (0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols):
+            return
+        if self.hilo_busqueda is not None:
+            return
+        if self.grid_data.get(pos) in (CellTypes.ANT, CellTypes.OBJECTIVE):
+            return
+
+        actual = self.posicion_hormiga()
+        if self.planificador is not None and pos == actual:
+            return
+        poner = self.grid_data.get(pos) != CellTypes.OBSTACLE
+        if poner:
+            self.grid_data[pos] = CellTypes.OBSTACLE
+        else:
+            self.grid_data.pop(pos, None)
+        self.grid.cambiar_costo(self.grid.celda(pos), COSTO_VENENO if poner else COSTO_LIBRE)
+        if self.componentes is not None:
+            self.componentes.cambiar_celda(pos, IMPASABLE if poner else COSTO_LIBRE)
+
+        if self.planificador is None:
+            self.pintar_celda(pos, CellTypes.OBSTACLE if poner else CellTypes.EMPTY)
+            return
+
+        self.planificador.move_start(actual)
+        if poner:
+            self.planificador.add_obstacle(pos)
+        else:
+            self.planificador.remove_obstacle(pos)
+        expansiones = self.planificador.expansiones
+        camino = self.planificador.planificar()
+        expansiones = self.planificador.expansiones - expansiones
+
+        if camino:
+            self.lbl_progreso.setText(
+                f"Replanificado con {expansiones} expansiones\nCamino de {len(camino)-1} pasos"
+            )
+            self.animar_camino(camino)
+        else:
+            # La hormiga se queda donde está hasta que un clic vuelva a abrir paso
+            self.detener_animacion()
+            self.camino_actual = [actual]
+            self.indice_animacion = 1
+            if self.ant_item is not None:
+                self.ant_item.setPos(self.posicion_emoji(actual))
+            self.pintar_celda(pos, CellTypes.OBSTACLE if poner else CellTypes.EMPTY)
+            self.lbl_progreso.setText("No se encontró un camino")
+            print("No se encontró un camino")
+
+    # Cambia el color de una sola celda en la imagen del mapa
+    def pintar_celda(self, pos, cell_type):
+        self.temp_grid_data[pos] = cell_type
+        self.imagen_mapa.setPixelColor(pos[1], pos[0], color_map[cell_type])
+        self.mapa_item.setPixmap(QPixmap.fromImage(self.imagen_mapa))
+
+    # Celda donde está la hormiga: la del último paso animado del camino actual
+    def posicion_hormiga(self):
+        if self.camino_actual:
+            return self.camino_actual[max(0, min(self.indice_animacion, len(self.camino_actual)) - 1)]
+        if self.planificador is not None:
+            return self.planificador.inicio
+        return None
+
+    # Ejecuta el generador de búsqueda en un QThread para no congelar la ventana.
+    # Si la consulta (clave) ya está en la caché, se anima el camino guardado
+    def iniciar_busqueda(self, pasos, nombre, clave=None):
+        self.detener_busqueda()
+        self.detener_animacion()
+        self.planificador = None
+
+        if clave is not None:
+            encontrado, camino = self.cache.obtener(clave)
+            if encontrado:
+                pasos.close()
+                print(f"{nombre}: resultado tomado de la caché ({self.cache.aciertos} aciertos)")
+                self.finalizar_busqueda(camino, COMPLETA)
+                return
+        self.clave_busqueda = clave
+
+        self.trabajador = TrabajadorBusqueda(
+            pasos,
+            tiempo_max=self.tiempo_max.value(),
+            max_expansiones=self.max_expansiones.value() * 1000,
+        )
+        self.hilo_busqueda = QThread(self)
+        self.trabajador.moveToThread(self.hilo_busqueda)
+
+        self.hilo_busqueda.started.connect(self.trabajador.ejecutar)
+        self.trabajador.progreso.connect(self.mostrar_progreso)
+        self.trabajador.terminado.connect(self.busqueda_terminada)
+        self.trabajador.terminado.connect(self.hilo_busqueda.quit)
+        self.hilo_busqueda.finished.connect(self.trabajador.deleteLater)
+        self.hilo_busqueda.finished.connect(self.hilo_busqueda.deleteLater)
+
+        self.btn_beam.setEnabled(False)
+        self.btn_dw.setEnabled(False)
+        self.btn_jps.setEnabled(False)
+        self.btn_dstar.setEnabled(False)
+        self.btn_flujo.setEnabled(False)
+        self.btn_cancelar.setEnabled(True)
+        self.lbl_progreso.setText(f"{nombre}: buscando...")
+        self.hilo_busqueda.start()
+
+    def mostrar_progreso(self, progreso):
+        texto = f"Expansiones: {progreso['expansiones']}"
+        if "iteracion" in progreso:
+            texto += f"\nNivel del haz: {progreso['iteracion']}"
+        self.lbl_progreso.setText(texto)
+
+    def cancelar_busqueda(self):
+        if self.trabajador is not None:
+            self.trabajador.cancelar()
+
+    # Cancela la búsqueda en curso (si hay) y espera a que termine el hilo
+    def detener_busqueda(self):
+        if self.hilo_busqueda is None:
+            return
+        self.trabajador.cancelar()
+        self.hilo_busqueda.quit()
+        self.hilo_busqueda.wait()
+        self.finalizar_busqueda(None, CANCELADA)
+
+    def busqueda_terminada(self, camino, estado):
+        # Ignorar el aviso de un trabajador que ya fue detenido
+        if self.trabajador is None or self.sender() is not self.trabajador:
+            return
+        self.finalizar_busqueda(camino, estado)
+
+    def finalizar_busqueda(self, camino, estado):
+        self.hilo_busqueda = None
+        self.trabajador = None
+        # Solo las búsquedas completas tienen un resultado que se pueda repetir
+        if estado == COMPLETA and self.clave_busqueda is not None:
+            self.cache.guardar(self.clave_busqueda, camino)
+        self.clave_busqueda = None
+        animar = self.animar_resultado
+        self.animar_resultado = None
+        self.btn_beam.setEnabled(True)
+        self.btn_dw.setEnabled(True)
+        self.btn_jps.setEnabled(True)
+        self.btn_dstar.setEnabled(True)
+        self.btn_flujo.setEnabled(True)
+        self.btn_cancelar.setEnabled(False)
+
+        if estado != COMPLETA:
+            mensajes = {
+                CANCELADA: "Búsqueda cancelada",
+                SIN_TIEMPO: "Se agotó el tiempo máximo",
+                SIN_EXPANSIONES: "Se agotó el máximo de expansiones",
+            }
+            mensaje = mensajes.get(estado, "La búsqueda falló")
+            self.lbl_progreso.setText(mensaje)
+            print(mensaje)
+        elif animar is not None:
+            animar(camino)
+        elif camino:
+            mensaje = f"Camino de {len(camino)-1} pasos"
+            if len(self.extraer_hongos()) > 1:
+                mensaje += f" hasta el hongo {camino[-1]}"
+            self.lbl_progreso.setText(mensaje)
+            print(mensaje)
+            self.animar_camino(camino)
+        else:
+            self.lbl_progreso.setText("No se encontró un camino")
+            print("No se encontró un camino")
         
     def extraer_datos_mapa(self):
         
@@ -213,9 +584,13 @@ class GridWidget(QWidget):
         
         for pos, cell_type in self.grid_data.items():
             if cell_type == CellTypes.ANT:
-                inicio = pos
+                # Con varias hormigas, las búsquedas de una sola usan la primera
+                if inicio is None:
+                    inicio = pos
             elif cell_type == CellTypes.OBJECTIVE:
-                meta = pos
+                # Con varios hongos, las búsquedas de una sola meta usan el primero
+                if meta is None:
+                    meta = pos
             elif cell_type == CellTypes.OBSTACLE:
                 obstaculos.append(pos)
         
@@ -224,16 +599,90 @@ class GridWidget(QWidget):
         
         return inicio, meta, obstaculos
     
+    # Posiciones de todas las hormigas del mapa, en el orden del archivo
+    def extraer_hormigas(self):
+        return [pos for pos, cell_type in self.grid_data.items() if cell_type == CellTypes.ANT]
+
+    # Posiciones de todos los hongos del mapa, en el orden del archivo
+    def extraer_hongos(self):
+        return [pos for pos, cell_type in self.grid_data.items() if cell_type == CellTypes.OBJECTIVE]
+
+    # Meta de las búsquedas que aceptan varios hongos: la lista si hay más
+    # de uno (terminan en el primero que alcanzan), si no el único
+    def metas_busqueda(self, meta):
+        hongos = self.extraer_hongos()
+        return hongos if len(hongos) > 1 else meta
+
+    # Mueve todas las hormigas un paso por tic siguiendo el campo de flujo
+    def animar_colonia(self, campo):
+        self.detener_animacion()
+        self.campo = campo
+        self.colonia = self.extraer_hormigas()
+        self.camino_actual = []
+
+        self.temp_grid_data = self.grid_data.copy()
+        for pos in self.colonia:
+            self.temp_grid_data[pos] = CellTypes.EMPTY
+        self.redraw_grid()
+
+        self.rastro_item = CapaRastro(self.rows, self.cols, self.cell_size, color_map[CellTypes.ANT])
+        self.rastro_item.setZValue(0.5)
+        self.scene.addItem(self.rastro_item)
+        # Pocas hormigas se dibujan como emojis; una colonia grande, como
+        # puntos en una capa de imagen
+        if len(self.colonia) <= MAX_EMOJIS_COLONIA:
+            self.emojis_colonia = [self.crear_emoji("🐜", pos) for pos in self.colonia]
+        else:
+            self.capa_colonia = CapaRastro(self.rows, self.cols, self.cell_size, COLOR_COLONIA)
+            self.capa_colonia.setZValue(0.9)
+            self.scene.addItem(self.capa_colonia)
+        self.dibujar_colonia(self.colonia, [])
+
+        if self.chk_saltar.isChecked():
+            self.saltar_al_final()
+        else:
+            self.temporizador_colonia.start(self.velocidad_animacion)
+
+    def dibujar_colonia(self, nuevas, anteriores):
+        for pos in nuevas:
+            self.marcar_paso(pos)
+        if self.capa_colonia is not None:
+            for pos in anteriores:
+                self.capa_colonia.borrar(pos)
+            for pos in nuevas:
+                self.capa_colonia.marcar(pos)
+        else:
+            for item, pos in zip(self.emojis_colonia, nuevas):
+                item.setPos(self.posicion_emoji(pos))
+
+    # Un paso de cada hormiga; al quedar todas quietas termina la animación
+    def avanzar_colonia(self):
+        nuevas = self.campo.avanzar(self.colonia)
+        if nuevas == self.colonia:
+            self.colonia_terminada()
+            return
+        self.dibujar_colonia(nuevas, self.colonia)
+        self.colonia = nuevas
+
+    def colonia_terminada(self):
+        self.temporizador_colonia.stop()
+        llegaron = sum(pos in self.campo.metas for pos in self.colonia)
+        destino = "a un hongo" if len(self.campo.metas) > 1 else "al hongo"
+        mensaje = f"{llegaron} de {len(self.colonia)} hormigas llegaron {destino}"
+        self.lbl_progreso.setText(mensaje)
+        print(mensaje)
+        self.campo = None
+
     def animar_camino(self, camino):
         
-        #Anima el recorrido de la hormiga paso a paso
+        #Anima el recorrido de la hormiga con una sola animación de su posición
         
         if not camino:
             print("No hay camino para animar")
             return
         
         # Reiniciar animación
-        self.timer_animacion.stop()
+        self.detener_animacion()
         self.camino_actual = camino
         self.indice_animacion = 0
         
@@ -245,56 +694,92 @@ class GridWidget(QWidget):
                 self.temp_grid_data[pos] = CellTypes.EMPTY
         
         self.redraw_grid()
-        
-        if len(camino) > 0:
-            start_pos = camino[0]
-            self.ant_item = QGraphicsTextItem("🐜")
-            font = QFont()
-            font.setPointSize(int(self.cell_size * 0.8))
-            self.ant_item.setFont(font)
-            self.ant_item.setPos(
-                start_pos[1] * self.cell_size + self.cell_size * 0.1,
-                start_pos[0] * self.cell_size - self.cell_size * 0.2
-            )
-            self.ant_item.setZValue(1)
-            self.scene.addItem(self.ant_item)
+
+        self.rastro_item = CapaRastro(self.rows, self.cols, self.cell_size, color_map[CellTypes.ANT])
+        self.rastro_item.setZValue(0.5)
+        self.scene.addItem(self.rastro_item)
+        self.ant_item = self.crear_emoji("🐜", camino[0])
+
+        # Un fotograma clave por paso, repartidos de forma pareja en la duración
+        pasos = max(1, len(camino) - 1)
+        self.animacion = QPropertyAnimation(self.ant_item, b"pos")
+        self.animacion.setDuration(pasos * self.velocidad_animacion)
+        self.animacion.setStartValue(self.posicion_emoji(camino[0]))
+        for i, pos in enumerate(camino[1:], 1):
+            self.animacion.setKeyValueAt(i / pasos, self.posicion_emoji(pos))
+        if len(camino) == 1:
+            self.animacion.setEndValue(self.posicion_emoji(camino[0]))
+        self.animacion.valueChanged.connect(self.actualizar_animacion)
+        self.animacion.finished.connect(self.animacion_terminada)
         
         # Iniciar animación
-        self.timer_animacion.start(self.velocidad_animacion)
+        if self.chk_saltar.isChecked():
+            self.saltar_al_final()
+        else:
+            self.animacion.start()
 
-    def actualizar_animacion(self):
+    def actualizar_animacion(self, valor=None):
         
-        #Actualizar la posición de la hormiga en cada paso de la animación
+        #Pintar en el rastro las celdas por las que ya pasó la hormiga
         
-        if self.indice_animacion >= len(self.camino_actual):
-            # Animación completada
-            self.timer_animacion.stop()
-            print(f"¡Camino completado en {len(self.camino_actual)-1} pasos!")
+        if self.animacion is None:
             return
+        ultimo = len(self.camino_actual) - 1
+        duracion = max(1, self.animacion.duration())
+        paso_actual = min(ultimo, self.animacion.currentTime() * ultimo // duracion)
         
-        # Obtener posición actual del camino
-        posicion_actual = self.camino_actual[self.indice_animacion]
-        
+        # Puede avanzar más de un paso por cuadro cuando la velocidad es alta
+        while self.indice_animacion <= paso_actual:
+            self.marcar_paso(self.camino_actual[self.indice_animacion])
+            self.indice_animacion += 1
+
+    def marcar_paso(self, posicion_actual):
         if self.temp_grid_data.get(posicion_actual) != CellTypes.OBJECTIVE:
             self.temp_grid_data[posicion_actual] = CellTypes.ANT
-            
-            # Redraw only the current cell
-            row, col = posicion_actual
-            color = color_map[CellTypes.ANT]
-            rect = QGraphicsRectItem(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
-            rect.setBrush(QBrush(color))
-            self.scene.addItem(rect)
-        
-        # Move the ant emoji to the new position
-        if self.ant_item:
-            self.ant_item.setPos(
-                posicion_actual[1] * self.cell_size + self.cell_size * 0.1,
-                posicion_actual[0] * self.cell_size - self.cell_size * 0.2
-            )
-            self.ant_item.setZValue(1)
-        
-        # Avanzar al siguiente paso
-        self.indice_animacion += 1
+            self.rastro_item.marcar(posicion_actual)
+
+    def animacion_terminada(self):
+        while self.indice_animacion < len(self.camino_actual):
+            self.marcar_paso(self.camino_actual[self.indice_animacion])
+            self.indice_animacion += 1
+        self.animacion = None
+        print(f"¡Camino completado en {len(self.camino_actual)-1} pasos!")
+
+    def saltar_al_final(self):
+        if self.campo is not None:
+            while True:
+                nuevas = self.campo.avanzar(self.colonia)
+                if nuevas == self.colonia:
+                    break
+                self.dibujar_colonia(nuevas, self.colonia)
+                self.colonia = nuevas
+            self.colonia_terminada()
+            return
+        if self.animacion is None:
+            return
+        self.animacion.stop()
+        self.ant_item.setPos(self.posicion_emoji(self.camino_actual[-1]))
+        self.animacion_terminada()
+
+    def detener_animacion(self):
+        self.temporizador_colonia.stop()
+        self.campo = None
+        self.emojis_colonia = []
+        self.capa_colonia = None
+        if self.animacion is not None:
+            self.animacion.stop()
+            self.animacion = None
+
+    # Cambia la velocidad sin perder el avance de la animación en curso
+    def cambiar_velocidad(self, ms_por_paso):
+        self.velocidad_animacion = ms_por_paso
+        self.temporizador_colonia.setInterval(ms_por_paso)
+        if self.animacion is None:
+            return
+        avance = self.animacion.currentTime() / max(1, self.animacion.duration())
+        pasos = max(1, len(self.camino_actual) - 1)
+        self.animacion.setDuration(pasos * ms_por_paso)
+        self.animacion.setCurrentTime(int(avance * self.animacion.duration()))
 
         
 
@@ -303,3 +788,8 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("Hormigas vs Venenos")
         self.setCentralWidget(GridWidget())
+
+    # No cerrar la ventana con una búsqueda corriendo en otro hilo
+    def closeEvent(self, event):
+        self.centralWidget().detener_busqueda()
+        super().closeEvent(event)
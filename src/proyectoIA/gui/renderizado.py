@@ -0,0 +1,121 @@
+import math
+import sys
+
+from PySide6.QtCore import QLineF, QRect, QRectF, Qt
+from PySide6.QtGui import QColor, QImage, QPen
+from PySide6.QtWidgets import QGraphicsItem
+
+from .mapa import CellTypes, color_map
+
+# Tamaño mínimo en pantalla (pixeles) de una celda para dibujar sus bordes
+MIN_PIXELES_BORDES = 6
+
+
+# Crea la imagen del mapa: un píxel por celda con el color de color_map.
+# La vista la escala por cell_size, así que el costo no depende del zoom.
+def crear_imagen_mapa(rows, cols, grid_data):
+    # Format_RGB32 guarda cada píxel como un entero 0xffRRGGBB en el orden de bytes nativo
+    colores = {
+        cell_type: color.rgba().to_bytes(4, sys.byteorder)
+        for cell_type, color in color_map.items()
+    }
+    datos = bytearray(colores[CellTypes.EMPTY] * (rows * cols))
+
+    for (row, col), cell_type in grid_data.items():
+        if 0 <= row < rows and 0 <= col < cols:
+            inicio = (row * cols + col) * 4
+            datos[inicio:inicio + 4] = colores[cell_type]
+
+    imagen = QImage(datos, cols, rows, cols * 4, QImage.Format_RGB32)
+    # La copia es dueña de sus datos y no depende del bytearray
+    return imagen.copy()
+
+
+# Celdas visibles (en coordenadas de celda) dentro de un rectángulo de la escena
+def celdas_expuestas(rect, rows, cols, cell_size):
+    primera_col = max(0, int(rect.left() // cell_size))
+    ultima_col = min(cols, math.ceil(rect.right() / cell_size))
+    primera_fila = max(0, int(rect.top() // cell_size))
+    ultima_fila = min(rows, math.ceil(rect.bottom() / cell_size))
+    return primera_fila, ultima_fila, primera_col, ultima_col
+
+
+# Bordes de las celdas, dibujados solo cuando el zoom los hace visibles
+class CapaBordes(QGraphicsItem):
+    def __init__(self, rows, cols, cell_size):
+        super().__init__()
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        # Para recibir en paint() solo el rectángulo que hay que redibujar
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.pen = QPen(QColor(0, 0, 0))
+        self.pen.setCosmetic(True)  # Siempre 1 pixel de ancho, sin importar el zoom
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.cols * self.cell_size, self.rows * self.cell_size)
+
+    def paint(self, painter, option, widget=None):
+        # Nivel de detalle: cuántos pixeles de pantalla mide una unidad de la escena
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if lod * self.cell_size < MIN_PIXELES_BORDES:
+            return
+
+        size = self.cell_size
+        primera_fila, ultima_fila, primera_col, ultima_col = celdas_expuestas(
+            option.exposedRect, self.rows, self.cols, size
+        )
+
+        arriba = primera_fila * size
+        abajo = ultima_fila * size
+        izquierda = primera_col * size
+        derecha = ultima_col * size
+
+        lineas = [QLineF(col * size, arriba, col * size, abajo) for col in range(primera_col, ultima_col + 1)]
+        lineas += [QLineF(izquierda, row * size, derecha, row * size) for row in range(primera_fila, ultima_fila + 1)]
+
+        painter.setPen(self.pen)
+        painter.drawLines(lineas)
+
+
+# Rastro de la hormiga: una imagen transparente de un píxel por celda.
+# Marcar un paso cambia un píxel y repinta solo esa celda, así que el costo
+# por cuadro no crece con el largo del camino.
+class CapaRastro(QGraphicsItem):
+    def __init__(self, rows, cols, cell_size, color):
+        super().__init__()
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.color = color
+        self.imagen = QImage(cols, rows, QImage.Format_ARGB32_Premultiplied)
+        self.imagen.fill(Qt.transparent)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.cols * self.cell_size, self.rows * self.cell_size)
+
+    def marcar(self, pos, color=None):
+        row, col = pos
+        self.imagen.setPixelColor(col, row, self.color if color is None else color)
+        size = self.cell_size
+        self.update(QRectF(col * size, row * size, size, size))
+
+    def borrar(self, pos):
+        self.marcar(pos, QColor(Qt.transparent))
+
+    def paint(self, painter, option, widget=None):
+        size = self.cell_size
+        primera_fila, ultima_fila, primera_col, ultima_col = celdas_expuestas(
+            option.exposedRect, self.rows, self.cols, size
+        )
+        if primera_fila >= ultima_fila or primera_col >= ultima_col:
+            return
+        ancho = ultima_col - primera_col
+        alto = ultima_fila - primera_fila
+        # Copiar solo la parte expuesta de la imagen, escalada a la escena
+        painter.drawImage(
+            QRectF(primera_col * size, primera_fila * size, ancho * size, alto * size),
+            self.imagen,
+            QRect(primera_col, primera_fila, ancho, alto),
+        )
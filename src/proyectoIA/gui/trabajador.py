@@ -0,0 +1,50 @@
+import time
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from ..algorithms.pasos import ejecutar_pasos
+
+# Estado extra cuando la búsqueda lanza una excepción
+ERROR = "error"
+
+
+# Ejecuta un generador de búsqueda (*_pasos) dentro de un QThread
+class TrabajadorBusqueda(QObject):
+    progreso = Signal(object)        # diccionario de progreso del generador
+    terminado = Signal(object, str)  # camino (o None), estado
+
+    # Mínimo de segundos entre dos avisos de progreso a la interfaz
+    intervalo_progreso = 0.05
+
+    def __init__(self, pasos, tiempo_max=None, max_expansiones=None):
+        super().__init__()
+        self.pasos = pasos
+        self.tiempo_max = tiempo_max
+        self.max_expansiones = max_expansiones
+        self._cancelado = False
+        self._ultimo_aviso = 0.0
+
+    # Se llama desde el hilo de la interfaz; el generador lo revisa en cada paso
+    def cancelar(self):
+        self._cancelado = True
+
+    def _avisar(self, progreso):
+        ahora = time.perf_counter()
+        if ahora - self._ultimo_aviso >= self.intervalo_progreso:
+            self._ultimo_aviso = ahora
+            self.progreso.emit(progreso)
+
+    @Slot()
+    def ejecutar(self):
+        try:
+            camino, estado = ejecutar_pasos(
+                self.pasos,
+                tiempo_max=self.tiempo_max,
+                max_expansiones=self.max_expansiones,
+                cancelado=lambda: self._cancelado,
+                al_avanzar=self._avisar,
+            )
+        except Exception as e:
+            print(f"Error: {e}")
+            camino, estado = None, ERROR
+        self.terminado.emit(camino, estado)
@@ -0,0 +1,191 @@
+"""
+Resolución por lotes de mapas desde la línea de comandos.
+
+Recibe directorios o patrones glob de mapas (texto o binario), resuelve
+cada uno con el algoritmo elegido en un pool de procesos y escribe una
+línea JSON por mapa en stdout, a medida que terminan:
+
+    {"mapa": "mapas/a.txt", "algoritmo": "dynamic", "camino": [[0, 0], ...],
+     "costo": 12, "pasos": 12, "tiempo_s": 0.0004, "expansiones": 31, "fin": "meta"}
+
+Un mapa que no se puede resolver (archivo ilegible, sin hormiga o sin
+hongo) produce una línea con "error". No importa PySide6 ni la interfaz,
+así que arranca rápido en servidores sin pantalla.
+
+Uso:
+    proyectoIA mapas/ --algoritmo dynamic --procesos 4
+    proyectoIA "mapas/**/*.txt" --algoritmo beam --opciones '{"beamWidth": 8}'
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from .algorithms.componentes import ComponentesConexas
+from .algorithms.estadisticas import EstadisticasBusqueda
+from .algorithms.grid import IMPASABLE
+from .algorithms.mapa_binario import abrir_mapa
+from .algorithms.paralelo import ALGORITMOS, _obtener_algoritmo
+
+# Algoritmos donde el veneno se atraviesa con su costo; en los demás es impasable
+VENENO_TRANSITABLE = {"beam"}
+# Algoritmos que aceptan una lista de hongos; los demás van al primero
+VARIAS_METAS = {"beam", "dynamic", "bidireccional"}
+
+PATRON_POR_DEFECTO = "*.txt"
+
+
+def buscar_mapas(rutas, patron=PATRON_POR_DEFECTO, recursivo=False):
+    """
+    Archivos de mapa a partir de directorios, archivos o patrones glob, en
+    orden y sin repetir.
+    """
+    encontrados = {}
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            partes = (ruta, "**", patron) if recursivo else (ruta, patron)
+            candidatos = sorted(glob.glob(os.path.join(*partes), recursive=recursivo))
+        elif os.path.isfile(ruta):
+            candidatos = [ruta]
+        else:
+            candidatos = sorted(glob.glob(ruta, recursive=True))
+        for candidato in candidatos:
+            if os.path.isfile(candidato):
+                encontrados.setdefault(candidato, None)
+    return list(encontrados)
+
+
+def costo_camino(grid, camino):
+    # El costo de un movimiento es el costo de la celda a la que se entra
+    costos = grid.costos
+    cols = grid.cols
+    return sum(costos[fila * cols + col] for fila, col in camino[1:])
+
+
+def resolver(grid, inicio, meta, algoritmo="dynamic", opciones=None, componentes=None):
+    """
+    Resuelve una consulta y arma el resultado que se escribe como JSON.
+
+    grid debe tener ya la semántica del veneno del algoritmo (ver
+    VENENO_TRANSITABLE); componentes, si se pasa, es el índice de ese mismo
+    grid y descarta al instante los hongos inalcanzables.
+    """
+    stats = EstadisticasBusqueda()
+    t0 = time.perf_counter()
+    camino = _obtener_algoritmo(algoritmo)(
+        grid, inicio, meta, stats=stats, componentes=componentes, **(opciones or {})
+    )
+    segundos = time.perf_counter() - t0
+    return {
+        "camino": [list(posicion) for posicion in camino] if camino else None,
+        "costo": costo_camino(grid, camino) if camino else None,
+        "pasos": len(camino) - 1 if camino else None,
+        "tiempo_s": segundos,
+        "expansiones": stats.expandidos,
+        "fin": stats.fin,
+    }
+
+
+def resolver_mapa(ruta, algoritmo="dynamic", opciones=None):
+    """
+    Abre un archivo de mapa y lo resuelve. Cualquier error (archivo
+    ilegible, mapa inválido, opciones que el algoritmo no acepta) va en
+    "error" para que un mapa roto no corte el resto del lote.
+    """
+    resultado = {"mapa": ruta, "algoritmo": algoritmo}
+    try:
+        mapa = abrir_mapa(ruta)
+        if mapa.inicio is None or mapa.meta is None:
+            resultado["error"] = "el mapa debe tener una hormiga y un hongo"
+            return resultado
+
+        grid = mapa.grid if algoritmo in VENENO_TRANSITABLE else mapa.grid.con_costo_veneno(IMPASABLE)
+        meta = mapa.hongos if algoritmo in VARIAS_METAS and len(mapa.hongos) > 1 else mapa.meta
+        # El índice cuesta una pasada por el tablero; sin él, un hongo encerrado
+        # hace que la búsqueda recorra todo lo alcanzable antes de rendirse
+        componentes = ComponentesConexas(grid)
+        resultado.update(resolver(grid, mapa.inicio, meta, algoritmo, opciones, componentes))
+    except Exception as error:  # noqa: BLE001 - el lote sigue con los demás mapas
+        resultado["error"] = f"{type(error).__name__}: {error}"
+    return resultado
+
+
+def _resolver_tarea(tarea):
+    return resolver_mapa(*tarea)
+
+
+def resolver_mapas(rutas, algoritmo="dynamic", opciones=None, procesos=None, ordenado=False):
+    """
+    Resuelve muchos archivos de mapa en un pool de procesos.
+
+    Args:
+        rutas: lista de archivos de mapa
+        algoritmo: nombre en paralelo.ALGORITMOS
+        opciones: dict con argumentos extra para el algoritmo
+        procesos: cantidad de procesos (por defecto, uno por núcleo). Con 1
+            se resuelve todo en el proceso actual
+        ordenado: si es True, los resultados salen en el orden de rutas; si
+            no, a medida que terminan
+
+    Yields:
+        el resultado (dict) de cada mapa
+    """
+    tareas = [(ruta, algoritmo, opciones) for ruta in rutas]
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    procesos = min(procesos, len(tareas))
+    if procesos <= 1:
+        for tarea in tareas:
+            yield _resolver_tarea(tarea)
+        return
+
+    with Pool(procesos) as pool:
+        mapear = pool.imap if ordenado else pool.imap_unordered
+        yield from mapear(_resolver_tarea, tareas)
+
+
+def _leer_opciones(texto):
+    try:
+        opciones = json.loads(texto)
+    except json.JSONDecodeError as error:
+        raise argparse.ArgumentTypeError(f"--opciones no es JSON válido: {error}") from None
+    if not isinstance(opciones, dict):
+        raise argparse.ArgumentTypeError("--opciones debe ser un objeto JSON")
+    return opciones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="proyectoIA",
+        description="Resuelve archivos de mapa en lote y escribe un resultado JSON por línea",
+    )
+    parser.add_argument("rutas", nargs="+", help="directorios, archivos o patrones glob de mapas")
+    parser.add_argument("--algoritmo", choices=sorted(ALGORITMOS), default="dynamic")
+    parser.add_argument("--opciones", type=_leer_opciones, default={},
+                        help='argumentos extra del algoritmo en JSON, p. ej. \'{"epsilon": 1}\'')
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="procesos del pool (por defecto, uno por núcleo)")
+    parser.add_argument("--patron", default=PATRON_POR_DEFECTO,
+                        help="archivos que se toman de cada directorio")
+    parser.add_argument("--recursivo", action="store_true", help="buscar también en subdirectorios")
+    parser.add_argument("--ordenado", action="store_true",
+                        help="escribir los resultados en el orden de los archivos")
+    args = parser.parse_args(argv)
+
+    rutas = buscar_mapas(args.rutas, args.patron, args.recursivo)
+    if not rutas:
+        parser.error("no se encontraron mapas")
+
+    errores = 0
+    for resultado in resolver_mapas(rutas, args.algoritmo, args.opciones, args.procesos, args.ordenado):
+        errores += "error" in resultado
+        sys.stdout.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+Servicio local de búsqueda de caminos (HTTP/JSON sobre asyncio), sin
+PySide6:
+
+    servidor    ServicioBusqueda y el comando proyectoIA-servicio
+    trabajador  lo que corre en los procesos del pool
+    metricas    histogramas de latencia
+    cliente     ClienteServicio y el generador de carga
+"""
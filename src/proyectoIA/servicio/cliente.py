@@ -0,0 +1,247 @@
+"""
+Cliente asyncio del servicio de búsqueda y generador de carga.
+
+ClienteServicio mantiene una conexión HTTP/1.1 abierta (TCP o socket Unix)
+y manda pedidos JSON de a uno. El generador de carga abre varias
+conexiones, registra mapas generados con semilla y lanza consultas al
+azar; una fracción repite consultas ya hechas para que el servicio las
+agrupe. Al final muestra las latencias vistas por el cliente y las
+métricas del servicio.
+
+Con --local levanta el servicio en el mismo proceso sobre un socket Unix
+temporal, así que se prueba sin red:
+
+    python -m proyectoIA.servicio.cliente --local --consultas 2000 --concurrencia 32
+    python -m proyectoIA.servicio.cliente --puerto 8765 --algoritmos dynamic beam
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import tempfile
+import time
+
+from ..algorithms.archivo_mapa import guardar_mapa
+from ..algorithms.grid import COSTO_LIBRE
+from ..benchmarks.generador import generar_mapa
+from .metricas import Histograma
+from .servidor import ServicioBusqueda
+
+
+class ErrorRespuesta(Exception):
+    """El servicio respondió con un estado distinto de 200."""
+
+    def __init__(self, estado, respuesta):
+        self.estado = estado
+        self.respuesta = respuesta
+        super().__init__(f"{estado}: {respuesta.get('error', respuesta)}")
+
+
+class ClienteServicio:
+    """
+    Conexión a un servicio de búsqueda. Los pedidos de una misma conexión
+    van de a uno; para pedidos en paralelo se usan varios clientes.
+
+    Args:
+        host, puerto: dirección TCP del servicio
+        socket: ruta del socket Unix (en lugar de host y puerto)
+    """
+
+    def __init__(self, host="127.0.0.1", puerto=8765, socket=None):
+        self.host = host
+        self.puerto = puerto
+        self.socket = socket
+        self._reader = None
+        self._writer = None
+
+    async def __aenter__(self):
+        await self.conectar()
+        return self
+
+    async def __aexit__(self, *_):
+        await self.cerrar()
+
+    async def conectar(self):
+        if self.socket is not None:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.socket)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.puerto)
+
+    async def cerrar(self):
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = None
+
+    async def pedir(self, metodo, ruta, datos=None):
+        """Manda un pedido y retorna la respuesta JSON; lanza ErrorRespuesta si no es 200."""
+        if self._writer is None:
+            await self.conectar()
+        cuerpo = b"" if datos is None else json.dumps(datos).encode()
+        self._writer.write(
+            f"{metodo} {ruta} HTTP/1.1\r\nHost: proyectoIA\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(cuerpo)}\r\n\r\n".encode("latin-1")
+            + cuerpo
+        )
+        await self._writer.drain()
+
+        linea = await self._reader.readline()
+        if not linea:
+            raise ConnectionError("el servicio cerró la conexión")
+        estado = int(linea.split()[1])
+        largo = 0
+        cerrar = False
+        while True:
+            linea = await self._reader.readline()
+            if linea in (b"\r\n", b"\n", b""):
+                break
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            nombre = nombre.strip().lower()
+            if nombre == "content-length":
+                largo = int(valor)
+            elif nombre == "connection" and valor.strip().lower() == "close":
+                cerrar = True
+        respuesta = json.loads(await self._reader.readexactly(largo)) if largo else {}
+        if cerrar:
+            await self.cerrar()
+        if estado != 200:
+            raise ErrorRespuesta(estado, respuesta)
+        return respuesta
+
+    async def registrar_mapa(self, mapa):
+        """Registra un Mapa (se manda en formato de texto); retorna la descripción con su id."""
+        texto = io.StringIO()
+        guardar_mapa(mapa, texto)
+        return await self.pedir("POST", "/mapas", {"texto": texto.getvalue()})
+
+    async def buscar(self, mapa, algoritmo="dynamic", inicio=None, meta=None, **opciones):
+        datos = {"mapa": mapa, "algoritmo": algoritmo}
+        if inicio is not None:
+            datos["inicio"] = list(inicio)
+        if meta is not None:
+            datos["meta"] = list(meta)
+        if opciones:
+            datos["opciones"] = opciones
+        return await self.pedir("POST", "/buscar", datos)
+
+    async def metricas(self):
+        return await self.pedir("GET", "/metricas")
+
+
+async def generar_carga(conexion, mapas=4, tamano=200, tipo="laberinto", consultas=1000,
+                        concurrencia=16, repetidas=0.3, algoritmos=("dynamic", "beam"), semilla=0):
+    """
+    Registra `mapas` mapas y lanza `consultas` búsquedas con `concurrencia`
+    conexiones. Una fracción `repetidas` de las consultas repite una
+    anterior.
+
+    Args:
+        conexion: dict con host/puerto o socket para ClienteServicio
+
+    Returns:
+        (histograma de latencias del cliente, errores, segundos, métricas del servicio)
+    """
+    azar = random.Random(semilla)
+    async with ClienteServicio(**conexion) as cliente:
+        registrados = []
+        for numero in range(mapas):
+            mapa = generar_mapa(tamano, densidad=0.3, tipo=tipo, semilla=semilla + numero)
+            libres = [celda for celda, costo in enumerate(mapa.grid.costos) if costo == COSTO_LIBRE]
+            registrados.append(((await cliente.registrar_mapa(mapa))["id"], mapa.grid, libres))
+
+    pedidos = []
+    for _ in range(consultas):
+        if pedidos and azar.random() < repetidas:
+            pedidos.append(azar.choice(pedidos))
+            continue
+        id_mapa, grid, libres = azar.choice(registrados)
+        pedidos.append((
+            id_mapa, azar.choice(algoritmos),
+            grid.posicion(azar.choice(libres)), grid.posicion(azar.choice(libres)),
+        ))
+
+    histograma = Histograma()
+    errores = []
+    cola = asyncio.Queue()
+    for pedido in pedidos:
+        cola.put_nowait(pedido)
+
+    async def trabajar():
+        async with ClienteServicio(**conexion) as cliente:
+            while not cola.empty():
+                id_mapa, algoritmo, inicio, meta = cola.get_nowait()
+                t0 = time.perf_counter()
+                try:
+                    await cliente.buscar(id_mapa, algoritmo, inicio, meta)
+                except ErrorRespuesta as error:
+                    errores.append(str(error))
+                histograma.registrar(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(trabajar() for _ in range(concurrencia)))
+    segundos = time.perf_counter() - t0
+    async with ClienteServicio(**conexion) as cliente:
+        metricas = await cliente.metricas()
+    return histograma, errores, segundos, metricas
+
+
+def _imprimir(histograma, errores, segundos, metricas):
+    print(f"{histograma.total} consultas en {segundos:.2f} s ({histograma.total / segundos:.0f}/s), "
+          f"{len(errores)} errores")
+    resumen = histograma.como_dict()
+    print(f"cliente: p50 {resumen['p50_ms']:.1f} ms  p90 {resumen['p90_ms']:.1f} ms  "
+          f"p99 {resumen['p99_ms']:.1f} ms  máx {resumen['max_ms']:.1f} ms")
+    print(f"servicio: {metricas['consultas']} consultas, {metricas['coalescidas']} agrupadas")
+    for nombre, latencias in metricas["latencias"].items():
+        print(f"  {nombre:<22} n={latencias['total']:<6} p50 {latencias['p50_ms']:.1f} ms  "
+              f"p99 {latencias['p99_ms']:.1f} ms  máx {latencias['max_ms']:.1f} ms")
+    for error in errores[:5]:
+        print(f"  error: {error}")
+
+
+async def _principal(args):
+    parametros = dict(
+        mapas=args.mapas, tamano=args.tamano, tipo=args.tipo, consultas=args.consultas,
+        concurrencia=args.concurrencia, repetidas=args.repetidas, algoritmos=args.algoritmos,
+        semilla=args.semilla,
+    )
+    if not args.local:
+        conexion = {"socket": args.socket} if args.socket else {"host": args.host, "puerto": args.puerto}
+        _imprimir(*await generar_carga(conexion, **parametros))
+        return
+
+    servicio = ServicioBusqueda(args.procesos)
+    with tempfile.TemporaryDirectory() as directorio:
+        socket = os.path.join(directorio, "servicio.sock")
+        try:
+            await servicio.servir(socket=socket)
+            _imprimir(*await generar_carga({"socket": socket}, **parametros))
+        finally:
+            await servicio.detener()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generador de carga para el servicio de búsqueda")
+    parser.add_argument("--local", action="store_true",
+                        help="levantar el servicio en este proceso, sobre un socket Unix temporal")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--socket", help="socket Unix del servicio")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos del servicio local")
+    parser.add_argument("--mapas", type=int, default=4)
+    parser.add_argument("--tamano", type=int, default=200)
+    parser.add_argument("--tipo", choices=("abierto", "laberinto"), default="laberinto")
+    parser.add_argument("--consultas", type=int, default=1000)
+    parser.add_argument("--concurrencia", type=int, default=16)
+    parser.add_argument("--repetidas", type=float, default=0.3,
+                        help="fracción de consultas que repiten una anterior")
+    parser.add_argument("--algoritmos", nargs="+", default=["dynamic", "beam"])
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+    asyncio.run(_principal(args))
+
+
+if __name__ == "__main__":
+    main()
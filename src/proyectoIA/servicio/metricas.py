@@ -0,0 +1,63 @@
+"""
+Histogramas de latencia con cubetas fijas.
+
+Registrar es O(log cubetas) y la memoria no crece con la cantidad de
+pedidos; los percentiles se estiman con el límite superior de la cubeta
+donde caen, así que son exactos hasta la resolución de las cubetas.
+"""
+from bisect import bisect_left
+
+# Límites superiores de las cubetas, en milisegundos (la última es +Inf)
+LIMITES_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class Histograma:
+    """
+    Cantidad de mediciones por cubeta de latencia.
+
+    Args:
+        limites: límites superiores de las cubetas en ms, en orden creciente
+    """
+
+    def __init__(self, limites=LIMITES_MS):
+        self.limites = tuple(limites)
+        self.cuentas = [0] * (len(self.limites) + 1)
+        self.total = 0
+        self.suma_ms = 0.0
+        self.maximo_ms = 0.0
+
+    def __repr__(self):
+        return f"Histograma(total={self.total}, p50={self.percentil(0.5)}, p99={self.percentil(0.99)})"
+
+    def registrar(self, segundos):
+        ms = segundos * 1000
+        self.cuentas[bisect_left(self.limites, ms)] += 1
+        self.total += 1
+        self.suma_ms += ms
+        if ms > self.maximo_ms:
+            self.maximo_ms = ms
+
+    def percentil(self, p):
+        """Límite superior (ms) de la cubeta del percentil p (0 a 1), o None sin datos."""
+        if not self.total:
+            return None
+        objetivo = p * self.total
+        acumulado = 0
+        for limite, cuenta in zip(self.limites, self.cuentas):
+            acumulado += cuenta
+            if acumulado >= objetivo:
+                return min(limite, self.maximo_ms)
+        return self.maximo_ms
+
+    def como_dict(self):
+        cubetas = [{"le": limite, "cuenta": cuenta} for limite, cuenta in zip(self.limites, self.cuentas)]
+        cubetas.append({"le": "+Inf", "cuenta": self.cuentas[-1]})
+        return {
+            "total": self.total,
+            "media_ms": self.suma_ms / self.total if self.total else None,
+            "p50_ms": self.percentil(0.5),
+            "p90_ms": self.percentil(0.9),
+            "p99_ms": self.percentil(0.99),
+            "max_ms": self.maximo_ms if self.total else None,
+            "cubetas": cubetas,
+        }
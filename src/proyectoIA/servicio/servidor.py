@@ -0,0 +1,429 @@
+"""
+Servicio HTTP/JSON de búsqueda de caminos, sobre asyncio y sin
+dependencias externas (ni PySide6).
+
+Los mapas se registran una vez y quedan en memoria compartida, con un id
+que sale de la huella del tablero y de sus posiciones; las búsquedas se resuelven en un pool de
+procesos que abre esos bloques sin copiarlos por consulta. Dos consultas
+idénticas que llegan mientras la primera se está resolviendo comparten el
+mismo resultado (la segunda no vuelve a buscar). Las latencias se guardan
+en histogramas por ruta y por algoritmo.
+
+Rutas:
+
+    POST   /mapas        {"texto": contenido de un mapa.txt} o {"ruta": archivo del servidor}
+                         -> {"id", "filas", "columnas", "inicio", "meta", "hongos", "errores"}
+    GET    /mapas        -> {"mapas": [ids]}
+    DELETE /mapas/<id>
+    POST   /buscar       {"mapa": id, "algoritmo": "dynamic", "inicio": [f, c],
+                          "meta": [f, c] o [[f, c], ...], "opciones": {...}}
+                         -> resultado de lotes.resolver ("camino", "costo", "tiempo_s", ...)
+    GET    /metricas     -> histogramas de latencia y contadores
+    GET    /salud        -> {"ok": true}
+
+inicio y meta son opcionales: por defecto se usan los del mapa (todos sus
+hongos, con los algoritmos que aceptan varios).
+
+Uso:
+    python -m proyectoIA.servicio.servidor --puerto 8765 --procesos 4
+    python -m proyectoIA.servicio.servidor --socket /tmp/proyectoIA.sock
+"""
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from multiprocessing import shared_memory
+from urllib.parse import urlsplit
+
+from ..algorithms.archivo_mapa import leer_lineas
+from ..algorithms.mapa_binario import abrir_mapa
+from ..lotes import VARIAS_METAS
+from .metricas import Histograma
+from .trabajador import resolver_en_trabajador
+
+logger = logging.getLogger(__name__)
+
+# Algoritmos que se pueden pedir por defecto
+ALGORITMOS_SERVICIO = ("dynamic", "beam", "bidireccional", "jps", "hpa")
+
+# Tamaño máximo del cuerpo de un pedido (un mapa de texto grande entra)
+MAX_CUERPO = 64 * 1024 * 1024
+
+
+class ErrorServicio(Exception):
+    """Error que se responde al cliente con el estado HTTP `estado`."""
+
+    def __init__(self, estado, mensaje):
+        self.estado = estado
+        super().__init__(mensaje)
+
+
+class MapaCompartido:
+    """Mapa registrado: costos en un bloque de memoria compartida y sus posiciones."""
+
+    def __init__(self, id_mapa, mapa):
+        self.id = id_mapa
+        self.rows = mapa.rows
+        self.cols = mapa.cols
+        self.inicio = mapa.inicio
+        self.meta = mapa.meta
+        self.hongos = list(mapa.hongos)
+        self.memoria = shared_memory.SharedMemory(create=True, size=max(1, len(mapa.grid)))
+        self.memoria.buf[: len(mapa.grid)] = mapa.grid.costos
+
+    def descripcion(self):
+        return {
+            "id": self.id,
+            "filas": self.rows,
+            "columnas": self.cols,
+            "inicio": self.inicio,
+            "meta": self.meta,
+            "hongos": self.hongos,
+        }
+
+    def cerrar(self):
+        self.memoria.close()
+        self.memoria.unlink()
+
+
+def _posicion(valor, nombre):
+    if (not isinstance(valor, (list, tuple)) or len(valor) != 2
+            or not all(isinstance(x, int) for x in valor)):
+        raise ErrorServicio(HTTPStatus.BAD_REQUEST, f"{nombre} debe ser [fila, columna]")
+    return tuple(valor)
+
+
+class ServicioBusqueda:
+    """
+    Estado del servicio: mapas registrados, pool de procesos, consultas en
+    curso y métricas.
+
+    Args:
+        procesos: procesos del pool (por defecto, uno por núcleo)
+        max_mapas: mapas en memoria; al pasarse se descarta el menos usado
+        algoritmos: nombres de paralelo.ALGORITMOS que se aceptan
+    """
+
+    def __init__(self, procesos=None, max_mapas=64, algoritmos=ALGORITMOS_SERVICIO):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.max_mapas = max_mapas
+        self.algoritmos = tuple(algoritmos)
+        self.mapas = OrderedDict()
+        # Clave de la consulta -> futuro del resultado, mientras se resuelve
+        self.en_curso = {}
+        self.latencias = {}
+        self.consultas = 0
+        self.coalescidas = 0
+        self._pool = None
+        self._servidor = None
+        # Tareas de las conexiones abiertas, para esperarlas al detener
+        self._conexiones = set()
+
+    def __repr__(self):
+        return (
+            f"ServicioBusqueda(procesos={self.procesos}, mapas={len(self.mapas)}, "
+            f"en_curso={len(self.en_curso)})"
+        )
+
+    def iniciar_pool(self):
+        if self._pool is None:
+            # spawn: los trabajadores no heredan el estado del bucle de eventos
+            self._pool = ProcessPoolExecutor(
+                self.procesos, mp_context=multiprocessing.get_context("spawn")
+            )
+
+    def cerrar(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        for mapa in self.mapas.values():
+            mapa.cerrar()
+        self.mapas.clear()
+
+    async def detener(self, espera=5.0):
+        """Deja de aceptar conexiones, espera las abiertas y cierra el pool y los mapas."""
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+        if self._conexiones:
+            _, pendientes = await asyncio.wait(list(self._conexiones), timeout=espera)
+            for tarea in pendientes:
+                tarea.cancel()
+        self.cerrar()
+
+    # Mapas
+
+    def registrar_mapa(self, datos):
+        if "texto" in datos:
+            if not isinstance(datos["texto"], str):
+                raise ErrorServicio(HTTPStatus.BAD_REQUEST, "texto debe ser el contenido del mapa")
+            mapa = leer_lineas(datos["texto"].splitlines())
+        elif "ruta" in datos:
+            try:
+                mapa = abrir_mapa(datos["ruta"])
+            except (OSError, ValueError) as error:
+                raise ErrorServicio(HTTPStatus.BAD_REQUEST, str(error)) from None
+        else:
+            raise ErrorServicio(HTTPStatus.BAD_REQUEST, "falta texto o ruta")
+
+        firma = f"{mapa.grid.huella()}|{mapa.hormigas}|{mapa.hongos}"
+        id_mapa = hashlib.blake2b(firma.encode(), digest_size=12).hexdigest()
+        compartido = self.mapas.get(id_mapa)
+        if compartido is None:
+            compartido = MapaCompartido(id_mapa, mapa)
+            self.mapas[id_mapa] = compartido
+            logger.info("Mapa %s registrado: %r", id_mapa, mapa)
+            if len(self.mapas) > self.max_mapas:
+                _, viejo = self.mapas.popitem(last=False)
+                viejo.cerrar()
+        self.mapas.move_to_end(id_mapa)
+        return dict(compartido.descripcion(), errores=[str(error) for error in mapa.errores])
+
+    def borrar_mapa(self, id_mapa):
+        mapa = self.mapas.pop(id_mapa, None)
+        if mapa is None:
+            raise ErrorServicio(HTTPStatus.NOT_FOUND, f"mapa desconocido: {id_mapa}")
+        mapa.cerrar()
+        return {"borrado": id_mapa}
+
+    def _mapa(self, id_mapa):
+        mapa = self.mapas.get(id_mapa)
+        if mapa is None:
+            raise ErrorServicio(HTTPStatus.NOT_FOUND, f"mapa desconocido: {id_mapa}")
+        self.mapas.move_to_end(id_mapa)
+        return mapa
+
+    # Búsquedas
+
+    def _latencia(self, nombre):
+        histograma = self.latencias.get(nombre)
+        if histograma is None:
+            histograma = self.latencias[nombre] = Histograma()
+        return histograma
+
+    async def buscar(self, datos):
+        """Resuelve una consulta en el pool, compartiendo el resultado de una idéntica en curso."""
+        t0 = time.perf_counter()
+        mapa = self._mapa(datos.get("mapa"))
+        algoritmo = datos.get("algoritmo", "dynamic")
+        if algoritmo not in self.algoritmos:
+            raise ErrorServicio(
+                HTTPStatus.BAD_REQUEST,
+                f"algoritmo desconocido: {algoritmo!r} (opciones: {', '.join(self.algoritmos)})",
+            )
+        opciones = datos.get("opciones") or {}
+        if not isinstance(opciones, dict):
+            raise ErrorServicio(HTTPStatus.BAD_REQUEST, "opciones debe ser un objeto")
+
+        inicio = _posicion(datos["inicio"], "inicio") if "inicio" in datos else mapa.inicio
+        if "meta" in datos:
+            meta = datos["meta"]
+            if isinstance(meta, list) and meta and isinstance(meta[0], list):
+                meta = [_posicion(posicion, "meta") for posicion in meta]
+            else:
+                meta = _posicion(meta, "meta")
+        elif algoritmo in VARIAS_METAS and len(mapa.hongos) > 1:
+            meta = mapa.hongos
+        else:
+            meta = mapa.meta
+        if inicio is None or meta is None:
+            raise ErrorServicio(
+                HTTPStatus.BAD_REQUEST, "el mapa no tiene hormiga u hongo; indique inicio y meta"
+            )
+        for posicion in [inicio] + (meta if isinstance(meta, list) else [meta]):
+            if not (0 <= posicion[0] < mapa.rows and 0 <= posicion[1] < mapa.cols):
+                raise ErrorServicio(HTTPStatus.BAD_REQUEST, f"{list(posicion)} está fuera del tablero")
+
+        self.consultas += 1
+        clave = (mapa.id, inicio, json.dumps(meta), algoritmo, json.dumps(opciones, sort_keys=True))
+        futuro = self.en_curso.get(clave)
+        coalescida = futuro is not None
+        if coalescida:
+            self.coalescidas += 1
+        else:
+            self.iniciar_pool()
+            futuro = asyncio.get_running_loop().run_in_executor(
+                self._pool, resolver_en_trabajador,
+                mapa.memoria.name, mapa.rows, mapa.cols, inicio, meta, algoritmo, opciones,
+            )
+            self.en_curso[clave] = futuro
+            futuro.add_done_callback(lambda _: self.en_curso.pop(clave, None))
+
+        try:
+            # shield: si este cliente se va, las consultas que comparten el
+            # futuro siguen esperándolo
+            resultado = await asyncio.shield(futuro)
+        except (TypeError, ValueError) as error:
+            raise ErrorServicio(HTTPStatus.BAD_REQUEST, str(error)) from None
+        except FileNotFoundError:
+            raise ErrorServicio(HTTPStatus.NOT_FOUND, f"el mapa {mapa.id} se descartó") from None
+
+        self._latencia(f"buscar:{algoritmo}").registrar(time.perf_counter() - t0)
+        if not coalescida:
+            self._latencia(f"trabajo:{algoritmo}").registrar(resultado["tiempo_s"])
+        return dict(resultado, mapa=mapa.id, algoritmo=algoritmo, coalescida=coalescida)
+
+    def metricas(self):
+        return {
+            "consultas": self.consultas,
+            "coalescidas": self.coalescidas,
+            "en_curso": len(self.en_curso),
+            "mapas": len(self.mapas),
+            "procesos": self.procesos,
+            "latencias": {
+                nombre: histograma.como_dict() for nombre, histograma in sorted(self.latencias.items())
+            },
+        }
+
+    # HTTP
+
+    async def despachar(self, metodo, objetivo, cuerpo):
+        """Retorna (estado, respuesta) de un pedido."""
+        ruta = urlsplit(objetivo).path.rstrip("/") or "/"
+        try:
+            try:
+                datos = json.loads(cuerpo) if cuerpo else {}
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                raise ErrorServicio(HTTPStatus.BAD_REQUEST, "el cuerpo no es JSON válido") from None
+            if not isinstance(datos, dict):
+                raise ErrorServicio(HTTPStatus.BAD_REQUEST, "el cuerpo debe ser un objeto JSON")
+
+            if ruta == "/buscar" and metodo == "POST":
+                return HTTPStatus.OK, await self.buscar(datos)
+            if ruta == "/mapas" and metodo == "POST":
+                return HTTPStatus.OK, self.registrar_mapa(datos)
+            if ruta == "/mapas" and metodo == "GET":
+                return HTTPStatus.OK, {"mapas": list(self.mapas)}
+            if ruta.startswith("/mapas/") and metodo == "DELETE":
+                return HTTPStatus.OK, self.borrar_mapa(ruta[len("/mapas/"):])
+            if ruta == "/metricas" and metodo == "GET":
+                return HTTPStatus.OK, self.metricas()
+            if ruta == "/salud" and metodo == "GET":
+                return HTTPStatus.OK, {"ok": True}
+            if ruta in ("/buscar", "/mapas", "/metricas", "/salud") or ruta.startswith("/mapas/"):
+                raise ErrorServicio(HTTPStatus.METHOD_NOT_ALLOWED, f"{metodo} no se acepta en {ruta}")
+            raise ErrorServicio(HTTPStatus.NOT_FOUND, f"ruta desconocida: {ruta}")
+        except ErrorServicio as error:
+            return error.estado, {"error": str(error)}
+        except Exception as error:  # noqa: BLE001 - el servidor sigue atendiendo
+            logger.exception("Error al atender %s %s", metodo, ruta)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(error).__name__}: {error}"}
+
+    async def atender(self, reader, writer):
+        """Atiende una conexión HTTP/1.1 (con keep-alive) hasta que se cierra."""
+        tarea = asyncio.current_task()
+        self._conexiones.add(tarea)
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                try:
+                    metodo, objetivo, version = linea.decode("latin-1").split()
+                except ValueError:
+                    await _responder(writer, HTTPStatus.BAD_REQUEST, {"error": "pedido inválido"}, False)
+                    break
+
+                encabezados = {}
+                while True:
+                    linea = await reader.readline()
+                    if linea in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = linea.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+                try:
+                    largo = int(encabezados.get("content-length") or 0)
+                except ValueError:
+                    largo = -1
+                if not 0 <= largo <= MAX_CUERPO:
+                    await _responder(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                     {"error": "Content-Length inválido o demasiado grande"}, False)
+                    break
+                cuerpo = await reader.readexactly(largo) if largo else b""
+
+                seguir = version == "HTTP/1.1" and encabezados.get("connection", "").lower() != "close"
+                t0 = time.perf_counter()
+                estado, respuesta = await self.despachar(metodo, objetivo, cuerpo)
+                ruta = urlsplit(objetivo).path
+                if ruta.startswith("/mapas/"):
+                    ruta = "/mapas/{id}"
+                self._latencia(f"{metodo} {ruta}").registrar(time.perf_counter() - t0)
+                await _responder(writer, estado, respuesta, seguir)
+                if not seguir:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+            self._conexiones.discard(tarea)
+
+    async def servir(self, host="127.0.0.1", puerto=8765, socket=None):
+        """Abre el servidor (TCP o socket Unix) y retorna el asyncio.Server."""
+        self.iniciar_pool()
+        if socket is not None:
+            self._servidor = await asyncio.start_unix_server(self.atender, path=socket)
+        else:
+            self._servidor = await asyncio.start_server(self.atender, host, puerto)
+        direcciones = [str(s.getsockname()) for s in self._servidor.sockets]
+        logger.info("Servicio escuchando en %s con %d procesos", ", ".join(direcciones), self.procesos)
+        return self._servidor
+
+
+async def _responder(writer, estado, respuesta, seguir):
+    cuerpo = json.dumps(respuesta, ensure_ascii=False).encode()
+    estado = HTTPStatus(estado)
+    writer.write(
+        f"HTTP/1.1 {estado.value} {estado.phrase}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(cuerpo)}\r\n"
+        f"Connection: {'keep-alive' if seguir else 'close'}\r\n\r\n".encode("latin-1")
+        + cuerpo
+    )
+    await writer.drain()
+
+
+async def _principal(args):
+    servicio = ServicioBusqueda(args.procesos, args.max_mapas)
+    fin = asyncio.Event()
+    bucle = asyncio.get_running_loop()
+    for senal in (signal.SIGINT, signal.SIGTERM):
+        # Sin manejadores de señales (Windows) Ctrl-C llega como KeyboardInterrupt
+        with contextlib.suppress(NotImplementedError):
+            bucle.add_signal_handler(senal, fin.set)
+    try:
+        await servicio.servir(args.host, args.puerto, args.socket)
+        await fin.wait()
+        logger.info("Deteniendo el servicio")
+    finally:
+        await servicio.detener()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON de búsqueda de caminos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--socket", help="socket Unix donde escuchar (en lugar de TCP)")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="procesos del pool (por defecto, uno por núcleo)")
+    parser.add_argument("--max-mapas", type=int, default=64, help="mapas que se guardan en memoria")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_principal(args))
+
+
+if __name__ == "__main__":
+    main()
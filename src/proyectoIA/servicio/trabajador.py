@@ -0,0 +1,67 @@
+"""
+Lado de los procesos del pool del servicio.
+
+Cada mapa registrado vive en un bloque de memoria compartida; el proceso
+trabajador lo abre la primera vez que una consulta lo usa y guarda su Grid
+(y la copia con veneno impasable, si el algoritmo la necesita) en una caché
+LRU propia, junto con su índice de componentes conexas para descartar al
+instante los hongos inalcanzables. Por consulta solo viajan el nombre del
+bloque y las coordenadas.
+"""
+from collections import OrderedDict
+from multiprocessing import shared_memory, util
+
+from ..algorithms.componentes import ComponentesConexas
+from ..algorithms.grid import IMPASABLE, Grid
+from ..lotes import VENENO_TRANSITABLE, resolver
+
+# Tableros abiertos por proceso
+CAPACIDAD = 16
+
+# (nombre del bloque, veneno transitable) -> (memoria, Grid, ComponentesConexas)
+_grids = OrderedDict()
+
+
+def _soltar(memoria, grid, componentes):
+    if memoria is not None:
+        # La vista sobre el bloque debe soltarse antes de cerrarlo
+        grid.costos.release()
+        memoria.close()
+
+
+def _soltar_todos():
+    while _grids:
+        _soltar(*_grids.popitem()[1])
+
+
+# Al salir del proceso; si no, SharedMemory.__del__ falla con las vistas abiertas
+util.Finalize(None, _soltar_todos, exitpriority=10)
+
+
+def _grid(nombre, rows, cols, veneno_transitable):
+    clave = (nombre, veneno_transitable)
+    entrada = _grids.get(clave)
+    if entrada is not None:
+        _grids.move_to_end(clave)
+        return entrada[1:]
+
+    memoria = shared_memory.SharedMemory(name=nombre)
+    vista = memoria.buf[: rows * cols]
+    grid = Grid(rows, cols, vista)
+    if not veneno_transitable:
+        # La copia con veneno impasable no necesita el bloque
+        grid = grid.con_costo_veneno(IMPASABLE)
+        vista.release()
+        memoria.close()
+        memoria = None
+    componentes = ComponentesConexas(grid)
+    _grids[clave] = (memoria, grid, componentes)
+    if len(_grids) > CAPACIDAD:
+        _soltar(*_grids.popitem(last=False)[1])
+    return grid, componentes
+
+
+def resolver_en_trabajador(nombre, rows, cols, inicio, meta, algoritmo, opciones):
+    """Resuelve una consulta sobre el mapa guardado en el bloque `nombre`."""
+    grid, componentes = _grid(nombre, rows, cols, algoritmo in VENENO_TRANSITABLE)
+    return resolver(grid, inicio, meta, algoritmo, opciones, componentes)
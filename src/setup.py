@@ -8,4 +8,15 @@ setup(
     install_requires=[
         "PySide6",
     ],
+    extras_require={
+        # Modo beam_search(mode="vectorized")
+        "vectorizado": ["numpy"],
+    },
+    entry_points={
+        # Resolución por lotes y servicio HTTP, sin interfaz gráfica
+        "console_scripts": [
+            "proyectoIA = proyectoIA.lotes:main",
+            "proyectoIA-servicio = proyectoIA.servicio.servidor:main",
+        ],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from proyectoIA.algorithms.beam_search import beam_search
+from proyectoIA.algorithms.grid import COSTO_VENENO, IMPASABLE, INFINITO, Grid
+from proyectoIA.algorithms.heuristicas import distancias_a_meta
+
+np = pytest.importorskip("numpy")
+
+
+def _tableros(semilla, cantidad):
+    azar = random.Random(semilla)
+    for _ in range(cantidad):
+        grid = Grid(azar.randint(2, 30), azar.randint(2, 30))
+        for celda in range(len(grid)):
+            valor = azar.random()
+            if valor < 0.3:
+                grid.costos[celda] = IMPASABLE
+            elif valor < 0.4:
+                grid.costos[celda] = COSTO_VENENO
+        libres = [celda for celda in range(len(grid)) if grid.costos[celda] != IMPASABLE]
+        if len(libres) < 2:
+            continue
+        yield grid, grid.posicion(azar.choice(libres)), grid.posicion(azar.choice(libres)), azar.randint(1, 3)
+
+
+@pytest.mark.parametrize("mode", ["python", "vectorized"])
+def test_adaptativo_encuentra_toda_meta_alcanzable(mode):
+    for grid, inicio, meta, ancho in _tableros(4, 300):
+        alcanzable = distancias_a_meta(grid, meta)[grid.celda(inicio)] < INFINITO
+        camino = beam_search(grid, inicio, meta, beamWidth=ancho, mode=mode, adaptativo=True)
+        assert (camino is not None) == alcanzable
+
+
+def test_vectorizado_igual_a_python():
+    for grid, inicio, meta, ancho in _tableros(5, 200):
+        assert (beam_search(grid, inicio, meta, beamWidth=ancho, mode="vectorized")
+                == beam_search(grid, inicio, meta, beamWidth=ancho))
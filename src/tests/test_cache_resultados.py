@@ -0,0 +1,56 @@
+from proyectoIA.algorithms.cache_resultados import CacheResultados
+from proyectoIA.algorithms.grid import IMPASABLE, Grid
+
+
+def test_editar_con_cambiar_costo_no_encuentra_la_entrada_vieja():
+    cache = CacheResultados()
+    grid = Grid(5, 5)
+    camino = cache.buscar(grid, (0, 0), (0, 4))
+    assert cache.buscar(grid, (0, 0), (0, 4)) == camino
+    assert cache.aciertos == 1
+
+    grid.cambiar_costo(grid.celda((0, 2)), IMPASABLE)
+    nuevo = cache.buscar(grid, (0, 0), (0, 4))
+    assert nuevo != camino and (0, 2) not in nuevo
+    assert cache.fallos == 2
+
+
+def test_opciones_distintas_dan_claves_distintas():
+    grid = Grid(5, 5)
+    clave = CacheResultados.clave(grid, (0, 0), (4, 4), "dynamic", {"epsilon": 1})
+    assert clave != CacheResultados.clave(grid, (0, 0), (4, 4), "dynamic", {"epsilon": 3})
+    assert clave != CacheResultados.clave(grid, (0, 0), (4, 4), "dynamic")
+    assert clave == CacheResultados.clave(grid, (0, 0), (4, 4), "dynamic", {"epsilon": 1})
+
+
+def test_desalojo_lru_en_la_capacidad():
+    cache = CacheResultados(capacidad=2)
+    grid = Grid(5, 5)
+    for meta in ((0, 1), (0, 2), (0, 1), (0, 3)):
+        cache.buscar(grid, (0, 0), meta)
+    # (0, 1) se usó hace poco; sale (0, 2), la menos usada
+    assert len(cache) == 2
+    assert cache.obtener(cache.clave(grid, (0, 0), (0, 1), "dynamic"))[0]
+    assert not cache.obtener(cache.clave(grid, (0, 0), (0, 2), "dynamic"))[0]
+
+
+def test_sin_camino_tambien_se_guarda():
+    cache = CacheResultados()
+    grid = Grid.desde_obstaculos(3, 3, [(0, 1), (1, 1), (2, 1)], IMPASABLE)
+    assert cache.buscar(grid, (0, 0), (0, 2)) is None
+    assert cache.obtener(cache.clave(grid, (0, 0), (0, 2), "dynamic")) == (True, None)
+
+
+def test_el_archivo_sobrevive_a_una_caché_nueva(tmp_path):
+    ruta = str(tmp_path / "resultados.sqlite")
+    grid = Grid(5, 5)
+    cache = CacheResultados(ruta=ruta)
+    camino = cache.buscar(grid, (0, 0), (4, 4))
+    cache.cerrar()
+
+    otra = CacheResultados(ruta=ruta)
+    try:
+        assert otra.buscar(grid, (0, 0), (4, 4)) == camino
+        assert otra.aciertos_disco == 1
+    finally:
+        otra.cerrar()
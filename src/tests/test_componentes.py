@@ -0,0 +1,47 @@
+import os
+
+from proyectoIA.algorithms.componentes import ComponentesConexas, inalcanzable
+from proyectoIA.algorithms.dynamic import dynamic_weighting_search
+from proyectoIA.algorithms.estadisticas import SIN_CAMINO, EstadisticasBusqueda
+from proyectoIA.algorithms.grid import IMPASABLE, Grid
+from proyectoIA.algorithms.paralelo import solve_many
+from proyectoIA.lotes import resolver_mapa
+
+
+def _encerrada(n=30):
+    # Hongo en (n-1, n-1) rodeado de veneno impasable
+    grid = Grid(n, n)
+    for posicion in ((n - 2, n - 1), (n - 1, n - 2)):
+        grid.cambiar_costo(grid.celda(posicion), IMPASABLE)
+    return grid
+
+
+def test_sin_indice_no_calcula_la_huella():
+    grid = _encerrada()
+    assert not inalcanzable(grid, (0, 0), (29, 29))
+    assert grid._huella is None
+
+
+def test_con_indice_no_busca():
+    grid = _encerrada()
+    stats = EstadisticasBusqueda()
+    camino = dynamic_weighting_search(grid, (0, 0), (29, 29), stats=stats,
+                                      componentes=ComponentesConexas(grid))
+    assert camino is None
+    assert stats.fin == SIN_CAMINO and stats.expandidos == 0
+
+
+def test_solve_many_arma_el_indice():
+    grid = _encerrada()
+    consultas = [((0, 0), (29, 29)), ((0, 0), (5, 5))]
+    caminos = list(solve_many(grid, consultas, "dynamic", workers=1))
+    assert caminos[0] is None and caminos[1][-1] == (5, 5)
+
+
+def test_lotes_descarta_hongos_encerrados(tmp_path):
+    ruta = os.path.join(tmp_path, "encerrado.txt")
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        archivo.write("Tamaño(20, 20)\nHormiga(1, 1)\nHongo(20, 20)\nVeneno(19, 20, 20, 19)\n")
+    resultado = resolver_mapa(ruta, "dynamic")
+    assert resultado["camino"] is None
+    assert resultado["expansiones"] == 0
@@ -0,0 +1,16 @@
+from proyectoIA.algorithms.beam_search import beam_search
+from proyectoIA.algorithms.dynamic import dynamic_weighting_search
+from proyectoIA.algorithms.grid import COSTO_LIBRE, COSTO_VENENO, Grid
+
+
+def test_obstaculos_fuera_del_tablero_se_ignoran():
+    grid = Grid.desde_obstaculos(5, 5, [(0, 5), (5, 0), (-1, 2), (2, 2)])
+    assert grid.costo((2, 2)) == COSTO_VENENO
+    assert grid.contar_obstaculos() == 1
+    assert grid.costo((1, 0)) == COSTO_LIBRE
+
+
+def test_firma_antigua_con_obstaculos_fuera():
+    # (0, 5) caería sobre (1, 0) y (5, 0) fuera del bytearray
+    assert dynamic_weighting_search(5, (0, 0), (1, 0), [(0, 5)]) == [(0, 0), (1, 0)]
+    assert beam_search(5, (0, 0), (1, 0), [(5, 0)]) == [(0, 0), (1, 0)]
@@ -0,0 +1,21 @@
+from proyectoIA.algorithms.grid import IMPASABLE, INFINITO, Grid
+from proyectoIA.algorithms.heuristicas import CacheHeuristicas
+
+
+def test_la_huella_se_guarda_hasta_cambiar_costo():
+    grid = Grid(4, 4)
+    huella = grid.huella()
+    grid.costos[0] = IMPASABLE
+    assert grid.huella() == huella  # Escribir costos directamente no la recalcula
+    grid.cambiar_costo(1, IMPASABLE)
+    assert grid.huella() != huella
+    assert grid.huella() == Grid(4, 4, grid.costos[:]).huella()
+
+
+def test_la_cache_ve_los_cambios_de_celda():
+    cache = CacheHeuristicas()
+    grid = Grid(1, 4)
+    assert cache.tabla(grid, (0, 3))[0] == 3
+    assert cache.tabla(grid, (0, 3)) is cache.tabla(grid, (0, 3))
+    grid.cambiar_costo(1, IMPASABLE)
+    assert cache.tabla(grid, (0, 3))[0] == INFINITO
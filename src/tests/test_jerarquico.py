@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from proyectoIA.algorithms.grid import IMPASABLE, INFINITO, Grid
+from proyectoIA.algorithms.heuristicas import distancias_a_meta
+from proyectoIA.algorithms.jerarquico import GrafoAbstracto, hpa_search
+
+
+def _es_camino_valido(grid, camino, inicio, meta):
+    if camino[0] != inicio or camino[-1] != meta:
+        return False
+    for (f1, c1), (f2, c2) in zip(camino, camino[1:]):
+        if abs(f1 - f2) + abs(c1 - c2) != 1 or not grid.es_transitable((f2, c2)):
+            return False
+    return True
+
+
+def _costo(grid, camino):
+    return sum(grid.costo(posicion) for posicion in camino[1:])
+
+
+def test_una_columna_de_clusters():
+    # cols <= tamano: el cluster siguiente (a + 1) es el de abajo, no el de la derecha
+    grid = Grid(20, 10)
+    camino = hpa_search(grid, (0, 0), (19, 0))
+    assert _es_camino_valido(grid, camino, (0, 0), (19, 0))
+    assert _costo(grid, camino) == 19
+
+
+@pytest.mark.parametrize("rows, cols, tamano", [
+    (20, 10, 16), (10, 20, 16), (33, 7, 4), (7, 33, 4), (9, 26, 5), (26, 9, 5),
+])
+def test_tableros_rectangulares(rows, cols, tamano):
+    azar = random.Random(rows * 100 + cols)
+    for _ in range(30):
+        grid = Grid(rows, cols)
+        for celda in range(len(grid)):
+            if azar.random() < 0.25:
+                grid.costos[celda] = IMPASABLE
+        libres = [celda for celda in range(len(grid)) if grid.costos[celda] != IMPASABLE]
+        inicio = grid.posicion(azar.choice(libres))
+        meta = grid.posicion(azar.choice(libres))
+
+        optimo = distancias_a_meta(grid, meta)[grid.celda(inicio)]
+        camino = hpa_search(grid, inicio, meta, grafo=GrafoAbstracto(grid.copia(), tamano))
+        if optimo == INFINITO:
+            assert camino is None
+        else:
+            assert camino is not None
+            assert _es_camino_valido(grid, camino, inicio, meta)
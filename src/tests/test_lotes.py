@@ -0,0 +1,29 @@
+from proyectoIA import lotes
+from proyectoIA.algorithms.mapa_binario import CABECERA, FIRMA, VERSION
+
+MAPA = "Tamaño(4,4)\nHormiga(1,1)\nVeneno((2,2))\nHongo(4,4)\n"
+
+
+def _mapas(tmp_path):
+    malo = tmp_path / "malo.piam"
+    malo.write_bytes(CABECERA.pack(FIRMA, VERSION, 3, 3, 7, 7, 2, 2) + b"\x01" * 9)
+    bueno = tmp_path / "bueno.txt"
+    bueno.write_text(MAPA, encoding="utf-8")
+    return [str(malo), str(bueno)]
+
+
+def test_un_mapa_roto_no_corta_el_lote(tmp_path):
+    resultados = {r["mapa"]: r for r in lotes.resolver_mapas(_mapas(tmp_path), procesos=2)}
+    malo, bueno = _mapas(tmp_path)
+    assert resultados[malo]["error"].startswith("MapaInvalido: ")
+    assert resultados[bueno]["pasos"] == 6
+
+
+def test_error_inesperado_queda_en_la_linea(tmp_path, monkeypatch):
+    def fallar(*args, **kwargs):
+        raise IndexError("fuera de rango")
+
+    monkeypatch.setattr(lotes, "resolver", fallar)
+    _, bueno = _mapas(tmp_path)
+    resultado = lotes.resolver_mapa(bueno)
+    assert resultado["error"] == "IndexError: fuera de rango"
@@ -0,0 +1,76 @@
+import os
+import stat
+import struct
+
+import pytest
+
+from proyectoIA.algorithms.archivo_mapa import Mapa, MapaInvalido
+from proyectoIA.algorithms.grid import COSTO_LIBRE, COSTO_VENENO, IMPASABLE, Grid
+from proyectoIA.algorithms.mapa_binario import (
+    CABECERA,
+    CANTIDAD,
+    FIRMA,
+    VERSION,
+    VERSION_COLONIA,
+    abrir_binario,
+    guardar_binario,
+)
+
+
+def _guardar(tmp_path):
+    grid = Grid(4, 5)
+    grid.costos[grid.celda((1, 1))] = COSTO_VENENO
+    grid.costos[grid.celda((2, 3))] = IMPASABLE
+    ruta = tmp_path / "mapa.piam"
+    guardar_binario(Mapa(grid, (0, 0), (3, 4)), ruta)
+    return ruta
+
+
+@pytest.mark.skipif(hasattr(os, "geteuid") and os.geteuid() == 0,
+                    reason="root puede escribir archivos de solo lectura")
+@pytest.mark.parametrize("modo", ["r", "c"])
+def test_archivo_de_solo_lectura(tmp_path, modo):
+    ruta = _guardar(tmp_path)
+    os.chmod(ruta, stat.S_IRUSR)
+    mapa = abrir_binario(ruta, modo)
+    assert mapa.grid.costo((2, 3)) == IMPASABLE
+
+
+def test_modo_copia_no_toca_el_archivo(tmp_path):
+    ruta = _guardar(tmp_path)
+    contenido = ruta.read_bytes()
+    mapa = abrir_binario(ruta, "c")
+    mapa.grid.cambiar_costo(mapa.grid.celda((2, 3)), COSTO_LIBRE)
+    assert mapa.grid.costo((2, 3)) == COSTO_LIBRE
+    assert ruta.read_bytes() == contenido
+
+
+def test_load_map_conserva_celdas_impasables(tmp_path):
+    pytest.importorskip("PySide6")
+    from proyectoIA.gui.mapa import CellTypes, load_map
+
+    rows, cols, grid_data, grid = load_map(_guardar(tmp_path))
+    assert (rows, cols) == (4, 5)
+    assert grid_data[(1, 1)] == CellTypes.OBSTACLE
+    assert grid_data[(2, 3)] == CellTypes.OBSTACLE
+    assert grid.costo((2, 3)) == IMPASABLE
+
+
+@pytest.mark.parametrize("hormiga", [(7, 7), (-2, 0), (0, 3)])
+def test_cabecera_fuera_del_tablero(tmp_path, hormiga):
+    ruta = tmp_path / "mapa.piam"
+    ruta.write_bytes(CABECERA.pack(FIRMA, VERSION, 3, 3, *hormiga, 2, 2) + bytes([COSTO_LIBRE]) * 9)
+    with pytest.raises(MapaInvalido, match="fuera del tablero 3x3"):
+        abrir_binario(ruta)
+
+
+def test_lista_de_hormigas_fuera_del_tablero(tmp_path):
+    ruta = tmp_path / "mapa.piam"
+    ruta.write_bytes(
+        CABECERA.pack(FIRMA, VERSION_COLONIA, 3, 3, 0, 0, 2, 2)
+        + bytes([COSTO_LIBRE]) * 9
+        + CANTIDAD.pack(2)
+        + struct.pack("<iiii", 0, 0, 3, 1)
+    )
+    with pytest.raises(MapaInvalido, match="1 hormigas fuera del tablero 3x3"):
+        abrir_binario(ruta)
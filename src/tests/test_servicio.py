@@ -0,0 +1,85 @@
+import asyncio
+import os
+import tempfile
+from multiprocessing import shared_memory
+
+import pytest
+
+from proyectoIA.benchmarks.generador import generar_mapa
+from proyectoIA.servicio.cliente import ClienteServicio, ErrorRespuesta
+from proyectoIA.servicio.servidor import ServicioBusqueda
+
+pytestmark = pytest.mark.skipif(not hasattr(asyncio, "start_unix_server"), reason="sin sockets Unix")
+
+
+def _con_servicio(prueba):
+    # Levanta el servicio sobre un socket Unix temporal, como cliente --local
+    async def correr():
+        servicio = ServicioBusqueda(procesos=1)
+        with tempfile.TemporaryDirectory() as directorio:
+            socket = os.path.join(directorio, "servicio.sock")
+            try:
+                await servicio.servir(socket=socket)
+                async with ClienteServicio(socket=socket) as cliente:
+                    await prueba(servicio, cliente, socket)
+            finally:
+                await servicio.detener()
+
+    asyncio.run(correr())
+
+
+def test_registrar_dos_veces_da_el_mismo_id():
+    async def prueba(servicio, cliente, socket):
+        mapa = generar_mapa(20, densidad=0.2, semilla=1)
+        primero = await cliente.registrar_mapa(mapa)
+        segundo = await cliente.registrar_mapa(mapa)
+        assert primero["id"] == segundo["id"]
+        assert (await cliente.pedir("GET", "/mapas"))["mapas"] == [primero["id"]]
+
+    _con_servicio(prueba)
+
+
+def test_consultas_identicas_se_agrupan():
+    async def prueba(servicio, cliente, socket):
+        mapa = generar_mapa(300, densidad=0.3, tipo="laberinto", semilla=2)
+        id_mapa = (await cliente.registrar_mapa(mapa))["id"]
+
+        async def buscar():
+            async with ClienteServicio(socket=socket) as otro:
+                return await otro.buscar(id_mapa, "dynamic")
+
+        primera, segunda = await asyncio.gather(buscar(), buscar())
+        assert primera["camino"] == segunda["camino"]
+        assert sorted((primera["coalescida"], segunda["coalescida"])) == [False, True]
+        metricas = await cliente.metricas()
+        assert metricas["consultas"] == 2
+        assert metricas["coalescidas"] == 1
+
+    _con_servicio(prueba)
+
+
+def test_errores_de_la_consulta():
+    async def prueba(servicio, cliente, socket):
+        id_mapa = (await cliente.registrar_mapa(generar_mapa(10, densidad=0.2, semilla=3)))["id"]
+        with pytest.raises(ErrorRespuesta) as error:
+            await cliente.buscar("no-existe")
+        assert error.value.estado == 404
+        with pytest.raises(ErrorRespuesta) as error:
+            await cliente.buscar(id_mapa, inicio=(10, 0))
+        assert error.value.estado == 400
+
+    _con_servicio(prueba)
+
+
+def test_borrar_libera_la_memoria_compartida():
+    async def prueba(servicio, cliente, socket):
+        id_mapa = (await cliente.registrar_mapa(generar_mapa(10, densidad=0.2, semilla=4)))["id"]
+        nombre = servicio.mapas[id_mapa].memoria.name
+        assert (await cliente.pedir("DELETE", f"/mapas/{id_mapa}")) == {"borrado": id_mapa}
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=nombre)
+        with pytest.raises(ErrorRespuesta) as error:
+            await cliente.pedir("DELETE", f"/mapas/{id_mapa}")
+        assert error.value.estado == 404
+
+    _con_servicio(prueba)